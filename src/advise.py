@@ -0,0 +1,47 @@
+import argparse
+from services.blackjack_helper import BlackjackHelper, BlackjackRules
+from services.bulk_advice import (
+    FORMATS, advise_stream, advise_stream_parallel, detect_format, open_input, open_output)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Write blackjack advice for hands streamed from CSV or JSON lines.")
+    parser.add_argument("input", nargs="?", default="-",
+                        help="hand file, optionally gzipped, or - for stdin")
+    parser.add_argument("-o", "--output", default="-",
+                        help="output file, gzipped if it ends in .gz, or - for stdout")
+    parser.add_argument("--format", choices=FORMATS,
+                        help="input format, detected from the file name by default")
+    parser.add_argument("--charts", default="data/charts/single_deck/stand_on_soft_17",
+                        help="chart directory to give advice from")
+    parser.add_argument("--double-after-split", action="store_true")
+    parser.add_argument("--surrender", action="store_true")
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    parser.add_argument("--workers", type=int, default=1,
+                        help="worker processes, more than one enables parallel mode")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    input_format = args.format or detect_format(args.input)
+    rules = {
+        BlackjackRules.DOUBLE_AFTER_SPLIT_ALLOWED: args.double_after_split,
+        BlackjackRules.SURRENDER_ALLOWED: args.surrender,
+    }
+
+    with open_input(args.input) as input_stream, open_output(args.output) as output_stream:
+        if args.workers > 1:
+            advise_stream_parallel(args.charts, rules, input_stream, output_stream,
+                                   input_format, chunk_size=args.chunk_size,
+                                   workers=args.workers)
+        else:
+            blackjack_helper = BlackjackHelper.from_charts_directory(args.charts)
+            for rule_name, value in rules.items():
+                blackjack_helper.set_rule(rule_name, value)
+            advise_stream(blackjack_helper, input_stream, output_stream,
+                          input_format, args.chunk_size)
+
+if __name__ == "__main__":
+    main()
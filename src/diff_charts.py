@@ -0,0 +1,59 @@
+import argparse
+import json
+import os
+from services.blackjack_helper import BlackjackRules
+from services.dealer_probabilities import DealerProbabilityCache
+from services.strategy_diff import compare_chart_directories
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="List the cells where two chart directories give different advice "
+                    "and what playing the other chart costs.")
+    parser.add_argument("reference", help="chart directory that is correct for the game")
+    parser.add_argument("other", help="chart directory to price against the reference")
+    parser.add_argument("--decks", type=int, default=1)
+    parser.add_argument("--hit-soft-17", action="store_true")
+    parser.add_argument("--no-double", action="store_true")
+    parser.add_argument("--no-split", action="store_true")
+    parser.add_argument("--double-after-split", action="store_true")
+    parser.add_argument("--surrender", action="store_true")
+    parser.add_argument("--dealer-table",
+                        help="dealer probability table to warm-start from and update")
+    parser.add_argument("--report", help="file to write the full JSON report into")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    dealer_cache = DealerProbabilityCache(args.hit_soft_17)
+    if args.dealer_table and os.path.exists(args.dealer_table):
+        dealer_cache.load(args.dealer_table)
+
+    rules = {
+        BlackjackRules.DOUBLE_ALLOWED: not args.no_double,
+        BlackjackRules.SPLIT_ALLOWED: not args.no_split,
+        BlackjackRules.DOUBLE_AFTER_SPLIT_ALLOWED: args.double_after_split,
+        BlackjackRules.SURRENDER_ALLOWED: args.surrender,
+    }
+    report = compare_chart_directories(args.reference, args.other, args.decks,
+                                       dealer_hits_soft_17=args.hit_soft_17, rules=rules,
+                                       dealer_cache=dealer_cache)
+    if args.dealer_table:
+        dealer_cache.save(args.dealer_table)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    for difference in report["differences"]:
+        print(f"{difference['dealer']:>2} vs {','.join(difference['cards']):5} "
+              f"{difference['reference_action']:>9} -> {difference['other_action']:9} "
+              f"EV loss {difference['ev_loss']:+.4f} "
+              f"x {difference['frequency']:.5f} = {difference['weighted_ev_loss']:+.7f}")
+    print(f"{len(report['differences'])} of {report['cells']} cells differ, "
+          f"total EV loss {report['total_ev_loss']:+.6f} bets per round "
+          f"({report['total_ev_loss'] * 100:+.4f} %)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+import argparse
+import os
+from services.dealer_probabilities import DealerProbabilityCache
+from services.strategy_solver import StrategySolver, write_charts
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generate blackjack strategy charts from exact expected values.")
+    parser.add_argument("directory", help="directory to write the charts into")
+    parser.add_argument("--decks", type=int, default=1)
+    parser.add_argument("--hit-soft-17", action="store_true")
+    parser.add_argument("--double-after-split", action="store_true")
+    parser.add_argument("--surrender", action="store_true")
+    parser.add_argument("--dealer-table",
+                        help="dealer probability table to warm-start from and update")
+    args = parser.parse_args()
+
+    dealer_cache = DealerProbabilityCache(args.hit_soft_17)
+    if args.dealer_table and os.path.exists(args.dealer_table):
+        dealer_cache.load(args.dealer_table)
+
+    solver = StrategySolver(args.decks, args.hit_soft_17,
+                            args.double_after_split, args.surrender, dealer_cache=dealer_cache)
+    write_charts(args.directory, solver.solve_charts())
+
+    if args.dealer_table:
+        dealer_cache.save(args.dealer_table)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,22 @@
-from ui.blackjack_interface import BlackjackInterface
+import argparse
+import time
 
 
 def main():
+    started = time.perf_counter()
+    parser = argparse.ArgumentParser(description="Blackjack strategy helper.")
+    parser.add_argument("--startup-timing", action="store_true",
+                        help="print the time it takes to show the first frame")
+    args = parser.parse_args()
+
+    # The GUI is imported here so that importing this module stays free of it.
+    from ui.blackjack_interface import BlackjackInterface  # pylint: disable=import-outside-toplevel
+    imported = time.perf_counter()
+
     blackjack_interface = BlackjackInterface()
+    if args.startup_timing:
+        blackjack_interface.report_startup_time(
+            started, [("GUI import", imported), ("Interface setup", time.perf_counter())])
     blackjack_interface.start()
 
 
@@ -0,0 +1,23 @@
+import argparse
+import os
+from services.blackjack_helper import BlackjackHelper
+from services.chart_validator import chart_directories
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compile JSON chart directories into memory-mappable chart packs.")
+    parser.add_argument("root", help="chart directory, or a tree of chart directories")
+    args = parser.parse_args()
+
+    directories = chart_directories(args.root, complete=True)
+    if not directories:
+        parser.error(f"No chart directories found under {args.root}")
+
+    for directory in directories:
+        pack_path = BlackjackHelper.pack_charts_directory(directory)
+        print(f"{pack_path} ({os.path.getsize(pack_path)} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+import argparse
+import json
+from services.blackjack_helper import BlackjackHelper
+from services.chart_registry import ChartRegistry
+from services.decision_log import rescore_log
+from services.rule_profiles import PROFILE_DIRECTORY, load_profiles
+
+
+def parse_args(profile_names):
+    parser = argparse.ArgumentParser(
+        description="Re-evaluate a decision log with current charts and count the changed advice.")
+    parser.add_argument("log", help="decision log directory")
+    parser.add_argument("--profile", action="append", choices=profile_names,
+                        help="rule profile of each logged profile index, in index order; "
+                             "every profile in file order by default")
+    parser.add_argument("--charts",
+                        help="chart directory to use for every profile instead of its own charts")
+    parser.add_argument("--report", help="file to write the full JSON report into")
+    return parser.parse_args()
+
+
+def main():
+    profiles = load_profiles(PROFILE_DIRECTORY)
+    args = parse_args(list(profiles))
+    names = args.profile or list(profiles)
+    if args.charts:
+        helpers = []
+        for name in names:
+            blackjack_helper = BlackjackHelper.from_charts_directory(args.charts)
+            blackjack_helper.set_rules(profiles[name].rules)
+            helpers.append(blackjack_helper)
+    else:
+        chart_registry = ChartRegistry()
+        helpers = [chart_registry.helper(profiles[name].variant, dict(profiles[name].rules))
+                   for name in names]
+
+    report = rescore_log(args.log, helpers)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    for change in report["changes"]:
+        print(f"{change['from']:>9} -> {change['to']:9} {change['count']}")
+    print(f"{report['changed']} of {report['records']} decisions changed "
+          f"({report['change_rate'] * 100:.3f} %)")
+
+
+if __name__ == "__main__":
+    main()
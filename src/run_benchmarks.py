@@ -0,0 +1,51 @@
+import argparse
+import json
+import os
+import sys
+from services.benchmark import compare_to_baseline, run_benchmarks
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Benchmark advice latency, chart loading and simulation throughput.")
+    parser.add_argument("--output", default="benchmark_results.json",
+                        help="file to write the results into")
+    parser.add_argument("--baseline", default="benchmarks/baseline.json",
+                        help="baseline results to compare against, created on the first run")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="store the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="relative slowdown that counts as a regression")
+    parser.add_argument("--quick", action="store_true", help="use small workloads")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    results = run_benchmarks(quick=args.quick)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+    for name, metric in results["metrics"].items():
+        print(f"{name:32} {metric['value']:>16.2f} {metric['unit']}")
+
+    if args.save_baseline or not os.path.exists(args.baseline):
+        if not args.save_baseline:
+            print(f"No baseline at {args.baseline}, this first run becomes the baseline")
+        os.makedirs(os.path.dirname(args.baseline) or ".", exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Saved baseline to {args.baseline}")
+        return
+
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        regressions = compare_to_baseline(results, json.load(f), args.tolerance)
+    for name, baseline_value, value, change in regressions:
+        print(f"REGRESSION {name}: {baseline_value:.2f} -> {value:.2f} ({change:+.0%} worse)")
+    if regressions:
+        sys.exit(1)
+    print("No regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import argparse
+import asyncio
+from services.advice_server import AdviceServer
+from services.blackjack_helper import BlackjackHelper, BlackjackRules
+from services.chart_watcher import DEFAULT_POLL_INTERVAL, ChartWatcher
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Serve blackjack advice as line-delimited JSON over TCP.")
+    parser.add_argument("--charts", default="data/charts/single_deck/stand_on_soft_17",
+                        help="chart directory to give advice from")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--double-after-split", action="store_true")
+    parser.add_argument("--surrender", action="store_true")
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--batch-window-ms", type=float, default=2.0)
+    parser.add_argument("--max-pending", type=int, default=4096)
+    parser.add_argument("--timeout-ms", type=float, default=1000.0)
+    parser.add_argument("--helper-metrics", action="store_true",
+                        help="record chart lookups and fallbacks in the metrics")
+    parser.add_argument("--watch", action="store_true",
+                        help="reload the charts in the background when their files change")
+    parser.add_argument("--watch-interval", type=float, default=DEFAULT_POLL_INTERVAL)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    blackjack_helper = BlackjackHelper.from_charts_directory(args.charts)
+    blackjack_helper.set_rule(BlackjackRules.DOUBLE_AFTER_SPLIT_ALLOWED, args.double_after_split)
+    blackjack_helper.set_rule(BlackjackRules.SURRENDER_ALLOWED, args.surrender)
+    if args.helper_metrics:
+        blackjack_helper.enable_metrics()
+
+    server = AdviceServer(blackjack_helper, args.host, args.port,
+                          request_timeout=args.timeout_ms / 1000,
+                          max_batch_size=args.batch_size,
+                          batch_window=args.batch_window_ms / 1000,
+                          max_pending=args.max_pending)
+    watcher = ChartWatcher(blackjack_helper, args.charts, args.watch_interval)
+    if args.watch:
+        watcher.start()
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+import asyncio
+import json
+import time
+from collections import Counter, deque
+import numpy as np
+from services.blackjack_helper import BlackjackHelper
+
+
+class LatencyRecorder:
+    """Keeps the most recent request latencies for percentile metrics."""
+
+    def __init__(self, max_samples: int = 10_000):
+        """Initialize recorder holding at most max_samples latencies."""
+        self.samples = deque(maxlen=max_samples)
+
+    def record(self, seconds: float):
+        """Add one latency sample in seconds."""
+        self.samples.append(seconds)
+
+    def percentiles_ms(self, percentiles=(50, 99)):
+        """Return latency percentiles in milliseconds, or None without samples."""
+        if not self.samples:
+            return {f"p{percentile}_ms": None for percentile in percentiles}
+        values = np.percentile(np.fromiter(self.samples, dtype=np.float64), percentiles)
+        return {f"p{percentile}_ms": value * 1000
+                for percentile, value in zip(percentiles, values)}
+
+
+class AdviceBatcher:
+    """Collects concurrent advice requests and answers them in batched lookups.
+
+    A batch is evaluated once it holds max_batch_size requests or once
+    batch_window seconds have passed since its first request. At most
+    max_pending requests wait for a batch; further requests wait for room
+    until their timeout runs out.
+    """
+
+    def __init__(self, blackjack_helper: BlackjackHelper, max_batch_size: int = 256,
+                 batch_window: float = 0.002, max_pending: int = 4096):
+        """Initialize batcher for a helper."""
+        if max_batch_size < 1:
+            raise ValueError(f"Invalid batch size: {max_batch_size}")
+
+        self.blackjack_helper = blackjack_helper
+        self.max_batch_size = max_batch_size
+        self.batch_window = batch_window
+        self.queue = asyncio.Queue(max_pending)
+        self.latencies = LatencyRecorder()
+        self.counts = Counter()
+        self._task = None
+
+    def start(self):
+        """Start evaluating batches on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop evaluating batches."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def advise(self, dealer_card: str, player_cards: list[str],
+                     timeout: float | None = None) -> str:
+        """Return readable advice for a hand, raising TimeoutError after timeout seconds."""
+        started = time.perf_counter()
+        self.counts["requests"] += 1
+        future = asyncio.get_running_loop().create_future()
+        try:
+            async with asyncio.timeout(timeout):
+                await self.queue.put((dealer_card, player_cards, future))
+                advice = await future
+        except TimeoutError:
+            self.counts["timeouts"] += 1
+            raise
+
+        self.latencies.record(time.perf_counter() - started)
+        return advice
+
+    async def _next_batch(self):
+        """Wait for a request and collect more until the batch is full or the window ends."""
+        batch = [await self.queue.get()]
+        deadline = time.perf_counter() + self.batch_window
+        while len(batch) < self.max_batch_size:
+            if self.queue.empty():
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    async with asyncio.timeout(remaining):
+                        batch.append(await self.queue.get())
+                except TimeoutError:
+                    break
+            else:
+                batch.append(self.queue.get_nowait())
+        return batch
+
+    async def _run(self):
+        """Evaluate batches until stopped."""
+        while True:
+            batch = [request for request in await self._next_batch()
+                     if not request[2].done()]
+            if not batch:
+                continue
+
+            advice = self.blackjack_helper.ask_help_hands(
+                [dealer_card for dealer_card, _, _ in batch],
+                [player_cards for _, player_cards, _ in batch])
+            for (_, _, future), action_name in zip(batch, advice):
+                if not future.done():
+                    future.set_result(action_name)
+            self.counts["batches"] += 1
+            self.counts["batched_requests"] += len(batch)
+
+    def metrics(self):
+        """Return request, batch and latency metrics, and the helper's metrics if enabled."""
+        helper_metrics = self.blackjack_helper.metrics
+        batches = self.counts["batches"]
+        return {
+            "requests": self.counts["requests"],
+            "batches": batches,
+            "mean_batch_size": self.counts["batched_requests"] / batches if batches else 0.0,
+            "timeouts": self.counts["timeouts"],
+            "pending": self.queue.qsize(),
+            "chart_generation": self.blackjack_helper.generation,
+            **self.latencies.percentiles_ms(),
+            **({"helper": helper_metrics.snapshot()} if helper_metrics is not None else {}),
+        }
+
+
+class AdviceServer:
+    """Line-delimited JSON advice service over TCP.
+
+    Each request line is an object with "dealer" and "cards" and an optional
+    "id" that is echoed back, for example
+    {"id": 1, "dealer": "10", "cards": ["10", "6"]}. The reply is
+    {"id": 1, "action": "Stand"}, or an object with "error" on failure.
+    The line {"command": "metrics"} returns the batcher's metrics.
+
+    Each connection has at most max_in_flight requests being answered, so
+    a client sending faster than the server answers stops being read.
+    """
+
+    def __init__(self, blackjack_helper: BlackjackHelper, host: str = "127.0.0.1",
+                 port: int = 8765, *, request_timeout: float = 1.0,
+                 max_in_flight: int = 64, **batcher_settings):
+        """Initialize server settings; batcher_settings are passed to AdviceBatcher."""
+        self.host = host
+        self.port = port
+        self.request_timeout = request_timeout
+        self.max_in_flight = max_in_flight
+        self.batcher = AdviceBatcher(blackjack_helper, **batcher_settings)
+        self._server = None
+
+    async def start(self):
+        """Start listening and return the bound port."""
+        self.batcher.start()
+        self._server = await asyncio.start_server(
+            self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def serve_forever(self):
+        """Start the server if needed and serve until cancelled."""
+        if self._server is None:
+            await self.start()
+        await self._server.serve_forever()
+
+    async def close(self):
+        """Stop accepting connections and stop the batcher."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        await self.batcher.stop()
+
+    async def _answer(self, line: bytes):
+        """Return the reply object for one request line."""
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("Request must be a JSON object")
+        except ValueError as e:
+            return {"error": f"Invalid request: {e}"}
+
+        reply = {"id": request["id"]} if "id" in request else {}
+        if request.get("command") == "metrics":
+            return {**reply, "metrics": self.batcher.metrics()}
+
+        dealer_card, player_cards = request.get("dealer"), request.get("cards")
+        if not isinstance(dealer_card, str) or not isinstance(player_cards, list):
+            return {**reply, "error": "Request needs a dealer card and a list of cards"}
+
+        try:
+            action_name = await self.batcher.advise(
+                dealer_card, [str(card) for card in player_cards], self.request_timeout)
+        except TimeoutError:
+            return {**reply, "error": "Timed out"}
+        return {**reply, "action": action_name}
+
+    async def _answer_and_write(self, line: bytes, writer: asyncio.StreamWriter,
+                                in_flight: asyncio.Semaphore):
+        """Write the reply to one request line and free its in-flight slot."""
+        try:
+            reply = await self._answer(line)
+            writer.write(json.dumps(reply).encode("utf-8") + b"\n")
+            await writer.drain()
+        finally:
+            in_flight.release()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader,
+                                 writer: asyncio.StreamWriter):
+        """Answer request lines from one connection, possibly out of order."""
+        in_flight = asyncio.Semaphore(self.max_in_flight)
+        tasks = set()
+        try:
+            while line := await reader.readline():
+                if not line.strip():
+                    continue
+                await in_flight.acquire()
+                task = asyncio.create_task(self._answer_and_write(line, writer, in_flight))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        except ConnectionError:
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            writer.close()
@@ -0,0 +1,264 @@
+import numpy as np
+from services.card_counting import CARDS_PER_DECK, HI_LO, CountingSystem
+from services.simulator import CARDS_PER_RANK, BlackjackSimulator, Shoe
+
+CURVE_PERCENTILES = (5, 25, 50, 75, 95)
+
+SESSION_RUINED = 1
+SESSION_STOPPED = 2
+SESSION_REACHED_GOAL = 4
+
+
+class FlatBet:
+    """Bets the same amount every round.
+
+    Like every bet spread, bets takes the true count and the bankroll of
+    every session, and this one ignores both.
+    """
+
+    def __init__(self, amount: float):
+        """Initialize spread with the bet amount."""
+        self.amount = amount
+
+    def bets(self, true_counts: np.ndarray, _bankrolls: np.ndarray) -> np.ndarray:
+        """Return the bet of every session."""
+        return np.full(len(true_counts), self.amount, dtype=np.float64)
+
+
+class CountRampBet:
+    """Bets an amount chosen by the true count.
+
+    steps holds (minimum true count, amount) pairs, and base_amount is bet
+    below the lowest step.
+    """
+
+    def __init__(self, steps, base_amount: float):
+        """Initialize spread from its steps and base bet."""
+        steps = sorted(steps)
+        self.thresholds = np.array([true_count for true_count, _ in steps], dtype=np.float64)
+        self.amounts = np.array([base_amount, *(amount for _, amount in steps)],
+                                dtype=np.float64)
+
+    def bets(self, true_counts: np.ndarray, _bankrolls: np.ndarray) -> np.ndarray:
+        """Return the bet of every session."""
+        return self.amounts[np.searchsorted(self.thresholds, true_counts, side="right")]
+
+
+class KellyBet:
+    """Bets a fraction of the Kelly bet for the edge estimated from the true count.
+
+    The edge is base_edge plus edge_per_true_count for every point of true
+    count, and the Kelly bet is bankroll times edge over variance. Sessions
+    without an edge get no bet of their own, so the table minimum applies.
+    """
+
+    def __init__(self, fraction: float = 0.5, base_edge: float = -0.005,
+                 edge_per_true_count: float = 0.005, variance: float = 1.3):
+        """Initialize spread from the Kelly fraction and edge model."""
+        self.fraction = fraction
+        self.base_edge = base_edge
+        self.edge_per_true_count = edge_per_true_count
+        self.variance = variance
+
+    def bets(self, true_counts: np.ndarray, bankrolls: np.ndarray) -> np.ndarray:
+        """Return the bet of every session."""
+        edges = self.base_edge + self.edge_per_true_count * true_counts
+        return np.maximum(self.fraction * bankrolls * edges / self.variance, 0.0)
+
+
+class BankrollResult:
+    """Outcome of simulated sessions.
+
+    Per-session arrays are indexed by session. endings holds the
+    SESSION_RUINED, SESSION_STOPPED and SESSION_REACHED_GOAL flags of every
+    session, hours_to_double is NaN for sessions that never doubled their
+    bankroll, and curve holds one row of bankroll percentiles for each hour
+    in curve_hours.
+    """
+
+    def __init__(self, starting_bankroll: float, sessions: int,
+                 curve_percentiles=CURVE_PERCENTILES):
+        """Initialize result for sessions that have not played yet."""
+        self.starting_bankroll = float(starting_bankroll)
+        self.final_bankrolls = np.full(sessions, self.starting_bankroll)
+        self.rounds_played = np.zeros(sessions, dtype=np.int64)
+        self.endings = np.zeros(sessions, dtype=np.uint8)
+        self.hours_to_double = np.full(sessions, np.nan)
+        self.curve_percentiles = tuple(curve_percentiles)
+        self._curve_hours = []
+        self._curve = []
+
+    @property
+    def sessions(self) -> int:
+        """Number of simulated sessions."""
+        return len(self.final_bankrolls)
+
+    @property
+    def ruined(self) -> np.ndarray:
+        """Return which sessions could no longer cover the table minimum."""
+        return (self.endings & SESSION_RUINED) != 0
+
+    @property
+    def stopped(self) -> np.ndarray:
+        """Return which sessions reached their stop-loss."""
+        return (self.endings & SESSION_STOPPED) != 0
+
+    @property
+    def reached_goal(self) -> np.ndarray:
+        """Return which sessions reached their win goal."""
+        return (self.endings & SESSION_REACHED_GOAL) != 0
+
+    @property
+    def curve_hours(self) -> np.ndarray:
+        """Return the hours the bankroll curve was recorded at."""
+        return np.array(self._curve_hours)
+
+    @property
+    def curve(self) -> np.ndarray:
+        """Return the bankroll percentiles recorded at each curve hour."""
+        return np.array(self._curve)
+
+    @property
+    def risk_of_ruin(self) -> float:
+        """Share of sessions that could no longer cover the table minimum."""
+        return float(self.ruined.mean()) if self.sessions else 0.0
+
+    def add_round(self, sessions: np.ndarray, bankrolls: np.ndarray, hour: float):
+        """Record the bankrolls of the listed sessions after a round that ended at hour."""
+        doubled = sessions[(bankrolls >= 2 * self.starting_bankroll)
+                           & np.isnan(self.hours_to_double[sessions])]
+        self.hours_to_double[doubled] = hour
+        self.final_bankrolls[sessions] = bankrolls
+        self.rounds_played[sessions] += 1
+
+    def add_curve_point(self, hour: float):
+        """Record the bankroll percentiles of every session at hour."""
+        self._curve_hours.append(hour)
+        self._curve.append(np.percentile(self.final_bankrolls, self.curve_percentiles))
+
+    def hours_to_double_percentiles(self, percentiles=(10, 50, 90)):
+        """Return percentiles of the hours to double among sessions that doubled."""
+        doubled = self.hours_to_double[~np.isnan(self.hours_to_double)]
+        if doubled.size == 0:
+            return {f"p{percentile}": None for percentile in percentiles}
+        return {f"p{percentile}": float(value)
+                for percentile, value in zip(percentiles, np.percentile(doubled, percentiles))}
+
+    def to_dict(self):
+        """Return the summary statistics as a plain dictionary."""
+        doubled = ~np.isnan(self.hours_to_double)
+        curve = self.curve
+        return {
+            "sessions": self.sessions,
+            "starting_bankroll": self.starting_bankroll,
+            "risk_of_ruin": self.risk_of_ruin,
+            "stop_loss_rate": float(self.stopped.mean()) if self.sessions else 0.0,
+            "win_goal_rate": float(self.reached_goal.mean()) if self.sessions else 0.0,
+            "doubled_rate": float(doubled.mean()) if self.sessions else 0.0,
+            "hours_to_double": self.hours_to_double_percentiles(),
+            "mean_final_bankroll": float(self.final_bankrolls.mean()) if self.sessions else 0.0,
+            "curve": {
+                "hours": self.curve_hours.tolist(),
+                **{f"p{percentile}": curve[:, column].tolist()
+                   for column, percentile in enumerate(self.curve_percentiles)},
+            },
+        }
+
+
+class BankrollSimulator:
+    """Simulates many complete sessions side by side, one array lane per session.
+
+    Every lane keeps its own shoe between rounds and reshuffles it once
+    penetration of it has been dealt. Each step plays one round in every
+    live lane with the simulator's array play, bets by the lane's true
+    count and bankroll, and settles the bankrolls. Bets are limited to the
+    table limits, given as (minimum, maximum) bets, and to the bankroll, and
+    a session is ruined once its bankroll cannot cover the table minimum.
+    Doubling or splitting can lose more than the bet, so a loss larger than
+    the bankroll leaves it at zero.
+    """
+
+    curve_percentiles = CURVE_PERCENTILES
+
+    def __init__(self, simulator: BlackjackSimulator, bet_spread, *,
+                 table_limits: tuple[float, float] = (10, 1000), penetration: float = 0.75,
+                 counting_system: CountingSystem = HI_LO, rounds_per_hour: int = 100):
+        """Initialize engine for a simulator's game and strategy."""
+        min_bet, max_bet = table_limits
+        if not 0 < penetration <= 1:
+            raise ValueError(f"Invalid penetration: {penetration}")
+        if not 0 < min_bet <= max_bet:
+            raise ValueError(f"Invalid table limits: {min_bet} to {max_bet}")
+        if rounds_per_hour < 1:
+            raise ValueError(f"Invalid rounds per hour: {rounds_per_hour}")
+
+        self.simulator = simulator
+        self.bet_spread = bet_spread
+        self.min_bet = min_bet
+        self.max_bet = max_bet
+        self.penetration = penetration
+        self.counting_system = counting_system
+        self.rounds_per_hour = rounds_per_hour
+        self.tags = np.array(counting_system.tags, dtype=np.float64)
+
+    def true_counts(self, shoe: Shoe) -> np.ndarray:
+        """Return the true count of every lane from the cards dealt from its shoe.
+
+        Unbalanced systems return their running count.
+        """
+        full_shoe = CARDS_PER_RANK * self.simulator.decks
+        running_counts = self.counting_system.initial_count(self.simulator.decks) + (
+            (full_shoe - shoe.counts) @ self.tags)
+        if not self.counting_system.balanced:
+            return running_counts
+        return running_counts * CARDS_PER_DECK / np.maximum(shoe.remaining, 1)
+
+    def simulate(self, sessions: int, bankroll: float, hours: float, *,
+                 stop_loss: float | None = None, win_goal: float | None = None,
+                 seed=None) -> BankrollResult:
+        """Simulate sessions of at most hours each, starting from bankroll.
+
+        A session stops once it has lost stop_loss or won win_goal, when given.
+        """
+        shoe = Shoe(sessions, self.simulator.decks, np.random.default_rng(seed))
+        result = BankrollResult(bankroll, sessions, self.curve_percentiles)
+        result.add_curve_point(0.0)
+        live = np.arange(sessions)
+
+        max_rounds = int(hours * self.rounds_per_hour)
+        for round_number in range(1, max_rounds + 1):
+            if live.size == 0:
+                break
+
+            bankrolls = self._play_round(shoe, live, result.final_bankrolls[live])
+            result.add_round(live, bankrolls, round_number / self.rounds_per_hour)
+            endings = self._endings(bankrolls, result.starting_bankroll, stop_loss, win_goal)
+            result.endings[live] = endings
+            live = live[endings == 0]
+
+            if round_number % self.rounds_per_hour == 0 or round_number == max_rounds:
+                result.add_curve_point(round_number / self.rounds_per_hour)
+        return result
+
+    def _play_round(self, shoe: Shoe, lanes: np.ndarray, bankrolls: np.ndarray) -> np.ndarray:
+        """Bet and play one round in each listed lane and return the settled bankrolls."""
+        lane_shoe = shoe.take(lanes)
+        bets = self.bet_spread.bets(self.true_counts(lane_shoe), bankrolls)
+        bets = np.minimum(np.clip(bets, self.min_bet, self.max_bet), bankrolls)
+
+        action_codes = np.zeros(len(self.simulator.strategy.palette), dtype=np.int64)
+        results = self.simulator.play_rounds(lane_shoe, action_codes)
+        reshuffle_at = CARDS_PER_DECK * self.simulator.decks * (1 - self.penetration)
+        lane_shoe.reshuffle(np.flatnonzero(lane_shoe.remaining < reshuffle_at))
+        shoe.put(lanes, lane_shoe)
+        return np.maximum(bankrolls + bets * results / 2, 0.0)
+
+    def _endings(self, bankrolls: np.ndarray, bankroll: float, stop_loss: float | None,
+                 win_goal: float | None) -> np.ndarray:
+        """Return the ending flags of sessions that started from bankroll, 0 to go on."""
+        endings = np.where(bankrolls < self.min_bet, SESSION_RUINED, 0)
+        if stop_loss is not None:
+            endings |= np.where(bankrolls <= bankroll - stop_loss, SESSION_STOPPED, 0)
+        if win_goal is not None:
+            endings |= np.where(bankrolls >= bankroll + win_goal, SESSION_REACHED_GOAL, 0)
+        return endings
@@ -0,0 +1,206 @@
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from services.blackjack_helper import BlackjackHelper, HelperSnapshot
+from services.bulk_advice import advise_batch_threaded
+from services.chart_registry import ChartRegistry, ChartVariant
+from services.simulator import BlackjackSimulator
+
+LOWER_IS_BETTER = "lower"
+HIGHER_IS_BETTER = "higher"
+
+BENCHMARK_HANDS = [
+    (dealer, [str(first), str(second)])
+    for dealer in map(str, range(1, 11)) for first in range(1, 11) for second in range(1, 11)
+]
+
+THREAD_COUNTS = (1, 2, 4, 8, 16, 32, 64)
+
+
+def _metric(value: float, unit: str, better: str):
+    """Return a metric entry."""
+    return {"value": value, "unit": unit, "better": better}
+
+
+def _time_calls(function, repeats: int):
+    """Return the duration of each of repeats calls of function in seconds."""
+    durations = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - started)
+    return durations
+
+
+def benchmark_ask_help(blackjack_helper: BlackjackHelper, repeats: int):
+    """Measure single-hand ask_help latency over every two-card hand."""
+    latencies = []
+    for _ in range(repeats):
+        for dealer_card, player_cards in BENCHMARK_HANDS:
+            started = time.perf_counter_ns()
+            blackjack_helper.ask_help(dealer_card, player_cards)
+            latencies.append(time.perf_counter_ns() - started)
+
+    p50, p99 = np.percentile(latencies, [50, 99])
+    return {
+        "ask_help_p50_us": _metric(p50 / 1000, "us", LOWER_IS_BETTER),
+        "ask_help_p99_us": _metric(p99 / 1000, "us", LOWER_IS_BETTER),
+    }
+
+
+def _random_hands(hands: int):
+    """Return dealer cards and random three-card hands, some with only two cards."""
+    generator = np.random.default_rng(0)
+    dealer_cards = generator.integers(1, 11, hands)
+    player_cards = generator.integers(0, 11, (hands, 3))
+    player_cards[:, :2] = np.maximum(player_cards[:, :2], 1)
+    return dealer_cards, player_cards
+
+
+def benchmark_batch(blackjack_helper: BlackjackHelper, hands: int, repeats: int):
+    """Measure ask_help_batch throughput on random three-card hands."""
+    dealer_cards, player_cards = _random_hands(hands)
+    duration = min(_time_calls(
+        lambda: blackjack_helper.ask_help_batch(dealer_cards, player_cards), repeats))
+    return {"batch_hands_per_second": _metric(hands / duration, "hands/s", HIGHER_IS_BETTER)}
+
+
+def is_free_threaded() -> bool:
+    """Check if the interpreter runs without the GIL."""
+    return not getattr(sys, "_is_gil_enabled", lambda: True)()
+
+
+def benchmark_thread_scaling(snapshot: HelperSnapshot, hands: int, repeats: int,
+                             thread_counts=None):
+    """Measure threaded batch throughput of one shared snapshot for each thread count.
+
+    thread_scaling_N_threads is the throughput with N threads relative to
+    one thread. It can only grow well past one on free-threaded CPython
+    with that many cores. Thread counts default to powers of two up to the
+    core count, at least up to four.
+    """
+    thread_counts = thread_counts or [
+        threads for threads in THREAD_COUNTS if threads <= max(4, os.cpu_count() or 1)]
+    dealer_cards, player_cards = _random_hands(hands)
+
+    metrics = {}
+    single_thread = None
+    for threads in thread_counts:
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            duration = min(_time_calls(
+                lambda threads=threads, executor=executor: advise_batch_threaded(
+                    snapshot, dealer_cards, player_cards, threads, executor), repeats))
+        throughput = hands / duration
+        single_thread = single_thread or throughput
+        metrics[f"threaded_batch_{threads}_threads_hands_per_second"] = _metric(
+            throughput, "hands/s", HIGHER_IS_BETTER)
+        metrics[f"thread_scaling_{threads}_threads"] = _metric(
+            throughput / single_thread, "x", HIGHER_IS_BETTER)
+    return metrics
+
+
+def benchmark_chart_loading(charts_directory: str, repeats: int):
+    """Measure JSON and chart pack load times and the memory of a loaded chart set.
+
+    helper_extra_bytes is the memory a helper adds on top of its chart set.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        for file in os.listdir(charts_directory):
+            if file.endswith(".json"):
+                shutil.copy(os.path.join(charts_directory, file), directory)
+
+        cold = _time_calls(lambda: BlackjackHelper.from_charts_directory(directory), 1)[0]
+        warm = statistics.median(_time_calls(
+            lambda: BlackjackHelper.from_charts_directory(directory), repeats))
+
+        tracemalloc.start()
+        charts = BlackjackHelper.load_charts_directory(directory)
+        chart_set_bytes = tracemalloc.get_traced_memory()[0]
+        blackjack_helper = BlackjackHelper(charts["normal"], charts["soft"], charts["split"])
+        helper_bytes = tracemalloc.get_traced_memory()[0] - chart_set_bytes
+        tracemalloc.stop()
+        del blackjack_helper
+
+        BlackjackHelper.pack_charts_directory(directory)
+        packed = statistics.median(_time_calls(
+            lambda: BlackjackHelper.from_charts_directory(directory), repeats))
+
+    return {
+        "load_cold_ms": _metric(cold * 1000, "ms", LOWER_IS_BETTER),
+        "load_warm_ms": _metric(warm * 1000, "ms", LOWER_IS_BETTER),
+        "load_pack_ms": _metric(packed * 1000, "ms", LOWER_IS_BETTER),
+        "chart_set_bytes": _metric(chart_set_bytes, "bytes", LOWER_IS_BETTER),
+        "helper_extra_bytes": _metric(helper_bytes, "bytes", LOWER_IS_BETTER),
+    }
+
+
+def benchmark_registry(charts_root: str, repeats: int):
+    """Measure switching to a chart set that is already in the registry."""
+    registry = ChartRegistry(charts_root)
+    variant = ChartVariant(1, False)
+    registry.charts(variant)
+    switch = statistics.median(_time_calls(lambda: registry.charts(variant), repeats))
+    return {"registry_hit_us": _metric(switch * 1e6, "us", LOWER_IS_BETTER)}
+
+
+def benchmark_simulation(blackjack_helper: BlackjackHelper, rounds: int):
+    """Measure Monte Carlo simulation throughput on one core."""
+    simulator = BlackjackSimulator(blackjack_helper)
+    duration = _time_calls(lambda: simulator.simulate(rounds, seed=0), 1)[0]
+    return {"simulation_rounds_per_second": _metric(
+        rounds / duration, "rounds/s", HIGHER_IS_BETTER)}
+
+
+def run_benchmarks(charts_root: str = "data/charts", quick: bool = False):
+    """Run every benchmark and return the results as a JSON-compatible dictionary.
+
+    quick uses much smaller workloads, which is only meant for smoke tests.
+    """
+    charts_directory = os.path.join(charts_root, "single_deck", "stand_on_soft_17")
+    blackjack_helper = BlackjackHelper.from_charts_directory(charts_directory)
+    repeats = 1 if quick else 20
+
+    metrics = {}
+    metrics.update(benchmark_ask_help(blackjack_helper, repeats))
+    metrics.update(benchmark_batch(blackjack_helper, 1000 if quick else 1_000_000,
+                                   1 if quick else 5))
+    metrics.update(benchmark_thread_scaling(blackjack_helper.snapshot(),
+                                            1000 if quick else 1_000_000, 1 if quick else 5))
+    metrics.update(benchmark_chart_loading(charts_directory, repeats))
+    metrics.update(benchmark_registry(charts_root, 10 if quick else 1000))
+    metrics.update(benchmark_simulation(blackjack_helper, 1000 if quick else 500_000))
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "free_threaded": is_free_threaded(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "metrics": metrics,
+    }
+
+
+def compare_to_baseline(results, baseline, tolerance: float = 0.2):
+    """Return the metrics that are more than tolerance worse than in baseline.
+
+    Each regression is (name, baseline value, current value, relative change),
+    where a positive change is always worse.
+    """
+    regressions = []
+    for name, metric in results["metrics"].items():
+        baseline_metric = baseline["metrics"].get(name)
+        if baseline_metric is None or not baseline_metric["value"]:
+            continue
+
+        change = metric["value"] / baseline_metric["value"] - 1
+        if metric["better"] == HIGHER_IS_BETTER:
+            change = -change
+        if change > tolerance:
+            regressions.append((name, baseline_metric["value"], metric["value"], change))
+    return regressions
@@ -1,7 +1,21 @@
 from enum import StrEnum
+import itertools
 import json
 import os
+import threading
+import time
+from types import MappingProxyType
+import numpy as np
 from services.chart import Chart
+from services.chart_pack import (
+    PACK_FILE_NAME, chart_pack_is_current, load_chart_pack, write_chart_pack)
+from services.decision_table import (
+    CARD_VALUES, HARD_HAND, PAIR_HAND, SOFT_HAND, DecisionTable,
+    classify_card_counts, classify_card_ranks)
+from services.deviations import DEVIATIONS_FILE_NAME, DEVIATIONS_NAME, StrategyDeviations
+from services.hand_state import HandState
+from services.metrics import CHART_NAMES, AdviceMetrics
+from services.split_hands import SplitHands
 
 
 class BlackjackActions(StrEnum):
@@ -34,6 +48,15 @@ def get_blackjack_action_name(action: BlackjackActions) -> str:
     return BLACKJACK_ACTION_NAMES.get(action, "Unknown")
 
 
+ACTION_PALETTE = (None, *BlackjackActions)
+ACTION_CODES = {action: code for code, action in enumerate(ACTION_PALETTE) if action is not None}
+INVALID_ACTION_CODE = ACTION_PALETTE.index(None)
+HIT_ACTION_CODE = ACTION_CODES[BlackjackActions.HIT]
+
+
+REQUIRED_CHARTS = ["normal", "soft", "split"]
+
+
 BLACKJACK_CARDS = ["1", "2", "3", "4", "5", "6", "7", "8", "9", "10"]
 
 
@@ -45,33 +68,212 @@ class BlackjackRules(StrEnum):
     SURRENDER_ALLOWED = 'surrender_allowed'
 
 
-class BlackjackHelper:
-    """Provides blackjack strategy advice using charts and rules."""
-    def __init__(self, normal_chart: Chart, soft_chart: Chart, split_chart: Chart, rules=None):
-        """Initialize charts and possible rules."""
-        normal_chart.set_on_not_found(BlackjackActions.STAND)
-        soft_chart.set_on_not_found(BlackjackActions.STAND)
-        split_chart.set_on_not_found(BlackjackActions.STAND)
+DEFAULT_RULES = {
+    BlackjackRules.DOUBLE_ALLOWED: True,
+    BlackjackRules.SPLIT_ALLOWED: True,
+    BlackjackRules.DOUBLE_AFTER_SPLIT_ALLOWED: False,
+    BlackjackRules.SURRENDER_ALLOWED: False,
+}
+
 
-        self.verify_blackjack_chart(normal_chart)
-        self.verify_blackjack_chart(soft_chart)
-        self.verify_blackjack_chart(split_chart)
+RULE_DEPENDENT_ACTIONS = {
+    BlackjackActions.DOUBLE_HIT: (BlackjackRules.DOUBLE_ALLOWED,
+                                  BlackjackActions.DOUBLE, BlackjackActions.HIT),
+    BlackjackActions.DOUBLE_STAND: (BlackjackRules.DOUBLE_ALLOWED,
+                                    BlackjackActions.DOUBLE, BlackjackActions.STAND),
+    BlackjackActions.SPLIT_DOUBLE: (BlackjackRules.DOUBLE_AFTER_SPLIT_ALLOWED,
+                                    BlackjackActions.SPLIT, BlackjackActions.DOUBLE),
+    BlackjackActions.SPLIT_STAND: (BlackjackRules.DOUBLE_AFTER_SPLIT_ALLOWED,
+                                   BlackjackActions.SPLIT, BlackjackActions.STAND),
+    BlackjackActions.SPLIT_HIT: (BlackjackRules.DOUBLE_AFTER_SPLIT_ALLOWED,
+                                 BlackjackActions.SPLIT, BlackjackActions.HIT),
+    BlackjackActions.SURRENDER_HIT: (BlackjackRules.SURRENDER_ALLOWED,
+                                     BlackjackActions.SURRENDER, BlackjackActions.HIT),
+    BlackjackActions.SURRENDER_STAND: (BlackjackRules.SURRENDER_ALLOWED,
+                                       BlackjackActions.SURRENDER, BlackjackActions.STAND),
+}
 
-        self.normal_chart = normal_chart
-        self.soft_chart = soft_chart
-        self.split_chart = split_chart
 
-        self.rules = rules or {
-            BlackjackRules.DOUBLE_ALLOWED: True,
-            BlackjackRules.SPLIT_ALLOWED: True,
-            BlackjackRules.DOUBLE_AFTER_SPLIT_ALLOWED: False,
-            BlackjackRules.SURRENDER_ALLOWED: False,
-        }
+def split_hand_rules(rules, resplit_allowed: bool):
+    """Return the rules that apply to a hand made by splitting a pair.
+
+    Doubling needs DOUBLE_AFTER_SPLIT_ALLOWED, surrender is not possible
+    and the hand may only be split again when resplit_allowed.
+    """
+    split_rules = dict(rules)
+    split_rules[BlackjackRules.DOUBLE_ALLOWED] = (
+        rules[BlackjackRules.DOUBLE_ALLOWED]
+        and rules[BlackjackRules.DOUBLE_AFTER_SPLIT_ALLOWED])
+    split_rules[BlackjackRules.SPLIT_ALLOWED] = (
+        rules[BlackjackRules.SPLIT_ALLOWED] and resplit_allowed)
+    split_rules[BlackjackRules.SURRENDER_ALLOWED] = False
+    return split_rules
+
+
+class ChartSet:
+    """Charts of a helper together with the decision tables compiled from them.
+
+    A published chart set is never modified. Changing charts or rules builds
+    a new one and publishes it with a single reference assignment, so a
+    thread that reads helper.chart_set once sees charts and tables that
+    belong together. generation counts the chart changes of a helper, and
+    rule_tables caches compiled tables per rule combination for every chart
+    set made from the same charts, and rules holds the rule values the
+    tables were compiled for.
+    """
+
+    __slots__ = ("charts", "generation", "rule_tables", "decision_table", "action_names",
+                 "split_decision_tables", "rules")
+
+    def __init__(self, charts, generation: int, rule_tables, tables=(None, None, None, None)):
+        """Initialize chart set from a chart name to Chart dictionary and the
+        tables of the rules in force.
+
+        Deviations are read from its "deviations" entry, if any.
+        """
+        self.charts = charts
+        self.generation = generation
+        self.rule_tables = rule_tables
+        self.decision_table, self.action_names, self.split_decision_tables, self.rules = tables
+
+    @property
+    def normal_chart(self) -> Chart:
+        """Return the normal chart."""
+        return self.charts["normal"]
+
+    @property
+    def soft_chart(self) -> Chart:
+        """Return the soft chart."""
+        return self.charts["soft"]
+
+    @property
+    def split_chart(self) -> Chart:
+        """Return the split chart."""
+        return self.charts["split"]
+
+    @property
+    def deviations(self) -> StrategyDeviations | None:
+        """Return the count-based deviations, if any."""
+        return self.charts.get(DEVIATIONS_NAME)
+
+    @property
+    def tables(self) -> tuple:
+        """Return the decision table, action names, split decision tables and rules."""
+        return self.decision_table, self.action_names, self.split_decision_tables, self.rules
+
+    def with_tables(self, tables):
+        """Return a chart set of the same charts with the tables of other rules."""
+        return ChartSet(self.charts, self.generation, self.rule_tables, tables)
+
+
+# The helper is the one advice facade shared by the UI, server and tools.
+class BlackjackHelper:  # pylint: disable=too-many-public-methods
+    """Provides blackjack strategy advice using charts and rules.
+
+    Advice reads the published chart set and rules without locks. Changing
+    charts or rules compiles and publishes under one writer lock, so
+    concurrent reloads and rule changes never overwrite each other.
+    """
+    def __init__(self, normal_chart: Chart, soft_chart: Chart, split_chart: Chart, rules=None,
+                 *, deviations: StrategyDeviations | None = None,
+                 chart_set: ChartSet | None = None):
+        """Initialize charts, possible rules and optional count-based deviations.
+
+        A helper given the published chart_set of these charts shares its
+        compiled tables instead of verifying and compiling the charts again.
+        """
+        self.metrics = None
+        self.decision_log = None
+        self._decision_log_source = (0, 0)
+        self._publish_lock = threading.Lock()
+        self.rules = rules or dict(DEFAULT_RULES)
+
+        if chart_set is None:
+            self.verify_blackjack_chart(normal_chart)
+            self.verify_blackjack_chart(soft_chart)
+            self.verify_blackjack_chart(split_chart)
+            chart_set = self._build_chart_set(
+                {"normal": normal_chart, "soft": soft_chart, "split": split_chart,
+                 DEVIATIONS_NAME: deviations}, 0)
+        else:
+            tables = self._compile_rule_tables(self.rules, chart_set)
+            if chart_set.decision_table is not tables[0]:
+                chart_set = chart_set.with_tables(tables)
+        self.chart_set = chart_set
+
+    @property
+    def normal_chart(self) -> Chart:
+        """Return the normal chart of the current chart set."""
+        return self.chart_set.normal_chart
+
+    @property
+    def soft_chart(self) -> Chart:
+        """Return the soft chart of the current chart set."""
+        return self.chart_set.soft_chart
+
+    @property
+    def split_chart(self) -> Chart:
+        """Return the split chart of the current chart set."""
+        return self.chart_set.split_chart
+
+    @property
+    def deviations(self) -> StrategyDeviations | None:
+        """Return the count-based deviations of the current chart set."""
+        return self.chart_set.deviations
+
+    @deviations.setter
+    def deviations(self, deviations: StrategyDeviations | None):
+        """Publish the current chart set with other deviations."""
+        with self._publish_lock:
+            chart_set = self.chart_set
+            self.chart_set = ChartSet({**chart_set.charts, DEVIATIONS_NAME: deviations},
+                                      chart_set.generation, chart_set.rule_tables,
+                                      chart_set.tables)
+
+    @property
+    def decision_table(self) -> DecisionTable:
+        """Return the decision table of the current charts and rules."""
+        return self.chart_set.decision_table
+
+    @property
+    def action_names(self) -> list:
+        """Return the readable name of every decision table code."""
+        return self.chart_set.action_names
+
+    @property
+    def generation(self) -> int:
+        """Return how many times the charts have been changed."""
+        return self.chart_set.generation
 
     @staticmethod
-    def _load_charts_from_directory(directory: str):
-        """Load chart data from a directory."""
-        files = [f for f in os.listdir(directory) if f.endswith(".json")]
+    def load_charts_directory(directory: str):
+        """Load charts from a directory, preferring an up-to-date chart pack.
+
+        Deviations from an optional deviations file are added under "deviations".
+        """
+        charts = None
+        if chart_pack_is_current(directory):
+            try:
+                charts = load_chart_pack(os.path.join(directory, PACK_FILE_NAME))
+            except ValueError:
+                charts = None
+            if charts is not None and not all(chart in charts for chart in REQUIRED_CHARTS):
+                charts = None
+
+        if charts is None:
+            charts = BlackjackHelper._load_json_charts_from_directory(directory)
+
+        deviations_path = os.path.join(directory, DEVIATIONS_FILE_NAME)
+        if os.path.exists(deviations_path):
+            charts[DEVIATIONS_NAME] = StrategyDeviations.from_file(
+                deviations_path, BlackjackActions)
+        return charts
+
+    @staticmethod
+    def _load_json_charts_from_directory(directory: str):
+        """Load chart data from the JSON files in a directory."""
+        files = [f for f in os.listdir(directory)
+                 if f.endswith(".json") and f != DEVIATIONS_FILE_NAME]
 
         charts = {}
         for file in files:
@@ -81,30 +283,42 @@ class BlackjackHelper:
                 chart_name = file.split(".")[0]
                 charts[chart_name] = Chart(chart_data)
 
-        required_charts = ["normal", "soft", "split"]
-        if not all(chart in charts for chart in required_charts):
+        if not all(chart in charts for chart in REQUIRED_CHARTS):
             raise ValueError(
-                f"Missing one or more required charts: {required_charts}")
+                f"Missing one or more required charts: {REQUIRED_CHARTS}")
 
-        for chart_name in required_charts:
+        for chart_name in REQUIRED_CHARTS:
             BlackjackHelper.verify_blackjack_chart(charts[chart_name])
 
         return charts
 
+    @staticmethod
+    def pack_charts_directory(directory: str) -> str:
+        """Validate the JSON charts of a directory and write them into a chart pack."""
+        charts = BlackjackHelper._load_json_charts_from_directory(directory)
+        pack_path = os.path.join(directory, PACK_FILE_NAME)
+        write_chart_pack(pack_path, {chart_name: charts[chart_name]
+                                     for chart_name in REQUIRED_CHARTS})
+        return pack_path
+
     @staticmethod
     def from_charts_directory(directory: str):
         """Create BlackjackHelper from chart files in directory."""
-        charts = BlackjackHelper._load_charts_from_directory(directory)
+        charts = BlackjackHelper.load_charts_directory(directory)
 
         return BlackjackHelper(
             normal_chart=charts["normal"],
             soft_chart=charts["soft"],
-            split_chart=charts["split"]
+            split_chart=charts["split"],
+            deviations=charts.get(DEVIATIONS_NAME)
         )
 
     @staticmethod
     def verify_blackjack_chart(chart: Chart):
         """Validate a chart's values."""
+        if chart.prevalidated:
+            return True
+
         chart_data = chart.get_chart_data()
 
         for outer_key, inner_dict in chart_data.items():
@@ -116,34 +330,149 @@ class BlackjackHelper:
                     raise ValueError(
                         f"Invalid inner key: {inner_key} in {outer_key}")
 
-                if value not in BlackjackActions:
+                if value not in ACTION_CODES:
                     raise ValueError(
                         f"Invalid value: {value} in {outer_key} -> {inner_key}")
 
         return True
 
+    def snapshot(self):
+        """Return a frozen HelperSnapshot of the current charts and rules."""
+        return HelperSnapshot(self.chart_set, self.rules)
+
     def change_charts_directory(self, directory: str):
         """Change to new charts from a directory."""
-        charts = BlackjackHelper._load_charts_from_directory(directory)
-
-        normal_chart = charts["normal"]
-        soft_chart = charts["soft"]
-        split_chart = charts["split"]
+        self.change_charts(BlackjackHelper.load_charts_directory(directory))
+
+    def change_charts(self, charts):
+        """Change to new charts given as a chart name to Chart dictionary.
+
+        Deviations are taken from its "deviations" entry, if any. The new
+        tables are compiled before the chart set is swapped, so advice keeps
+        using the old charts until the new ones are ready.
+        """
+        with self._publish_lock:
+            self.chart_set = self._build_chart_set(charts, self.chart_set.generation + 1)
+
+    def change_charts_and_rules(self, charts, rules):
+        """Change to new charts and rule values with a single chart set swap.
+
+        Only the tables of the new rules are compiled, so advice goes straight
+        from the old charts and rules to the new ones.
+        """
+        for rule_name in rules:
+            if rule_name not in BlackjackRules:
+                raise ValueError(f"Unknown rule: {rule_name}")
+
+        with self._publish_lock:
+            rules = {**self.rules, **rules}
+            self.chart_set = self._build_chart_set(charts, self.chart_set.generation + 1, rules)
+            self.rules = rules
+
+    def restore_chart_set(self, chart_set: ChartSet):
+        """Change back to the charts of an earlier chart set as a new generation."""
+        self.change_charts(chart_set.charts)
+
+    def _build_chart_set(self, charts, generation: int, rules=None) -> ChartSet:
+        """Return a chart set of charts with the tables of rules compiled.
+
+        Uses the helper's own rules when rules is None.
+        """
+        for chart_name in REQUIRED_CHARTS:
+            charts[chart_name].set_on_not_found(BlackjackActions.STAND)
+        chart_set = ChartSet(dict(charts), generation, {})
+        return chart_set.with_tables(self._compile_rule_tables(rules or self.rules, chart_set))
+
+    def compile_decision_table(self, rules=None) -> DecisionTable:
+        """Compile the current charts into a decision table for rules.
+
+        Uses the helper's own rules when rules is None.
+        """
+        return self._compile_table(rules or self.rules, self.chart_set)
+
+    def _compile_table(self, rules, chart_set: ChartSet) -> DecisionTable:
+        """Compile the charts of chart_set into a decision table for rules."""
+        return DecisionTable(
+            chart_set.normal_chart, chart_set.soft_chart, chart_set.split_chart,
+            lambda action: self._resolve_action(action, rules),
+            split_allowed=rules[BlackjackRules.SPLIT_ALLOWED], palette=ACTION_PALETTE)
 
-        normal_chart.set_on_not_found(BlackjackActions.STAND)
-        soft_chart.set_on_not_found(BlackjackActions.STAND)
-        split_chart.set_on_not_found(BlackjackActions.STAND)
-
-        self.normal_chart = normal_chart
-        self.soft_chart = soft_chart
-        self.split_chart = split_chart
+    @staticmethod
+    def _rules_key(rules) -> tuple:
+        """Return a hashable key of the values of every rule."""
+        return tuple(bool(rules[rule_name]) for rule_name in BlackjackRules)
+
+    def _compile_rule_tables(self, rules, chart_set: ChartSet | None = None):
+        """Return the decision table, action names, split table cache and rules
+        of a rule combination.
+
+        Compiled tables are kept per rule combination until the charts change.
+        """
+        chart_set = chart_set or self.chart_set
+        key = self._rules_key(rules)
+        rule_tables = chart_set.rule_tables.get(key)
+        if rule_tables is None:
+            rule_tables = self._compile_tables(rules, chart_set)
+            chart_set.rule_tables[key] = rule_tables
+        return rule_tables
+
+    def _compile_tables(self, rules, chart_set: ChartSet):
+        """Compile the decision table of rules together with its action names,
+        an empty split table cache and a copy of rules."""
+        table = self._compile_table(rules, chart_set)
+        return (table, [get_blackjack_action_name(action) for action in table.palette], {},
+                dict(rules))
+
+    def _publish_rules(self, rules):
+        """Switch to rules and their decision table, compiling it if needed.
+
+        Must be called holding the publish lock.
+        """
+        chart_set = self.chart_set
+        self.chart_set = chart_set.with_tables(self._compile_rule_tables(rules, chart_set))
+        self.rules = rules
+
+    def precompile_rule_tables(self) -> int:
+        """Compile the decision tables of every rule combination and return their count.
+
+        Afterwards set_rule and set_rules only swap tables until the charts change.
+        """
+        for values in itertools.product((False, True), repeat=len(BlackjackRules)):
+            self._compile_rule_tables(dict(zip(BlackjackRules, values)))
+        return len(self.chart_set.rule_tables)
+
+    def split_decision_table(self, resplit_allowed: bool):
+        """Return the decision table and action names for hands made by splitting.
+
+        The tables are compiled with split_hand_rules on first use.
+        """
+        split_chart_set = self._split_chart_set(self.chart_set, resplit_allowed)
+        return split_chart_set.decision_table, split_chart_set.action_names
+
+    def _split_chart_set(self, chart_set: ChartSet, resplit_allowed: bool) -> ChartSet:
+        """Return chart_set with the tables for hands made by splitting."""
+        split_decision_tables = chart_set.split_decision_tables
+        if resplit_allowed not in split_decision_tables:
+            split_decision_tables[resplit_allowed] = self._compile_tables(
+                split_hand_rules(chart_set.rules, resplit_allowed), chart_set)
+        return chart_set.with_tables(split_decision_tables[resplit_allowed])
 
     def set_rule(self, rule_name: BlackjackRules, value: bool):
         """Set the value of a blackjack rule."""
         if rule_name not in BlackjackRules:
             raise ValueError(f"Unknown rule: {rule_name}")
 
-        self.rules[rule_name] = value
+        with self._publish_lock:
+            self._publish_rules({**self.rules, rule_name: value})
+
+    def set_rules(self, rules):
+        """Set the values of several blackjack rules at once."""
+        for rule_name in rules:
+            if rule_name not in BlackjackRules:
+                raise ValueError(f"Unknown rule: {rule_name}")
+
+        with self._publish_lock:
+            self._publish_rules({**self.rules, **rules})
 
     def get_rule(self, rule_name: BlackjackRules):
         """Get the value of a blackjack rule."""
@@ -152,75 +481,316 @@ class BlackjackHelper:
 
         return self.rules[rule_name]
 
-    def _get_correct_action_from_rules(self, action: BlackjackActions):
-        """Adjust action based on current rules."""
-        rules_map = {
-            BlackjackActions.DOUBLE_HIT: (BlackjackRules.DOUBLE_ALLOWED,
-                                          BlackjackActions.DOUBLE, BlackjackActions.HIT),
-            BlackjackActions.DOUBLE_STAND: (BlackjackRules.DOUBLE_ALLOWED,
-                                            BlackjackActions.DOUBLE, BlackjackActions.STAND),
-            BlackjackActions.SPLIT_DOUBLE: (BlackjackRules.DOUBLE_AFTER_SPLIT_ALLOWED,
-                                            BlackjackActions.SPLIT, BlackjackActions.DOUBLE),
-            BlackjackActions.SPLIT_STAND: (BlackjackRules.DOUBLE_AFTER_SPLIT_ALLOWED,
-                                           BlackjackActions.SPLIT, BlackjackActions.STAND),
-            BlackjackActions.SPLIT_HIT: (BlackjackRules.DOUBLE_AFTER_SPLIT_ALLOWED,
-                                         BlackjackActions.SPLIT, BlackjackActions.HIT),
-            BlackjackActions.SURRENDER_HIT: (BlackjackRules.SURRENDER_ALLOWED,
-                                             BlackjackActions.SURRENDER, BlackjackActions.HIT),
-            BlackjackActions.SURRENDER_STAND: (BlackjackRules.SURRENDER_ALLOWED,
-                                               BlackjackActions.SURRENDER, BlackjackActions.STAND),
-        }
-
-        if action in rules_map:
-            rule, allowed_action, fallback_action = rules_map[action]
-            return allowed_action if self.rules[rule] else fallback_action
+    @staticmethod
+    def _resolve_action(action: BlackjackActions, rules) -> BlackjackActions:
+        """Adjust action based on the given rules."""
+        if action in RULE_DEPENDENT_ACTIONS:
+            rule, allowed_action, fallback_action = RULE_DEPENDENT_ACTIONS[action]
+            return allowed_action if rules[rule] else fallback_action
 
         return action
 
-    def _is_pair(self, player_cards: list[str]) -> bool:
-        """Check if player_cards is a pair."""
-        return len(player_cards) == 2 and player_cards[0] == player_cards[1]
-
-    def _determine_chart_and_value_to_search(self, player_cards):
-        """Choose correct chart and lookup value."""
+    @staticmethod
+    def _classify_hand(player_cards: list[str]):
+        """Return hand class and lookup total, or None for invalid cards."""
         total_value = 0
-
-        if self._is_pair(player_cards):
-            if self.get_rule(BlackjackRules.SPLIT_ALLOWED):
-                return self.split_chart, player_cards[0]
-
         found_ace = False
         for card in player_cards:
-            if card == "1" and not found_ace:
+            card_value = CARD_VALUES.get(card)
+            if card_value is None:
+                return None
+            if card_value == 1:
                 found_ace = True
-            else:
-                total_value += int(card)
+            total_value += card_value
 
-        if found_ace:
-            if 11 + total_value <= 21:
-                total_value += 11
-                return self.soft_chart, total_value
-            total_value += 1
+        if len(player_cards) == 2 and player_cards[0] == player_cards[1]:
+            return PAIR_HAND, total_value // 2
 
-        return self.normal_chart, total_value
+        if found_ace and total_value + 10 <= 21:
+            return SOFT_HAND, total_value + 10
 
-    def _get_correct_action(self, dealer_card: str, player_cards: list[str]):
-        """Get best action based on given hand and dealer card."""
-        if (
-            dealer_card not in BLACKJACK_CARDS
-            or any(card not in BLACKJACK_CARDS for card in player_cards)
-        ):
-            return None
+        return HARD_HAND, total_value
 
-        if len(player_cards) < 2:
-            return BlackjackActions.HIT
+    @staticmethod
+    def _chart_cell(rules, hand_class: int, total_value: int):
+        """Return the chart hand class and total a hand is looked up with under rules.
+
+        Pairs are looked up as hard totals, or soft 12 for aces, when
+        splitting is not allowed.
+        """
+        if hand_class == PAIR_HAND and not rules[BlackjackRules.SPLIT_ALLOWED]:
+            return (SOFT_HAND, 12) if total_value == 1 else (HARD_HAND, total_value * 2)
+        return hand_class, total_value
+
+    def _get_deviation_action(self, chart_set: ChartSet, dealer_value: int,
+                              hand: tuple[int, int], true_count: float):
+        """Return the deviation of chart_set for a hand class and total at
+        true_count adjusted to the rules of its tables, or None."""
+        hand_class, total_value = self._chart_cell(chart_set.rules, *hand)
+        action = chart_set.deviations.action(dealer_value, hand_class, total_value, true_count)
+        return None if action is None else self._resolve_action(action, chart_set.rules)
+
+    def _get_correct_action_code(self, dealer_card: str, player_cards: list[str] | HandState,
+                                 true_count: float | None = None,
+                                 chart_set: ChartSet | None = None) -> int:
+        """Get the palette code of the best action for a hand and dealer card.
+
+        Looks the hand up in chart_set, or in the current chart set when None,
+        and records the lookup when metrics are enabled.
+        """
+        if self.metrics is not None:
+            return self._get_correct_action_code_instrumented(
+                dealer_card, player_cards, true_count, chart_set)
+        return self._lookup_action_code(dealer_card, player_cards, true_count, chart_set)
+
+    def _lookup_action_code(self, dealer_card: str, player_cards: list[str] | HandState,
+                            true_count: float | None = None,
+                            chart_set: ChartSet | None = None) -> int:
+        """Look up the action code of a hand without recording metrics."""
+        chart_set = chart_set or self.chart_set
+        dealer_value = CARD_VALUES.get(dealer_card)
+        if isinstance(player_cards, HandState):
+            hand = player_cards.classify()
+        else:
+            hand = self._classify_hand(player_cards)
+        if dealer_value is None or hand is None:
+            return INVALID_ACTION_CODE
 
-        correct_chart, search_from_chart = self._determine_chart_and_value_to_search(
-            player_cards)
+        if len(player_cards) < 2:
+            return HIT_ACTION_CODE
+
+        if true_count is not None and chart_set.deviations:
+            action = self._get_deviation_action(chart_set, dealer_value, hand, true_count)
+            if action is not None:
+                return chart_set.decision_table.code_of(action)
+        return chart_set.decision_table.lookup_code(dealer_value, *hand)
+
+    def _get_correct_action(self, dealer_card: str, player_cards: list[str] | HandState,
+                            true_count: float | None = None):
+        """Get best action based on given hand, dealer card and optional true count."""
+        chart_set = self.chart_set
+        return chart_set.decision_table.palette[
+            self._get_correct_action_code(dealer_card, player_cards, true_count, chart_set)]
+
+    def ask_help(self, dealer_card: str, player_cards: list[str] | HandState,
+                 true_count: float | None = None):
+        """Return readable advice based on current hand and rules.
+
+        player_cards is a list of card strings or a HandState, which skips
+        rescanning the cards. Count-based deviations are applied when
+        true_count is given.
+        """
+        return self._ask_help(dealer_card, player_cards, true_count, self.chart_set)
+
+    def _ask_help(self, dealer_card: str, player_cards: list[str] | HandState,
+                  true_count: float | None, chart_set: ChartSet):
+        """Return readable advice looked up in chart_set, recording the decision when
+        metrics or a decision log are enabled."""
+        code = self._get_correct_action_code(dealer_card, player_cards, true_count, chart_set)
+        if self.decision_log is not None:
+            table, profile = self._decision_log_source
+            self.decision_log.record(table, dealer_card, player_cards, code, profile=profile,
+                                     chart_set=chart_set.decision_table.fingerprint)
+        return chart_set.action_names[code]
+
+    def ask_help_split(self, dealer_card: str, split_hands: SplitHands,
+                       true_count: float | None = None) -> list[str | None]:
+        """Return readable advice for every hand of a round, None for finished hands.
+
+        Before a split this is ask_help for the only hand. Hands made by
+        splitting are looked up in split_decision_table, so doubling follows
+        DOUBLE_AFTER_SPLIT_ALLOWED and resplitting is only advised while the
+        round has room for another hand. Every hand is recorded and gets
+        count-based deviations like ask_help.
+        """
+        chart_set = self.chart_set
+        if split_hands.is_split:
+            chart_set = self._split_chart_set(chart_set, split_hands.can_resplit)
+        return [None if finished else self._ask_help(dealer_card, hand, true_count, chart_set)
+                for hand, finished in zip(split_hands.hands, split_hands.finished)]
+
+    def _get_correct_action_codes(self, dealer_cards, hands) -> np.ndarray:
+        """Look up action codes for classified hands, recording them when metrics are enabled."""
+        if self.metrics is not None:
+            return self._get_correct_action_codes_instrumented(dealer_cards, hands)
+        return self._lookup_action_codes(dealer_cards, hands)
+
+    def _lookup_action_codes(self, dealer_cards, hands) -> np.ndarray:
+        """Look up action codes for classified hands without recording metrics."""
+        dealer_cards = np.asarray(dealer_cards)
+        hand_classes, totals, hand_sizes, valid = hands
+        valid = valid & (dealer_cards >= 1) & (dealer_cards <= 10)
+
+        codes = self.decision_table.lookup_batch(dealer_cards, hand_classes, totals)
+        codes[hand_sizes < 2] = HIT_ACTION_CODE
+        codes[~valid] = INVALID_ACTION_CODE
+        return codes
+
+    def ask_help_batch(self, dealer_cards: np.ndarray, player_cards: np.ndarray) -> np.ndarray:
+        """Return action codes for many hands at once.
+
+        dealer_cards holds one dealer card rank per hand and player_cards one
+        row of card ranks per hand, padded with zeros. The returned codes index
+        decision_table.palette, where code 0 marks a hand with invalid cards.
+        """
+        return self._get_correct_action_codes(dealer_cards, classify_card_ranks(player_cards))
+
+    def ask_help_batch_counts(self, dealer_cards: np.ndarray,
+                              card_counts: np.ndarray) -> np.ndarray:
+        """Return action codes for many hands given as per-rank card counts.
+
+        card_counts holds one row of ten counts per hand, aces first.
+        """
+        return self._get_correct_action_codes(dealer_cards, classify_card_counts(card_counts))
+
+    def ask_help_classified(self, dealer_cards: np.ndarray, hands) -> np.ndarray:
+        """Return action codes for hands already classified, for example by classify_hand_totals."""
+        return self._get_correct_action_codes(dealer_cards, hands)
+
+    def ask_help_hands(self, dealer_cards: list[str], player_hands: list[list[str]]) -> list[str]:
+        """Return readable advice for many hands given as card strings in one batched lookup."""
+        width = max((len(player_cards) for player_cards in player_hands), default=0)
+        player_ranks = np.zeros((len(player_hands), width), dtype=np.int32)
+        for row, player_cards in enumerate(player_hands):
+            player_ranks[row, :len(player_cards)] = [
+                CARD_VALUES.get(card, -1) for card in player_cards]
+        dealer_ranks = np.array([CARD_VALUES.get(card, -1) for card in dealer_cards],
+                                dtype=np.int32)
+
+        codes = self.ask_help_batch(dealer_ranks, player_ranks)
+        return [self.action_names[code] for code in codes.tolist()]
+
+    def enable_metrics(self, metrics: AdviceMetrics | None = None) -> AdviceMetrics:
+        """Start recording lookups into metrics and return them.
+
+        Lookups only check whether metrics is set, so a helper without
+        metrics pays for one attribute test per lookup.
+        """
+        self.metrics = AdviceMetrics() if metrics is None else metrics
+        return self.metrics
+
+    def disable_metrics(self):
+        """Stop recording lookups."""
+        self.metrics = None
+
+    def enable_decision_log(self, decision_log, table: int = 0, profile: int = 0):
+        """Start recording every ask_help and ask_help_split decision into a
+        DecisionLog under a table and profile."""
+        self._decision_log_source = (table, profile)
+        self.decision_log = decision_log
+
+    def disable_decision_log(self):
+        """Stop recording decisions."""
+        self.decision_log = None
+
+    def _get_correct_action_code_instrumented(self, dealer_card: str,
+                                              player_cards: list[str] | HandState,
+                                              true_count: float | None = None,
+                                              chart_set: ChartSet | None = None) -> int:
+        """Get an action code like _get_correct_action_code and record it in metrics."""
+        chart_set = chart_set or self.chart_set
+        started = time.perf_counter()
+        action = self._lookup_action_code(dealer_card, player_cards, true_count, chart_set)
+        self.metrics.record_latency(time.perf_counter() - started)
+
+        dealer_value = CARD_VALUES.get(dealer_card)
+        if isinstance(player_cards, HandState):
+            hand = player_cards.classify()
+        else:
+            hand = self._classify_hand(player_cards)
+        if dealer_value is None or hand is None:
+            self.metrics.invalid_hands += 1
+            return action
+        if len(player_cards) < 2:
+            return action
+
+        if true_count is not None and chart_set.deviations and self._get_deviation_action(
+                chart_set, dealer_value, hand, true_count) is not None:
+            self.metrics.deviations += 1
+            return action
+
+        decision_table = chart_set.decision_table
+        index = decision_table.index(dealer_value, *hand)
+        chart_class, chart_total = self._chart_cell(chart_set.rules, *hand)
+        self.metrics.record_lookup(
+            CHART_NAMES[chart_class], dealer_value, chart_total,
+            fallback=bool(decision_table.fallback_cells[index]),
+            rewritten=bool(decision_table.rewritten_cells[index]))
+        return action
 
-        action = correct_chart(dealer_card, str(search_from_chart))
-        return self._get_correct_action_from_rules(action)
+    def _get_correct_action_codes_instrumented(self, dealer_cards, hands) -> np.ndarray:
+        """Look up action codes like _get_correct_action_codes and record them in metrics."""
+        started = time.perf_counter()
+        codes = self._lookup_action_codes(dealer_cards, hands)
+        if len(codes):
+            self.metrics.record_latency((time.perf_counter() - started) / len(codes), len(codes))
+
+        hand_classes, totals, hand_sizes, _ = hands
+        valid = codes != INVALID_ACTION_CODE
+        self.metrics.invalid_hands += int(np.count_nonzero(~valid))
+        looked_up = valid & (hand_sizes >= 2)
+        dealer_values = np.asarray(dealer_cards)[looked_up]
+        hand_classes, totals = hand_classes[looked_up], totals[looked_up]
+
+        indices = self.decision_table.index_batch(dealer_values, hand_classes, totals)
+        self.metrics.rule_rewrites += int(np.count_nonzero(
+            self.decision_table.rewritten_cells[indices]))
+
+        unsplit = (hand_classes == PAIR_HAND) & (not self.rules[BlackjackRules.SPLIT_ALLOWED])
+        self.metrics.record_lookups(
+            np.where(unsplit, np.where(totals == 1, SOFT_HAND, HARD_HAND), hand_classes),
+            dealer_values, np.where(unsplit, np.where(totals == 1, 12, totals * 2), totals),
+            self.decision_table.fallback_cells[indices])
+        return codes
+
+
+class HelperSnapshot(BlackjackHelper):
+    """Frozen helper that is safe to share between threads.
+
+    Neither the charts nor the rules of a snapshot ever change, so any
+    number of threads can ask it for advice without locks. with_rule and
+    with_rules return a new snapshot that shares the charts and the
+    compiled tables of every rule combination, which makes a snapshot a
+    small object instead of a copy of the helper. Changing attributes,
+    rules or charts of a snapshot raises AttributeError.
+    """
+
+    _frozen = False
+
+    def __init__(self, chart_set: ChartSet, rules):
+        """Initialize snapshot from a published chart set and rule values."""
+        super().__init__(chart_set.normal_chart, chart_set.soft_chart, chart_set.split_chart,
+                         MappingProxyType(dict(rules)), deviations=chart_set.deviations,
+                         chart_set=chart_set)
+        self._frozen = True
+
+    def __setattr__(self, name, value):
+        if self._frozen:
+            raise AttributeError(f"Helper snapshots are frozen, cannot set {name}")
+        super().__setattr__(name, value)
+
+    def __delattr__(self, name):
+        raise AttributeError(f"Helper snapshots are frozen, cannot delete {name}")
+
+    def snapshot(self):
+        """Return the snapshot itself."""
+        return self
 
-    def ask_help(self, dealer_card: str, player_cards: list[str]):
-        """Return readable advice based on current hand and rules."""
-        return get_blackjack_action_name(self._get_correct_action(dealer_card, player_cards))
+    def set_rule(self, rule_name: BlackjackRules, value: bool):
+        """Refuse to change a rule in place, see with_rule."""
+        raise AttributeError("Helper snapshots are frozen, use with_rule")
+
+    def set_rules(self, rules):
+        """Refuse to change rules in place, see with_rules."""
+        raise AttributeError("Helper snapshots are frozen, use with_rules")
+
+    def with_rule(self, rule_name: BlackjackRules, value: bool):
+        """Return a snapshot with one rule changed."""
+        return self.with_rules({rule_name: value})
+
+    def with_rules(self, rules):
+        """Return a snapshot with several rules changed."""
+        for rule_name in rules:
+            if rule_name not in BlackjackRules:
+                raise ValueError(f"Unknown rule: {rule_name}")
+        return HelperSnapshot(self.chart_set, {**self.rules, **rules})
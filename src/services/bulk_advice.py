@@ -0,0 +1,190 @@
+import contextlib
+import csv
+import gzip
+import io
+import json
+import multiprocessing
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import numpy as np
+from services.blackjack_helper import BlackjackHelper, HelperSnapshot
+
+CSV_FORMAT = "csv"
+JSONL_FORMAT = "jsonl"
+FORMATS = (CSV_FORMAT, JSONL_FORMAT)
+
+GZIP_MAGIC = b"\x1f\x8b"
+CSV_HEADER_FIELD = "dealer"
+
+_worker_state = {}
+
+
+def detect_format(path: str) -> str:
+    """Return the hand format of a file path from its suffix, defaulting to CSV."""
+    path = path.removesuffix(".gz")
+    return JSONL_FORMAT if path.endswith((".jsonl", ".json")) else CSV_FORMAT
+
+
+@contextlib.contextmanager
+def open_input(path: str):
+    """Open a text stream for path, or stdin for "-", decompressing gzip input."""
+    with contextlib.ExitStack() as stack:
+        binary = sys.stdin.buffer if path == "-" else stack.enter_context(open(path, "rb"))
+        if binary.peek(2)[:2] == GZIP_MAGIC:
+            binary = stack.enter_context(gzip.GzipFile(fileobj=binary))
+        text = io.TextIOWrapper(binary, encoding="utf-8", newline="")
+        try:
+            yield text
+        finally:
+            text.detach()
+
+
+@contextlib.contextmanager
+def open_output(path: str):
+    """Open a text stream for path, or stdout for "-", compressing paths ending in .gz."""
+    if path == "-":
+        yield sys.stdout
+        sys.stdout.flush()
+    elif path.endswith(".gz"):
+        with gzip.open(path, "wt", encoding="utf-8", newline="") as output_stream:
+            yield output_stream
+    else:
+        with open(path, "w", encoding="utf-8", newline="") as output_stream:
+            yield output_stream
+
+
+def read_chunks(stream, chunk_size: int):
+    """Yield lists of at most chunk_size lines from stream."""
+    chunk = []
+    for line in stream:
+        chunk.append(line)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _parse_jsonl(lines):
+    """Return (record, dealer card, player cards) for every non-empty JSON line."""
+    hands = []
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            hands.append(({"error": f"Invalid hand: {e}"}, None, None))
+            continue
+        if not isinstance(record, dict) or "dealer" not in record \
+                or not isinstance(record.get("cards"), list):
+            error_record = record if isinstance(record, dict) else {"hand": record}
+            hands.append(({**error_record, "error": "Hand needs a dealer card and a list of cards"},
+                          None, None))
+            continue
+        hands.append((record, str(record["dealer"]), [str(card) for card in record["cards"]]))
+    return hands
+
+
+def advise_lines(blackjack_helper: BlackjackHelper, lines, input_format: str) -> str:
+    """Return the output text for a chunk of input lines.
+
+    CSV rows hold the dealer card followed by the player cards and get the
+    advice appended as a last column. A row starting with "dealer" is taken
+    as a header. JSON lines hold "dealer" and "cards" and get an "action"
+    field, or an "error" field if they cannot be read.
+    """
+    if input_format == JSONL_FORMAT:
+        hands = _parse_jsonl(lines)
+        playable = [hand for hand in hands if hand[1] is not None]
+        advice = blackjack_helper.ask_help_hands(
+            [dealer_card for _, dealer_card, _ in playable],
+            [player_cards for _, _, player_cards in playable])
+        for (record, _, _), action_name in zip(playable, advice):
+            record["action"] = action_name
+        return "".join(json.dumps(record) + "\n" for record, _, _ in hands)
+
+    rows = [row for row in csv.reader(lines) if row]
+    hand_rows = [row for row in rows if row[0].strip() != CSV_HEADER_FIELD]
+    advice = iter(blackjack_helper.ask_help_hands(
+        [row[0].strip() for row in hand_rows],
+        [[card.strip() for card in row[1:]] for row in hand_rows]))
+
+    output = io.StringIO()
+    writer = csv.writer(output, lineterminator="\n")
+    for row in rows:
+        writer.writerow(row + ["action" if row[0].strip() == CSV_HEADER_FIELD else next(advice)])
+    return output.getvalue()
+
+
+def advise_stream(blackjack_helper: BlackjackHelper, input_stream, output_stream,
+                  input_format: str, chunk_size: int = 10_000):
+    """Write advice for every hand of input_stream, holding one chunk in memory."""
+    for chunk in read_chunks(input_stream, chunk_size):
+        output_stream.write(advise_lines(blackjack_helper, chunk, input_format))
+
+
+def _init_worker(charts_directory: str, rules):
+    """Worker initializer that loads the charts once per process."""
+    blackjack_helper = BlackjackHelper.from_charts_directory(charts_directory)
+    for rule_name, value in rules.items():
+        blackjack_helper.set_rule(rule_name, value)
+    _worker_state["blackjack_helper"] = blackjack_helper
+
+
+def _advise_chunk(lines, input_format: str) -> str:
+    """Advise one chunk with the worker's helper."""
+    return advise_lines(_worker_state["blackjack_helper"], lines, input_format)
+
+
+def advise_stream_parallel(charts_directory: str, rules, input_stream, output_stream,
+                           input_format: str, *, chunk_size: int = 10_000, workers: int = 2):
+    """Write advice for every hand of input_stream using worker processes.
+
+    Output keeps the input order. At most two chunks per worker are read
+    ahead, so memory use does not grow with the input.
+    """
+    if workers < 1:
+        raise ValueError(f"Invalid worker count: {workers}")
+
+    with ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker, initargs=(charts_directory, rules)) as executor:
+        pending = deque()
+        for chunk in read_chunks(input_stream, chunk_size):
+            pending.append(executor.submit(_advise_chunk, chunk, input_format))
+            if len(pending) >= 2 * workers:
+                output_stream.write(pending.popleft().result())
+        while pending:
+            output_stream.write(pending.popleft().result())
+
+
+def advise_batch_threaded(snapshot: HelperSnapshot, dealer_cards: np.ndarray,
+                          player_cards: np.ndarray, workers: int | None = None,
+                          executor: ThreadPoolExecutor | None = None) -> np.ndarray:
+    """Return ask_help_batch codes for many hands, looking up shards of them on threads.
+
+    Every thread reads the same frozen snapshot, so no helper is copied per
+    thread. The shards run in parallel on free-threaded CPython; with the
+    GIL only the NumPy work inside the lookups overlaps. executor is reused
+    when given, otherwise a pool of workers threads is made for the call.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError(f"Invalid worker count: {workers}")
+
+    bounds = np.linspace(0, len(dealer_cards), workers + 1).astype(np.intp).tolist()
+    shards = [(start, end) for start, end in zip(bounds, bounds[1:]) if end > start]
+    if len(shards) <= 1:
+        return snapshot.ask_help_batch(dealer_cards, player_cards)
+
+    def advise_shard(shard):
+        start, end = shard
+        return snapshot.ask_help_batch(dealer_cards[start:end], player_cards[start:end])
+
+    if executor is None:
+        with ThreadPoolExecutor(max_workers=workers) as own_executor:
+            return np.concatenate(list(own_executor.map(advise_shard, shards)))
+    return np.concatenate(list(executor.map(advise_shard, shards)))
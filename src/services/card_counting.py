@@ -0,0 +1,83 @@
+from services.decision_table import CARD_VALUES
+
+CARDS_PER_DECK = 52
+
+
+class CountingSystem:
+    """Card counting system given as one tag per rank, aces first and tens last.
+
+    Unbalanced systems start the running count at initial_count_per_deck
+    times the number of decks plus initial_count_offset.
+    """
+
+    def __init__(self, name: str, tags, *, balanced: bool = True,
+                 initial_count_per_deck: int = 0, initial_count_offset: int = 0):
+        """Initialize system with ten rank tags."""
+        if len(tags) != 10:
+            raise ValueError(f"Counting system needs ten tags: {name}")
+
+        self.name = name
+        self.tags = tuple(tags)
+        self.balanced = balanced
+        self.initial_count_per_deck = initial_count_per_deck
+        self.initial_count_offset = initial_count_offset
+        self.card_tags = {card: self.tags[rank - 1] for card, rank in CARD_VALUES.items()}
+
+    def initial_count(self, decks: int) -> int:
+        """Return the running count of a fresh shoe."""
+        return self.initial_count_per_deck * decks + self.initial_count_offset
+
+
+HI_LO = CountingSystem("Hi-Lo", (-1, 1, 1, 1, 1, 1, 0, 0, 0, -1))
+KO = CountingSystem("KO", (-1, 1, 1, 1, 1, 1, 1, 0, 0, -1), balanced=False,
+                    initial_count_per_deck=-4, initial_count_offset=4)
+OMEGA_II = CountingSystem("Omega II", (0, 1, 1, 2, 2, 2, 1, 0, -1, -2))
+
+COUNTING_SYSTEMS = {system.name: system for system in (HI_LO, KO, OMEGA_II)}
+
+
+class CardCounter:
+    """Running and true count of a shoe, updated one seen card at a time."""
+
+    def __init__(self, system: CountingSystem = HI_LO, decks: int = 1):
+        """Initialize counter for a fresh shoe of decks."""
+        if decks < 1:
+            raise ValueError(f"Invalid deck count: {decks}")
+
+        self.system = system
+        self.decks = decks
+        self.reset()
+
+    def reset(self):
+        """Start counting a fresh shoe."""
+        self.running_count = self.system.initial_count(self.decks)
+        self.cards_seen = 0
+
+    def see(self, card: str):
+        """Count one seen card."""
+        tag = self.system.card_tags.get(card)
+        if tag is None:
+            raise ValueError(f"Invalid card: {card}")
+        self.running_count += tag
+        self.cards_seen += 1
+
+    def see_cards(self, cards):
+        """Count several seen cards."""
+        for card in cards:
+            self.see(card)
+
+    @property
+    def decks_remaining(self) -> float:
+        """Return the number of unseen decks, never less than one card."""
+        return max(self.decks * CARDS_PER_DECK - self.cards_seen, 1) / CARDS_PER_DECK
+
+    @property
+    def true_count(self) -> float:
+        """Return the running count per remaining deck.
+
+        Unbalanced systems are played by their running count, so it is
+        returned as is.
+        """
+        if not self.system.balanced:
+            return self.running_count
+        return self.running_count / self.decks_remaining
@@ -1,6 +1,8 @@
 class Chart:
     """Chart wrapper for lookup with fallback."""
 
+    prevalidated = False
+
     def __init__(self, chart_data, on_not_found=""):
         """Initialize chart with data and fallback value."""
         self.chart_data = chart_data
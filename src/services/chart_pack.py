@@ -0,0 +1,167 @@
+import mmap
+import os
+import struct
+import zlib
+from services.chart import Chart
+
+PACK_FILE_NAME = "charts.pack"
+PACK_MAGIC = b"BJCP"
+PACK_VERSION = 1
+
+HEADER = struct.Struct("<4sHHHII")
+ENTRY = struct.Struct("<8sBHI")
+MISSING_CELL = 0
+
+
+class PackedChart(Chart):
+    """Chart backed by a grid of action codes in a memory-mapped chart pack.
+
+    Cell codes index the pack's action table and code 0 marks a missing cell.
+    The chart data dictionary is only built when get_chart_data is called.
+    """
+
+    prevalidated = True
+
+    def __init__(self, cells: memoryview, rows: int, width: int, actions, *, on_not_found=""):
+        """Initialize chart from a (rows x width) cell grid and its action table."""
+        super().__init__(None, on_not_found)
+        self.cells = cells
+        self.rows = rows
+        self.width = width
+        self.actions = actions
+
+    def get_chart_data(self):
+        """Return chart data as nested dictionaries, building them on first use."""
+        if self.chart_data is None:
+            chart_data = {}
+            for row in range(self.rows):
+                row_cells = self.cells[row * self.width:(row + 1) * self.width]
+                row_data = {str(col): self.actions[code] for col, code in enumerate(row_cells)
+                            if code != MISSING_CELL}
+                if row_data:
+                    chart_data[str(row + 1)] = row_data
+            self.chart_data = chart_data
+        return self.chart_data
+
+    def __call__(self, row, col):
+        """Lookup value in chart with fallback."""
+        if not (row.isdigit() and col.isdigit()):
+            return self.on_not_found
+        row_index, col_index = int(row) - 1, int(col)
+        if not (0 <= row_index < self.rows and col_index < self.width):
+            return self.on_not_found
+
+        code = self.cells[row_index * self.width + col_index]
+        return self.on_not_found if code == MISSING_CELL else self.actions[code]
+
+
+def _chart_grid(chart: Chart):
+    """Return the grid size of a chart, rejecting keys a pack cannot store."""
+    rows = width = 0
+    for outer_key, inner_dict in chart.get_chart_data().items():
+        if not outer_key.isdigit() or str(int(outer_key)) != outer_key or outer_key == "0":
+            raise ValueError(f"Cannot pack outer key: {outer_key}")
+        rows = max(rows, int(outer_key))
+        for inner_key in inner_dict:
+            if not inner_key.isdigit() or str(int(inner_key)) != inner_key:
+                raise ValueError(f"Cannot pack inner key: {inner_key} in {outer_key}")
+            width = max(width, int(inner_key) + 1)
+    return rows, width
+
+
+def _chart_cells(chart: Chart, rows: int, width: int, action_codes: dict) -> bytes:
+    """Return the cell codes of a chart grid, adding new actions to action_codes."""
+    cells = bytearray(rows * width)
+    for outer_key, inner_dict in chart.get_chart_data().items():
+        for inner_key, value in inner_dict.items():
+            code = action_codes.setdefault(value, len(action_codes) + 1)
+            cells[(int(outer_key) - 1) * width + int(inner_key)] = code
+    return bytes(cells)
+
+
+def _build_payload(actions: list[str], grids) -> bytes:
+    """Return the chart entries, the action table and the cell grids of a pack."""
+    entries_size = ENTRY.size * len(grids)
+    payload = bytearray(b"".join(
+        struct.pack("<B", len(action.encode("utf-8"))) + action.encode("utf-8")
+        for action in actions))
+    entries = b""
+    for chart_name, rows, width, cells in grids:
+        entries += ENTRY.pack(chart_name.encode("ascii"), rows, width,
+                              entries_size + len(payload))
+        payload += cells
+    return entries + payload
+
+
+def write_chart_pack(path: str, charts):
+    """Write validated charts, given as a name to Chart dictionary, into a chart pack."""
+    action_codes = {}
+    grids = []
+    for chart_name, chart in charts.items():
+        rows, width = _chart_grid(chart)
+        grids.append((chart_name, rows, width, _chart_cells(chart, rows, width, action_codes)))
+
+    if len(action_codes) > 255:
+        raise ValueError("Too many distinct actions to pack")
+
+    payload = _build_payload(list(action_codes), grids)
+    header = HEADER.pack(PACK_MAGIC, PACK_VERSION, len(grids), len(action_codes),
+                         zlib.crc32(payload), len(payload))
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "wb") as f:
+        f.write(header)
+        f.write(payload)
+    os.replace(temporary_path, path)
+
+
+def _read_payload(mapped: mmap.mmap, path: str):
+    """Check the header of a mapped chart pack and return its counts and payload."""
+    if len(mapped) < HEADER.size:
+        raise ValueError(f"Invalid chart pack: {path}")
+    magic, version, chart_count, action_count, checksum, payload_size = \
+        HEADER.unpack_from(mapped)
+    if magic != PACK_MAGIC:
+        raise ValueError(f"Invalid chart pack: {path}")
+    if version != PACK_VERSION:
+        raise ValueError(f"Unsupported chart pack version {version}: {path}")
+
+    payload = memoryview(mapped)[HEADER.size:]
+    if len(payload) != payload_size or zlib.crc32(payload) != checksum:
+        raise ValueError(f"Chart pack checksum mismatch: {path}")
+    return chart_count, action_count, payload
+
+
+def _read_actions(payload: memoryview, offset: int, count: int) -> list:
+    """Return the action table of a pack payload, with None for the missing cell code."""
+    actions = [None]
+    for _ in range(count):
+        length = payload[offset]
+        actions.append(bytes(payload[offset + 1:offset + 1 + length]).decode("utf-8"))
+        offset += 1 + length
+    return actions
+
+
+def load_chart_pack(path: str):
+    """Memory-map a chart pack and return its charts as a name to PackedChart dictionary."""
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    chart_count, action_count, payload = _read_payload(mapped, path)
+    actions = _read_actions(payload, ENTRY.size * chart_count, action_count)
+
+    charts = {}
+    for index in range(chart_count):
+        name, rows, width, cells_offset = ENTRY.unpack_from(payload, index * ENTRY.size)
+        cells = payload[cells_offset:cells_offset + rows * width]
+        charts[name.rstrip(b"\0").decode("ascii")] = PackedChart(cells, rows, width, actions)
+    return charts
+
+
+def chart_pack_is_current(directory: str) -> bool:
+    """Check if a directory's chart pack exists and is newer than its JSON charts."""
+    pack_path = os.path.join(directory, PACK_FILE_NAME)
+    if not os.path.exists(pack_path):
+        return False
+
+    pack_time = os.path.getmtime(pack_path)
+    return all(os.path.getmtime(os.path.join(directory, file)) <= pack_time
+               for file in os.listdir(directory) if file.endswith(".json"))
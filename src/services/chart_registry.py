@@ -0,0 +1,171 @@
+import os
+import re
+import sys
+from collections import OrderedDict
+from typing import NamedTuple
+from services.blackjack_helper import REQUIRED_CHARTS, BlackjackHelper
+from services.chart import Chart
+from services.chart_pack import PACK_FILE_NAME, PackedChart
+from services.deviations import DEVIATIONS_NAME
+
+DECK_NAMES = {"single_deck": 1, "double_deck": 2}
+DECKS_PATTERN = re.compile(r"(\d+)_decks?")
+SOFT_17_NAMES = {"hit_on_soft_17": True, "stand_on_soft_17": False}
+
+
+class ChartVariant(NamedTuple):
+    """Rule variant a chart directory was made for.
+
+    tag holds any directory names below the root that are not deck counts or
+    soft 17 rules, joined with "/".
+    """
+    decks: int
+    dealer_hits_soft_17: bool
+    tag: str = ""
+
+
+def parse_chart_variant(relative_path: str) -> ChartVariant | None:
+    """Return the rule variant of a chart directory path relative to the registry root.
+
+    Returns None for paths without both a deck count and a soft 17 rule.
+    """
+    decks = dealer_hits_soft_17 = None
+    tags = []
+    for name in relative_path.replace(os.sep, "/").split("/"):
+        match = DECKS_PATTERN.fullmatch(name)
+        if name in DECK_NAMES:
+            decks = DECK_NAMES[name]
+        elif match:
+            decks = int(match.group(1))
+        elif name in SOFT_17_NAMES:
+            dealer_hits_soft_17 = SOFT_17_NAMES[name]
+        elif name:
+            tags.append(name)
+
+    if decks is None or dealer_hits_soft_17 is None:
+        return None
+    return ChartVariant(decks, dealer_hits_soft_17, "/".join(tags))
+
+
+def chart_set_size(charts) -> int:
+    """Estimate the memory used by a chart set in bytes.
+
+    Packed charts only count their cell grids, which live in the mapped file.
+    """
+    size = sys.getsizeof(charts)
+    for chart in charts.values():
+        if not isinstance(chart, Chart):
+            size += sys.getsizeof(chart)
+            continue
+        if isinstance(chart, PackedChart) and chart.chart_data is None:
+            size += len(chart.cells)
+            continue
+        chart_data = chart.get_chart_data()
+        size += sys.getsizeof(chart_data)
+        for outer_key, inner_dict in chart_data.items():
+            size += sys.getsizeof(outer_key) + sys.getsizeof(inner_dict)
+            size += sum(sys.getsizeof(key) for key in inner_dict)
+    return size
+
+
+class ChartRegistry:
+    """Index of chart directories by rule variant with an LRU cache of loaded chart sets.
+
+    Chart sets are evicted least recently used first once their estimated
+    total size exceeds max_bytes. The most recently used chart set is always
+    kept, even if it alone is larger than the cap.
+    """
+
+    def __init__(self, root: str = "data/charts", max_bytes: int = 16 * 1024 * 1024):
+        """Initialize registry and index the chart directories under root."""
+        if max_bytes < 0:
+            raise ValueError(f"Invalid memory cap: {max_bytes}")
+
+        self.root = root
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._chart_sets = OrderedDict()
+        self.scan()
+
+    def scan(self):
+        """Rebuild the variant index from the chart directories under root."""
+        directories = {}
+        for directory, _, files in sorted(os.walk(self.root)):
+            chart_names = {file.split(".")[0] for file in files if file.endswith(".json")}
+            if PACK_FILE_NAME not in files and not set(REQUIRED_CHARTS) <= chart_names:
+                continue
+
+            variant = parse_chart_variant(os.path.relpath(directory, self.root))
+            if variant is None:
+                continue
+            if variant in directories:
+                raise ValueError(
+                    f"Duplicate chart variant {variant}: {directories[variant]} and {directory}")
+            directories[variant] = directory
+        self._directories = directories
+
+    def variants(self) -> list[ChartVariant]:
+        """Return the indexed rule variants."""
+        return sorted(self._directories)
+
+    def directory(self, variant: ChartVariant) -> str:
+        """Return the chart directory of a rule variant."""
+        if variant not in self._directories:
+            raise ValueError(f"Unknown chart variant: {variant}")
+        return self._directories[variant]
+
+    def __len__(self):
+        """Return the number of chart sets held in memory."""
+        return len(self._chart_sets)
+
+    def charts(self, variant: ChartVariant):
+        """Return the chart set of a rule variant."""
+        return self.charts_directory(self.directory(variant))
+
+    def charts_directory(self, directory: str):
+        """Return the chart set of a directory, loading it on a cache miss."""
+        key = os.path.realpath(directory)
+        entry = self._chart_sets.get(key)
+        if entry is not None:
+            self._chart_sets.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+        self.misses += 1
+        charts = BlackjackHelper.load_charts_directory(directory)
+        size = chart_set_size(charts)
+        self._chart_sets[key] = (charts, size)
+        self.size += size
+        while self.size > self.max_bytes and len(self._chart_sets) > 1:
+            _, (_, evicted_size) = self._chart_sets.popitem(last=False)
+            self.size -= evicted_size
+            self.evictions += 1
+        return charts
+
+    def invalidate(self, directory: str):
+        """Drop the cached chart set of a directory so it is reloaded on next use."""
+        entry = self._chart_sets.pop(os.path.realpath(directory), None)
+        if entry is not None:
+            self.size -= entry[1]
+
+    def helper(self, variant: ChartVariant, rules=None) -> BlackjackHelper:
+        """Create a BlackjackHelper for a rule variant."""
+        charts = self.charts(variant)
+        return BlackjackHelper(charts["normal"], charts["soft"], charts["split"], rules,
+                               deviations=charts.get(DEVIATIONS_NAME))
+
+    def stats(self):
+        """Return hit, miss, eviction and size counters."""
+        lookups = self.hits + self.misses
+        return {
+            "chart_sets": len(self._chart_sets),
+            "bytes": self.size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,268 @@
+import hashlib
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from services.blackjack_helper import (
+    ACTION_CODES, BLACKJACK_CARDS, REQUIRED_CHARTS, BlackjackActions)
+from services.chart_registry import parse_chart_variant
+from services.strategy_solver import StrategySolver
+
+CACHE_FILE_NAME = ".chart_validation_cache.json"
+
+CHART_TOTALS = {
+    "normal": range(4, 22),
+    "soft": range(12, 22),
+    "split": range(1, 11),
+}
+
+MISSING_CHART = "missing_chart"
+UNREADABLE_CHART = "unreadable_chart"
+INVALID_DEALER = "invalid_dealer"
+IMPOSSIBLE_TOTAL = "impossible_total"
+NON_PAIR_SPLIT_ROW = "non_pair_split_row"
+INVALID_ACTION = "invalid_action"
+MISSING_CELL = "missing_cell"
+REFERENCE_DISAGREEMENT = "reference_disagreement"
+
+_reference_charts = {}
+
+
+def _issue(kind: str, chart_name: str, dealer=None, total=None, **details):
+    """Return an issue entry."""
+    return {"kind": kind, "chart": chart_name, "dealer": dealer, "total": total, **details}
+
+
+def chart_directories(root: str, complete: bool = False) -> list[str]:
+    """Return every directory under root holding at least one chart file, sorted.
+
+    With complete, only directories holding every required chart file are returned.
+    """
+    chart_files = {f"{chart_name}.json" for chart_name in REQUIRED_CHARTS}
+    return sorted(directory for directory, _, files in os.walk(root)
+                  if (chart_files.issubset(files) if complete
+                      else chart_files.intersection(files)))
+
+
+def chart_set_hash(directory: str, settings) -> str:
+    """Return a hash of a directory's chart files and the validation settings."""
+    digest = hashlib.sha256(json.dumps(settings, sort_keys=True).encode("utf-8"))
+    for chart_name in REQUIRED_CHARTS:
+        path = os.path.join(directory, f"{chart_name}.json")
+        digest.update(chart_name.encode("utf-8"))
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                digest.update(hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()
+
+
+def check_chart(chart_name: str, chart_data) -> list:
+    """Return the structural issues of one chart.
+
+    Cells outside the possible totals, split rows for anything but a pair
+    rank, unknown actions and cells that fall back to STAND are reported.
+    """
+    if not isinstance(chart_data, dict) or not all(
+            isinstance(row, dict) for row in chart_data.values()):
+        return [_issue(UNREADABLE_CHART, chart_name, message="Chart is not a nested object")]
+
+    issues = []
+    totals = CHART_TOTALS[chart_name]
+    for dealer, row in chart_data.items():
+        if dealer not in BLACKJACK_CARDS:
+            issues.append(_issue(INVALID_DEALER, chart_name, dealer))
+            continue
+        for total, action in row.items():
+            if not total.isdigit() or int(total) not in totals:
+                kind = NON_PAIR_SPLIT_ROW if chart_name == "split" else IMPOSSIBLE_TOTAL
+                issues.append(_issue(kind, chart_name, dealer, total))
+            elif not isinstance(action, str) or action not in ACTION_CODES:
+                issues.append(_issue(INVALID_ACTION, chart_name, dealer, total, action=action))
+
+    for dealer in BLACKJACK_CARDS:
+        row = chart_data.get(dealer, {})
+        issues += [_issue(MISSING_CELL, chart_name, dealer, str(total),
+                          fallback=str(BlackjackActions.STAND))
+                   for total in totals if str(total) not in row]
+    return issues
+
+
+def reference_charts(decks: int, dealer_hits_soft_17: bool,
+                     double_after_split: bool, surrender: bool):
+    """Return solver charts for a rule set, solving each rule set once per process."""
+    key = (decks, dealer_hits_soft_17, double_after_split, surrender)
+    if key not in _reference_charts:
+        _reference_charts[key] = StrategySolver(
+            decks, dealer_hits_soft_17, double_after_split, surrender).solve_charts()
+    return _reference_charts[key]
+
+
+def compare_to_reference(chart_name: str, chart_data, reference_data) -> list:
+    """Return the cells whose action differs from the reference chart.
+
+    Missing cells are left out, since check_chart already reports them.
+    """
+    issues = []
+    for dealer, reference_row in reference_data.items():
+        row = chart_data.get(dealer, {})
+        for total, reference_action in reference_row.items():
+            action = row.get(total)
+            if action is not None and action != reference_action:
+                issues.append(_issue(REFERENCE_DISAGREEMENT, chart_name, dealer, total,
+                                     action=action, reference=reference_action))
+    return issues
+
+
+def _load_charts(directory: str):
+    """Return the readable charts of a directory by name and the issues found in them."""
+    issues = []
+    charts = {}
+    for chart_name in REQUIRED_CHARTS:
+        path = os.path.join(directory, f"{chart_name}.json")
+        if not os.path.exists(path):
+            issues.append(_issue(MISSING_CHART, chart_name))
+            continue
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                charts[chart_name] = json.load(f)
+        except (OSError, ValueError) as e:
+            issues.append(_issue(UNREADABLE_CHART, chart_name, message=str(e)))
+            continue
+        issues += check_chart(chart_name, charts[chart_name])
+    return charts, issues
+
+
+def validate_directory(directory: str, root: str, settings):
+    """Validate one chart directory and return its report.
+
+    The report holds the issues, the reference rules the charts were compared
+    against or None, and how long validation took in seconds. Missing cells
+    also get the reference action, so harmless STAND fallbacks can be told
+    apart from wrong ones.
+    """
+    started = time.perf_counter()
+    charts, issues = _load_charts(directory)
+
+    reference = None
+    variant = parse_chart_variant(os.path.relpath(directory, root))
+    if settings["reference"] and variant is not None:
+        reference = {
+            "decks": variant.decks,
+            "dealer_hits_soft_17": variant.dealer_hits_soft_17,
+            "double_after_split": settings["double_after_split"],
+            "surrender": settings["surrender"],
+        }
+        solved = reference_charts(**reference)
+        for issue in issues:
+            if issue["kind"] == MISSING_CELL:
+                issue["reference"] = solved[issue["chart"]].get(
+                    issue["dealer"], {}).get(issue["total"])
+        for chart_name, chart_data in charts.items():
+            if isinstance(chart_data, dict):
+                issues += compare_to_reference(chart_name, chart_data, solved[chart_name])
+
+    return {
+        "directory": directory,
+        "issues": issues,
+        "reference": reference,
+        "seconds": time.perf_counter() - started,
+    }
+
+
+def _load_cache(cache_path: str):
+    """Return cached directory reports by directory, or an empty cache."""
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _save_cache(cache_path: str, cache):
+    """Write the cache file atomically."""
+    temporary_path = f"{cache_path}.tmp"
+    with open(temporary_path, "w", encoding="utf-8") as f:
+        json.dump(cache, f)
+    os.replace(temporary_path, cache_path)
+
+
+def _use_cache(root: str, settings, cache):
+    """Split the directories under root into cached ones and ones to validate.
+
+    Returns the cache entries still valid, the reports taken from them by
+    directory and the (directory, hash) pairs to validate.
+    """
+    current_cache = {}
+    reports = {}
+    pending = []
+    for directory in chart_directories(root):
+        chart_hash = chart_set_hash(directory, settings)
+        cached = cache.get(directory)
+        if isinstance(cached, dict) and cached.get("hash") == chart_hash:
+            current_cache[directory] = cached
+            reports[directory] = {**cached["report"], "cached": True}
+        else:
+            pending.append((directory, chart_hash))
+    return current_cache, reports, pending
+
+
+def _validate_directories(pending, root: str, settings, workers: int):
+    """Validate (directory, hash) pairs in a pool of workers processes.
+
+    Returns the new cache entries by directory.
+    """
+    directories = [directory for directory, _ in pending]
+    if workers == 1 or len(directories) < 2:
+        reports = [validate_directory(directory, root, settings) for directory in directories]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(directories)),
+                                 mp_context=multiprocessing.get_context("spawn")) as executor:
+            reports = list(executor.map(validate_directory, directories,
+                                        [root] * len(directories), [settings] * len(directories)))
+    return {directory: {"hash": chart_hash, "report": report}
+            for (directory, chart_hash), report in zip(pending, reports)}
+
+
+def validate_library(root: str = "data/charts", workers: int | None = None, *,
+                     cache_path: str | None = None, reference: bool = True,
+                     double_after_split: bool = True, surrender: bool = True):
+    """Validate every chart directory under root and return a report.
+
+    Directories are validated in a process pool of workers processes, or in
+    this process when workers is 1. Reports are cached by a hash of the chart
+    files and settings in cache_path, which defaults to a file in root, so
+    unchanged directories are skipped on later runs. With reference, charts
+    of directories whose rule variant can be parsed are compared against
+    the strategy solver using the given doubling after split and surrender
+    rules.
+    """
+    started = time.perf_counter()
+    if cache_path is None:
+        cache_path = os.path.join(root, CACHE_FILE_NAME)
+    settings = {"reference": reference, "double_after_split": double_after_split,
+                "surrender": surrender}
+
+    cache = _load_cache(cache_path)
+    current_cache, reports, pending = _use_cache(root, settings, cache)
+
+    workers = workers or os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError(f"Invalid worker count: {workers}")
+    validated = _validate_directories(pending, root, settings, workers)
+    current_cache.update(validated)
+    reports.update({directory: {**entry["report"], "cached": False}
+                    for directory, entry in validated.items()})
+    if current_cache != cache:
+        _save_cache(cache_path, current_cache)
+
+    directory_reports = [reports[directory] for directory in sorted(reports)]
+    return {
+        "root": root,
+        "directories": directory_reports,
+        "validated": len(pending),
+        "cached": len(directory_reports) - len(pending),
+        "issues": sum(len(report["issues"]) for report in directory_reports),
+        "seconds": time.perf_counter() - started,
+    }
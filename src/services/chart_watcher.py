@@ -0,0 +1,182 @@
+import logging
+import os
+import threading
+from services.blackjack_helper import REQUIRED_CHARTS, BlackjackHelper
+from services.chart_validator import MISSING_CELL, check_chart
+
+DEFAULT_POLL_INTERVAL = 1.0
+
+logger = logging.getLogger(__name__)
+
+
+def directory_signature(directory: str) -> tuple:
+    """Return the name, size and modification time of every file in a chart directory."""
+    signature = []
+    for entry in sorted(os.scandir(directory), key=lambda entry: entry.name):
+        if entry.is_file():
+            stat = entry.stat()
+            signature.append((entry.name, stat.st_size, stat.st_mtime_ns))
+    return tuple(signature)
+
+
+def chart_problems(charts) -> list:
+    """Return the issues that keep a loaded chart set from being published.
+
+    Missing cells only fall back to STAND, so they do not block a reload.
+    """
+    return [issue for chart_name in REQUIRED_CHARTS
+            for issue in check_chart(chart_name, charts[chart_name].get_chart_data())
+            if issue["kind"] != MISSING_CELL]
+
+
+class DirectoryPoller:
+    """Polls the file signature of a directory on a background thread."""
+
+    def __init__(self, directory: str, interval: float = DEFAULT_POLL_INTERVAL):
+        """Initialize poller with the current signature of directory."""
+        self.directory = directory
+        self.interval = interval
+        self.signature = directory_signature(directory)
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def changed(self) -> bool:
+        """Return whether the directory changed since the last signature.
+
+        Raises OSError when the directory cannot be read.
+        """
+        signature = directory_signature(self.directory)
+        if signature == self.signature:
+            return False
+        self.signature = signature
+        return True
+
+    def start(self, poll):
+        """Call poll every interval seconds in a background thread."""
+        if self._thread is not None:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, args=(poll,), name="chart-watcher",
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop polling and wait for a poll in progress to finish."""
+        if self._thread is None:
+            return
+        self._stopped.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self, poll):
+        """Call poll every interval until stopped."""
+        while not self._stopped.wait(self.interval):
+            poll()
+
+
+class ChartWatcher:
+    """Reloads a helper's charts whenever the files of its chart directory change.
+
+    A background thread polls the names, sizes and modification times of
+    the directory's files every poll_interval seconds. A changed directory
+    is loaded, validated with validate and compiled on that thread, and only
+    a valid set is published, with the helper's single chart set swap, so
+    advice never waits for a reload and never sees half of one. A set that
+    fails to load or validate, for any reason, is rejected and logged, the
+    helper keeps its last good charts and polling goes on; last_error tells
+    why. rollback publishes the charts in use before
+    the last reload again.
+    """
+
+    def __init__(self, blackjack_helper: BlackjackHelper, directory: str,
+                 poll_interval: float = DEFAULT_POLL_INTERVAL, validate=chart_problems):
+        """Initialize watcher for the charts of directory, which the helper uses now."""
+        self.blackjack_helper = blackjack_helper
+        self.validate = validate
+        self.reloads = 0
+        self.failures = 0
+        self.last_error = None
+        self.previous_chart_set = None
+
+        self._poller = DirectoryPoller(directory, poll_interval)
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    @property
+    def directory(self) -> str:
+        """Return the watched chart directory."""
+        return self._poller.directory
+
+    @property
+    def poll_interval(self) -> float:
+        """Return the seconds between checks of the directory."""
+        return self._poller.interval
+
+    @property
+    def generation(self) -> int:
+        """Return the chart generation the helper uses."""
+        return self.blackjack_helper.generation
+
+    def start(self):
+        """Start polling the directory in a background thread."""
+        self._poller.start(self.check)
+
+    def stop(self):
+        """Stop polling and wait for a reload in progress to finish."""
+        self._poller.stop()
+
+    def check(self) -> bool:
+        """Reload the charts if the directory changed and return whether they were published."""
+        with self._lock:
+            try:
+                if not self._poller.changed():
+                    return False
+            except OSError as e:
+                self._reject(e)
+                return False
+            return self._reload()
+
+    def reload(self) -> bool:
+        """Reload the charts now and return whether they were published."""
+        with self._lock:
+            return self._reload()
+
+    def _reload(self) -> bool:
+        """Load, validate and publish the charts of the directory."""
+        try:
+            charts = BlackjackHelper.load_charts_directory(self.directory)
+            problems = self.validate(charts)
+            if problems:
+                raise ValueError(f"Invalid charts in {self.directory}: {problems[:3]}")
+            previous_chart_set = self.blackjack_helper.chart_set
+            self.blackjack_helper.change_charts(charts)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            # Any broken chart file must only reject the reload, not stop the watcher thread.
+            self._reject(e)
+            return False
+
+        self.previous_chart_set = previous_chart_set
+        self.reloads += 1
+        self.last_error = None
+        return True
+
+    def _reject(self, error: Exception):
+        """Keep the current charts and remember why a reload failed."""
+        logger.warning("Rejected charts from %s: %r", self.directory, error)
+        self.failures += 1
+        self.last_error = str(error)
+
+    def rollback(self) -> bool:
+        """Publish the charts used before the last reload and return whether there were any."""
+        with self._lock:
+            if self.previous_chart_set is None:
+                return False
+            self.blackjack_helper.restore_chart_set(self.previous_chart_set)
+            self.previous_chart_set = None
+            return True
@@ -0,0 +1,244 @@
+import functools
+import struct
+from collections import OrderedDict
+import numpy as np
+
+DEALER_OUTCOMES = (17, 18, 19, 20, 21)
+BUST = len(DEALER_OUTCOMES)
+
+PEEK_EXCLUDED_HOLE_CARDS = {1: 10, 10: 1}
+IMPOSSIBLE_LOG_PROBABILITY = -1e6
+
+SHOE_KEY_FORMAT = struct.Struct("<B10H")
+
+
+def full_shoe(decks: int) -> tuple:
+    """Return the card counts of a full shoe, aces first and tens last."""
+    return (4 * decks,) * 9 + (16 * decks,)
+
+
+def remove_card(shoe: tuple, rank: int) -> tuple:
+    """Return shoe with one card of rank removed."""
+    index = rank - 1
+    return shoe[:index] + (shoe[index] - 1,) + shoe[index + 1:]
+
+
+def best_total(hard_total: int, has_ace: bool) -> int:
+    """Return the hand total counting one ace as eleven where it does not bust."""
+    return hard_total + 10 if has_ace and hard_total + 10 <= 21 else hard_total
+
+
+def _dealer_stands(hard_total: int, has_ace: bool, hits_soft_17: bool) -> bool:
+    """Check if the dealer stops drawing on a hand."""
+    total = best_total(hard_total, has_ace)
+    if total != 17:
+        return total > 17
+    return not (hits_soft_17 and total != hard_total)
+
+
+def _next_draws(drawn: tuple, excluded_rank: int | None):
+    """Yield the card counts of drawn with one more card of each possible rank.
+
+    excluded_rank cannot be the hole card, which is the first card drawn.
+    """
+    for rank in range(1, 11):
+        if rank == excluded_rank and not any(drawn):
+            continue
+        yield drawn[:rank - 1] + (drawn[rank - 1] + 1,) + drawn[rank:]
+
+
+def _finished_dealer_draws(upcard: int, hits_soft_17: bool) -> dict:
+    """Return the number of orderings of every finished set of dealer draws,
+    keyed by the card counts of the set."""
+    excluded_rank = PEEK_EXCLUDED_HOLE_CARDS.get(upcard)
+    frontier = {(0,) * 10: 1}
+    finished = {}
+    while frontier:
+        next_frontier = {}
+        for drawn, orderings in frontier.items():
+            for next_drawn in _next_draws(drawn, excluded_rank):
+                hard_total = upcard + sum(
+                    count * card for card, count in enumerate(next_drawn, start=1))
+                has_ace = upcard == 1 or next_drawn[0] > 0
+                draws = (finished if _dealer_stands(hard_total, has_ace, hits_soft_17)
+                         else next_frontier)
+                draws[next_drawn] = draws.get(next_drawn, 0) + orderings
+        frontier = next_frontier
+    return finished
+
+
+@functools.cache
+def _dealer_draw_multisets(upcard: int, hits_soft_17: bool):
+    """Return every finished set of dealer draws for an upcard.
+
+    The probability of drawing an ordered sequence of cards only depends on
+    which cards it holds, so sequences are grouped by their card counts. For
+    each group this counts the orderings in which the dealer only stops after
+    the last card. The first card is the hole card and never completes a
+    dealer blackjack.
+
+    Returns flat (rank, count) indexes into a (ranks x depth) table, the
+    number of cards in each group, a (groups x outcomes) matrix of ordering
+    counts and the table depth.
+    """
+    finished = _finished_dealer_draws(upcard, hits_soft_17)
+    draws = np.array(list(finished), dtype=np.intp)
+    hard_totals = upcard + draws @ np.arange(1, 11)
+    best_totals = np.where(((upcard == 1) | (draws[:, 0] > 0)) & (hard_totals + 10 <= 21),
+                           hard_totals + 10, hard_totals)
+    outcomes = np.where(best_totals > 21, BUST, best_totals - DEALER_OUTCOMES[0])
+
+    depth = int(draws.max()) + 1
+    selection = np.zeros((10 * depth, len(draws)))
+    selection[(draws + np.arange(10) * depth).ravel(),
+              np.repeat(np.arange(len(draws)), 10)] = 1
+    outcome_weights = np.zeros((len(draws), BUST + 1))
+    outcome_weights[np.arange(len(draws)), outcomes] = list(finished.values())
+    return selection, draws.sum(axis=1), outcome_weights, depth
+
+
+def _log_falling_factorials(counts: np.ndarray, depth: int) -> np.ndarray:
+    """Return the log falling factorials of every rank count for 0 to depth - 1 cards.
+
+    Drawing more cards of a rank than the shoe holds gets
+    IMPOSSIBLE_LOG_PROBABILITY.
+    """
+    factors = counts[:, :, None] - np.arange(depth - 1)
+    log_factors = np.log(np.maximum(factors, 1))
+    log_factors[factors <= 0] = IMPOSSIBLE_LOG_PROBABILITY
+    log_falling = np.zeros((len(counts), 10, depth))
+    np.cumsum(log_factors, axis=2, out=log_falling[:, :, 1:])
+    return log_falling
+
+
+def dealer_outcome_probabilities_batch(upcard: int, shoes: np.ndarray,
+                                       hits_soft_17: bool) -> np.ndarray:
+    """Return dealer outcome probabilities for each row of a (shoes x ranks) array.
+
+    Each finished set of draws has probability orderings * prod(falling
+    factorial of each rank count) / falling factorial of the shoe size. The
+    logarithms of the rank factors are picked for every set with one matrix
+    product, so a whole batch of shoes costs a handful of array operations.
+    """
+    selection, card_counts, outcome_weights, depth = _dealer_draw_multisets(
+        upcard, hits_soft_17)
+    counts = np.asarray(shoes, dtype=np.float64).reshape(-1, 10)
+    remaining = counts.sum(axis=1)
+    log_falling = _log_falling_factorials(counts, depth)
+
+    shoe_factors = remaining[:, None] - np.arange(card_counts.max())
+    log_shoe_falling = np.zeros((len(counts), card_counts.max() + 1))
+    np.cumsum(np.log(np.maximum(shoe_factors, 1)), axis=1, out=log_shoe_falling[:, 1:])
+
+    log_probabilities = log_falling.reshape(len(counts), -1) @ selection \
+        - log_shoe_falling[:, card_counts]
+    probabilities = np.exp(log_probabilities) @ outcome_weights
+
+    excluded_rank = PEEK_EXCLUDED_HOLE_CARDS.get(upcard)
+    if excluded_rank is not None:
+        probabilities /= (1 - counts[:, excluded_rank - 1] / remaining)[:, None]
+    return probabilities
+
+
+def dealer_outcome_probabilities(upcard: int, shoe: tuple, hits_soft_17: bool):
+    """Return dealer probabilities of 17 to 21 and bust given no dealer blackjack.
+
+    shoe holds the unseen cards, aces first, and must not contain the upcard.
+    """
+    return tuple(dealer_outcome_probabilities_batch(upcard, shoe, hits_soft_17)[0].tolist())
+
+
+def encode_shoe(upcard: int, shoe) -> bytes:
+    """Return the canonical cache key of an upcard and remaining shoe."""
+    return SHOE_KEY_FORMAT.pack(upcard, *shoe)
+
+
+def decode_shoe(key: bytes):
+    """Return the upcard and shoe encoded in a cache key."""
+    upcard, *shoe = SHOE_KEY_FORMAT.unpack(key)
+    return upcard, tuple(shoe)
+
+
+class DealerProbabilityCache:
+    """Size-bounded LRU cache of dealer outcome probabilities.
+
+    Results are keyed on a compact encoding of the upcard and remaining shoe.
+    Entries can be saved to and warm-started from a table on disk.
+    """
+
+    def __init__(self, hits_soft_17: bool = False, max_entries: int = 200_000):
+        """Initialize an empty cache for one soft 17 rule."""
+        if max_entries < 1:
+            raise ValueError(f"Invalid cache size: {max_entries}")
+
+        self.hits_soft_17 = hits_soft_17
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        """Return the number of cached results."""
+        return len(self._entries)
+
+    def _store(self, key: bytes, outcomes: tuple):
+        """Add a result and evict the least recently used ones over the size limit."""
+        self._entries[key] = outcomes
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, upcard: int, shoe: tuple):
+        """Return dealer outcome probabilities for an upcard and remaining shoe."""
+        key = encode_shoe(upcard, shoe)
+        outcomes = self._entries.get(key)
+        if outcomes is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return outcomes
+
+        self.misses += 1
+        outcomes = dealer_outcome_probabilities(upcard, shoe, self.hits_soft_17)
+        self._store(key, outcomes)
+        return outcomes
+
+    def prefetch(self, upcard: int, shoes, batch_size: int = 512):
+        """Compute results for every uncached shoe of an upcard in batches."""
+        missing = [shoe for shoe in map(tuple, shoes)
+                   if encode_shoe(upcard, shoe) not in self._entries]
+        for start in range(0, len(missing), batch_size):
+            batch = missing[start:start + batch_size]
+            outcomes = dealer_outcome_probabilities_batch(upcard, batch, self.hits_soft_17)
+            for shoe, shoe_outcomes in zip(batch, outcomes.tolist()):
+                self._store(encode_shoe(upcard, shoe), tuple(shoe_outcomes))
+
+    def stats(self):
+        """Return hit, miss and size counters."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+        }
+
+    def save(self, path: str):
+        """Write cached results to a table on disk."""
+        keys = [decode_shoe(key) for key in self._entries]
+        np.savez_compressed(
+            path,
+            hits_soft_17=self.hits_soft_17,
+            upcards=np.array([upcard for upcard, _ in keys], dtype=np.uint8).reshape(-1),
+            shoes=np.array([shoe for _, shoe in keys], dtype=np.uint16).reshape(-1, 10),
+            outcomes=np.array(list(self._entries.values())).reshape(-1, BUST + 1))
+
+    def load(self, path: str):
+        """Warm-start the cache from a table written by save."""
+        with np.load(path) as table:
+            if bool(table["hits_soft_17"]) != self.hits_soft_17:
+                raise ValueError(f"Table {path} was computed for another soft 17 rule")
+            upcards, shoes, stored_outcomes = (np.asarray(table[name])
+                                               for name in ("upcards", "shoes", "outcomes"))
+            rows = zip(upcards.tolist(), shoes.tolist(), stored_outcomes.tolist())
+            for upcard, shoe, outcomes in rows:
+                self._store(encode_shoe(upcard, shoe), tuple(outcomes))
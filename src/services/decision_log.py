@@ -0,0 +1,311 @@
+import functools
+import itertools
+import os
+import threading
+import time
+from collections import Counter, deque
+import numpy as np
+from services.blackjack_helper import BlackjackHelper
+from services.decision_table import CARD_VALUES, classify_hand_totals
+from services.hand_state import HandState
+
+SEGMENT_PREFIX = "decisions-"
+SEGMENT_SUFFIX = ".bjlog"
+
+BLOCK_MAGIC = 0x474C4A42
+BLOCK_HEADER = np.dtype([("magic", "<u4"), ("records", "<u4")])
+BLOCK_ALIGNMENT = 8
+
+COLUMNS = (
+    ("timestamp", np.dtype("<i8")),
+    ("table", np.dtype("<u4")),
+    ("chart_set", np.dtype("<u4")),
+    ("profile", np.dtype("<u2")),
+    ("dealer", np.dtype("u1")),
+    ("hard_total", np.dtype("u1")),
+    ("has_ace", np.dtype("u1")),
+    ("card_count", np.dtype("u1")),
+    ("first_rank", np.dtype("u1")),
+    ("second_rank", np.dtype("u1")),
+    ("action", np.dtype("u1")),
+)
+RECORD_BYTES = sum(dtype.itemsize for _, dtype in COLUMNS)
+
+
+def segment_name(index: int) -> str:
+    """Return the file name of the segment with index."""
+    return f"{SEGMENT_PREFIX}{index:06d}{SEGMENT_SUFFIX}"
+
+
+def log_segments(directory: str) -> list[str]:
+    """Return the segment paths of a log directory, oldest first."""
+    if not os.path.isdir(directory):
+        return []
+    return [os.path.join(directory, file) for file in sorted(os.listdir(directory))
+            if file.startswith(SEGMENT_PREFIX) and file.endswith(SEGMENT_SUFFIX)]
+
+
+def _block_bytes(records: int) -> int:
+    """Return the size of a block of records, header and padding included."""
+    size = BLOCK_HEADER.itemsize + records * RECORD_BYTES
+    return -(-size // BLOCK_ALIGNMENT) * BLOCK_ALIGNMENT
+
+
+@functools.lru_cache(maxsize=65536)
+def _hand_fields(dealer_card: str, cards: tuple) -> tuple:
+    """Return the dealer rank and hand counters logged for a decision given as card strings."""
+    dealer_value = CARD_VALUES.get(dealer_card, 0)
+    ranks = [CARD_VALUES.get(card, 0) for card in cards]
+    if 0 in ranks:
+        dealer_value = 0
+    return (dealer_value, sum(ranks), 1 in ranks, len(ranks),
+            ranks[0] if ranks else 0, ranks[1] if len(ranks) > 1 else 0)
+
+
+class _SegmentWriter:
+    """Writer of column blocks into numbered segment files of a log directory."""
+
+    def __init__(self, directory: str, segment_records: int):
+        """Initialize writer starting a segment after the existing ones."""
+        segments = log_segments(directory)
+        self.directory = directory
+        self.segment_records = segment_records
+        self.written = 0
+        self._index = (int(os.path.basename(segments[-1])[len(SEGMENT_PREFIX):-len(
+            SEGMENT_SUFFIX)]) + 1) if segments else 0
+        self._segment = None
+        self._size = 0
+
+    def write(self, columns):
+        """Append columns as blocks, rotating segments when they fill up."""
+        records = len(columns["action"])
+        start = 0
+        while start < records:
+            if self._segment is None:
+                # The segment stays open across writes until it is full.
+                self._segment = open(  # pylint: disable=consider-using-with
+                    os.path.join(self.directory, segment_name(self._index)), "ab")
+                self._index += 1
+                self._size = 0
+
+            end = min(records, start + self.segment_records - self._size)
+            header = np.array([(BLOCK_MAGIC, end - start)], dtype=BLOCK_HEADER)
+            block = [header.tobytes()]
+            block += [columns[name][start:end].tobytes() for name, _ in COLUMNS]
+            padding = _block_bytes(end - start) - sum(map(len, block))
+            self._segment.write(b"".join(block) + bytes(padding))
+
+            self.written += end - start
+            self._size += end - start
+            start = end
+            if self._size >= self.segment_records:
+                self.close()
+
+    def flush(self, sync: bool = False):
+        """Hand the written blocks to the operating system, and to the disk when sync is set."""
+        if self._segment is not None:
+            self._segment.flush()
+            if sync:
+                os.fsync(self._segment.fileno())
+
+    def close(self):
+        """Write the current segment to disk and close it."""
+        if self._segment is not None:
+            self.flush(sync=True)
+            self._segment.close()
+            self._segment = None
+
+
+class DecisionLog:
+    """Append-only binary log of advice decisions, written by a background thread.
+
+    A decision is stored as fixed-width fields: the time in nanoseconds, the
+    table, the chart set fingerprint, the rule profile index, the dealer
+    card, the hand as running counters (hard total, ace flag, card count and
+    first two ranks) and the action code. Decisions made from invalid cards
+    are stored with dealer card 0.
+
+    record and record_batch only queue decisions, so advice never waits for
+    the disk. The writer thread stores each flush as one block whose fields
+    are laid out column by column, and starts a new segment file once a
+    segment holds segment_records decisions. At most max_pending decisions
+    or batches wait to be written; further ones are counted in dropped.
+    """
+
+    def __init__(self, directory: str, segment_records: int = 1_000_000,
+                 flush_interval: float = 0.1, max_pending: int = 1_000_000):
+        """Initialize log appending to new segments in directory and start its writer."""
+        if segment_records < 1:
+            raise ValueError(f"Invalid segment size: {segment_records}")
+
+        os.makedirs(directory, exist_ok=True)
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.dropped = 0
+
+        self._writer = _SegmentWriter(directory, segment_records)
+        self._pending = deque()
+        self._write_lock = threading.Lock()
+        self._closed = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="decision-log-writer",
+                                        daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def written(self) -> int:
+        """Return the number of decisions written to segments."""
+        return self._writer.written
+
+    def record(self, table: int, dealer_card: str, player_cards: list[str] | HandState,
+               action_code: int, *, profile: int = 0, chart_set: int = 0):
+        """Queue one decision given as card strings."""
+        if len(self._pending) >= self.max_pending:
+            self.dropped += 1
+            return
+        cards = tuple(player_cards.cards if isinstance(player_cards, HandState)
+                      else player_cards)
+        self._pending.append((time.time_ns(), table, chart_set, profile, dealer_card, cards,
+                              action_code))
+
+    def record_batch(self, columns: dict):
+        """Queue many decisions given as per-decision arrays keyed by column name.
+
+        Every column but the timestamp is needed, with dealer ranks and hand
+        counters in the dealer and hand columns.
+        """
+        if len(self._pending) >= self.max_pending:
+            self.dropped += len(columns["action"])
+            return
+        batch = {"timestamp": np.full(len(columns["action"]), time.time_ns(), dtype=np.int64)}
+        for name, dtype in COLUMNS[1:]:
+            batch[name] = np.array(columns[name], dtype=dtype)
+        self._pending.append(batch)
+
+    def flush(self):
+        """Write every queued decision now and wait until it is on disk."""
+        with self._write_lock:
+            self._write_pending()
+            self._writer.flush(sync=True)
+
+    def close(self):
+        """Stop the writer after writing every queued decision."""
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        self._thread.join()
+        with self._write_lock:
+            self._write_pending()
+            self._writer.close()
+
+    def _run(self):
+        """Write queued decisions every flush_interval until the log is closed."""
+        while not self._closed.wait(self.flush_interval):
+            with self._write_lock:
+                self._write_pending()
+
+    @staticmethod
+    def _row_columns(rows) -> dict:
+        """Convert queued card string decisions to columns."""
+        timestamps, tables, chart_sets, profiles, dealer_cards, hands, action_codes = zip(*rows)
+        hand_columns = zip(*map(_hand_fields, dealer_cards, hands))
+        values = (timestamps, tables, chart_sets, profiles, *hand_columns, action_codes)
+        return {name: np.array(value, dtype=dtype)
+                for (name, dtype), value in zip(COLUMNS, values)}
+
+    def _write_pending(self):
+        """Write the queued decisions in order. Must be called holding the write lock."""
+        pending = [self._pending.popleft() for _ in range(len(self._pending))]
+        for is_batch, group in itertools.groupby(pending, key=lambda item: isinstance(item, dict)):
+            if is_batch:
+                for columns in group:
+                    self._writer.write(columns)
+            else:
+                self._writer.write(self._row_columns(list(group)))
+        self._writer.flush()
+
+
+def read_segment_blocks(path: str):
+    """Memory-map a segment and yield each block as a dictionary of column arrays.
+
+    The columns are views of the mapped file, so reading copies nothing. A
+    block cut short by an interrupted write ends the segment.
+    """
+    if os.path.getsize(path) < BLOCK_HEADER.itemsize:
+        return
+    data = np.memmap(path, dtype=np.uint8, mode="r")
+    offset = 0
+    while offset + BLOCK_HEADER.itemsize <= len(data):
+        header = data[offset:offset + BLOCK_HEADER.itemsize].view(BLOCK_HEADER)[0]
+        if header["magic"] != BLOCK_MAGIC:
+            raise ValueError(f"Corrupt decision log segment: {path}")
+        records = int(header["records"])
+        if offset + _block_bytes(records) > len(data):
+            return
+
+        column_offset = offset + BLOCK_HEADER.itemsize
+        columns = {}
+        for name, dtype in COLUMNS:
+            size = records * dtype.itemsize
+            columns[name] = data[column_offset:column_offset + size].view(dtype)
+            column_offset += size
+        yield columns
+        offset += _block_bytes(records)
+
+
+def read_log(directory: str) -> dict:
+    """Return every decision of a log directory as one dictionary of column arrays."""
+    blocks = [block for path in log_segments(directory) for block in read_segment_blocks(path)]
+    return {name: np.concatenate([block[name] for block in blocks]) if blocks
+            else np.zeros(0, dtype=dtype) for name, dtype in COLUMNS}
+
+
+def _rescore_block(block: dict, helpers, changes: Counter):
+    """Look up the decisions of a block again and count the changed advice in changes."""
+    profiles = block["profile"]
+    for profile in np.unique(profiles).tolist():
+        if profile >= len(helpers):
+            raise ValueError(f"No helper for profile {profile}")
+        rows = np.flatnonzero(profiles == profile)
+        hands = classify_hand_totals(
+            block["hard_total"][rows], block["has_ace"][rows], block["card_count"][rows],
+            block["first_rank"][rows], block["second_rank"][rows])
+        codes = helpers[profile].ask_help_classified(block["dealer"][rows].astype(np.int32),
+                                                     hands)
+        logged = block["action"][rows].astype(np.int64)
+        changed = codes != logged
+        pairs, counts = np.unique(logged[changed] * 256 + codes[changed], return_counts=True)
+        changes.update({(pair // 256, pair % 256): count for pair, count
+                        in zip(pairs.tolist(), counts.tolist())})
+
+
+def rescore_log(directory: str, helpers):
+    """Re-evaluate every logged decision with other charts and count the changed advice.
+
+    helpers is one BlackjackHelper or a list of them indexed by rule
+    profile. Decisions are looked up block by block in batches, by their
+    chart actions without count-based deviations.
+    """
+    if isinstance(helpers, BlackjackHelper):
+        helpers = [helpers]
+    records = 0
+    changes = Counter()
+    for path in log_segments(directory):
+        for block in read_segment_blocks(path):
+            records += len(block["action"])
+            _rescore_block(block, helpers, changes)
+
+    action_names = helpers[0].action_names
+    changed = sum(changes.values())
+    return {
+        "records": records,
+        "changed": changed,
+        "change_rate": changed / records if records else 0.0,
+        "changes": [{"from": action_names[old], "to": action_names[new], "count": count}
+                    for (old, new), count in changes.most_common()],
+    }
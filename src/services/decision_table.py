@@ -0,0 +1,183 @@
+import zlib
+import numpy as np
+from services.chart import Chart
+
+HARD_HAND = 0
+SOFT_HAND = 1
+PAIR_HAND = 2
+HAND_CLASSES = 3
+
+CARD_RANKS = range(1, 11)
+CARD_VALUES = {str(rank): rank for rank in CARD_RANKS}
+
+MIN_TABLE_TOTAL = 21
+
+
+def _highest_total(chart: Chart) -> int:
+    """Return the highest numeric player total used as a key in chart."""
+    highest = 0
+    for inner_dict in chart.get_chart_data().values():
+        for inner_key in inner_dict:
+            if inner_key.isdigit():
+                highest = max(highest, int(inner_key))
+    return highest
+
+
+def classify_card_ranks(player_cards: np.ndarray):
+    """Classify hands given as a matrix of card ranks padded with zeros.
+
+    Returns hand classes, lookup totals, card counts and a validity mask.
+    """
+    player_cards = np.asarray(player_cards)
+    valid = ((player_cards >= 0) & (player_cards <= 10)).all(axis=1)
+    ranks = np.where(valid[:, None], player_cards, 0).astype(np.int32)
+
+    totals = ranks.sum(axis=1)
+    card_counts = (ranks > 0).sum(axis=1)
+    has_ace = (ranks == 1).any(axis=1)
+    highest = np.max(ranks, axis=1, initial=0)
+    is_pair = (card_counts == 2) & (totals == highest * 2)
+
+    return (*_classify(totals, has_ace, is_pair, highest), card_counts, valid)
+
+
+def classify_card_counts(card_counts: np.ndarray):
+    """Classify hands given as a matrix of per-rank card counts (ace first).
+
+    Returns hand classes, lookup totals, card counts and a validity mask.
+    """
+    card_counts = np.asarray(card_counts)
+    valid = (card_counts >= 0).all(axis=1)
+    counts = np.where(valid[:, None], card_counts, 0).astype(np.int32)
+
+    totals = counts @ np.arange(1, 11, dtype=np.int32)
+    hand_sizes = counts.sum(axis=1)
+    has_ace = counts[:, 0] > 0
+    is_pair = (hand_sizes == 2) & (counts.max(axis=1) == 2)
+    pair_values = counts.argmax(axis=1) + 1
+
+    return (*_classify(totals, has_ace, is_pair, pair_values), hand_sizes, valid)
+
+
+def classify_hand_totals(hard_totals: np.ndarray, has_ace: np.ndarray, hand_sizes: np.ndarray,
+                         first_ranks: np.ndarray, second_ranks: np.ndarray):
+    """Classify hands kept as running counters instead of cards.
+
+    first_ranks and second_ranks hold the first two cards of each hand, which
+    decide whether a two-card hand is a pair. Returns the same tuple as
+    classify_card_ranks.
+    """
+    hard_totals = np.asarray(hard_totals, dtype=np.int32)
+    hand_sizes = np.asarray(hand_sizes, dtype=np.int32)
+    is_pair = (hand_sizes == 2) & (first_ranks == second_ranks)
+    return (*_classify(hard_totals, np.asarray(has_ace, dtype=bool), is_pair,
+                       np.asarray(first_ranks, dtype=np.int32)),
+            hand_sizes, np.ones(len(hard_totals), dtype=bool))
+
+
+def _classify(totals, has_ace, is_pair, pair_values):
+    """Pick hand class and lookup total the same way as for a single hand."""
+    is_soft = has_ace & (totals + 10 <= 21)
+
+    hand_classes = np.select([is_pair, is_soft], [PAIR_HAND, SOFT_HAND], HARD_HAND)
+    lookup_totals = np.select([is_pair, is_soft], [pair_values, totals + 10], totals)
+
+    return hand_classes, lookup_totals
+
+
+class DecisionTable:
+    """Flat table of rule-resolved actions indexed by dealer card, hand class and total.
+
+    Rows are laid out as (dealer card x hand class) and every row holds one
+    column per player total. The last column of each row is never a chart
+    key, so totals past the end of the row are clamped onto it and resolve
+    to the chart's fallback action exactly like a missed dictionary lookup.
+
+    Actions are stored as small integer codes in codes, where a code is an
+    index into palette, and as a list in cell_codes. fallback_cells
+    marks cells missing from their chart and rewritten_cells marks cells
+    whose chart action was changed by the rules. fingerprint is a CRC-32 of
+    the codes, so it identifies the charts and rules a table was compiled from.
+    """
+
+    def __init__(self, normal_chart: Chart, soft_chart: Chart, split_chart: Chart,
+                 resolve_action, *, split_allowed: bool, palette=()):
+        """Compile charts into a flat table using resolve_action for rule fallbacks."""
+        self.width = max(MIN_TABLE_TOTAL, _highest_total(normal_chart),
+                         _highest_total(soft_chart), _highest_total(split_chart)) + 2
+        self.palette = list(palette)
+        self._palette_codes = {action: code for code, action in enumerate(self.palette)}
+
+        raw_codes, found = self._chart_codes(normal_chart, soft_chart, split_chart)
+        if not split_allowed:
+            pair_values = np.arange(self.width // 2)
+            raw_codes[:, PAIR_HAND] = self._code(split_chart.on_not_found)
+            found[:, PAIR_HAND] = False
+            for cells in (raw_codes, found):
+                cells[:, PAIR_HAND, pair_values] = cells[:, HARD_HAND, pair_values * 2]
+                cells[:, PAIR_HAND, 1] = cells[:, SOFT_HAND, 12]
+
+        resolved = np.array([self._code(resolve_action(self.palette[code]))
+                             for code in range(len(self.palette))], dtype=np.uint8)
+        self.codes = resolved[raw_codes].ravel()
+        self.fallback_cells = ~found.ravel()
+        self.rewritten_cells = self.codes != raw_codes.ravel()
+        self.cell_codes = self.codes.tolist()
+        self.fingerprint = zlib.crc32(self.codes.tobytes())
+
+    def _chart_codes(self, normal_chart: Chart, soft_chart: Chart, split_chart: Chart):
+        """Return the unresolved code of every cell and whether its chart has the cell."""
+        raw_codes = np.empty(
+            (len(CARD_RANKS), HAND_CLASSES, self.width), dtype=np.uint8)
+        found = np.zeros(raw_codes.shape, dtype=bool)
+        for dealer_index, dealer_value in enumerate(CARD_RANKS):
+            dealer_card = str(dealer_value)
+            for hand_class, chart in ((HARD_HAND, normal_chart), (SOFT_HAND, soft_chart),
+                                      (PAIR_HAND, split_chart)):
+                raw_codes[dealer_index, hand_class] = [
+                    self._code(chart(dealer_card, str(total))) for total in range(self.width)]
+                found[dealer_index, hand_class] = [
+                    str(total) in chart.get_chart_data().get(dealer_card, {})
+                    for total in range(self.width)]
+        return raw_codes, found
+
+    def _code(self, action) -> int:
+        """Return the palette code of action, adding it to the palette if needed."""
+        code = self._palette_codes.get(action)
+        if code is None:
+            code = len(self.palette)
+            if code > np.iinfo(np.uint8).max:
+                raise ValueError("Too many distinct actions in charts")
+            self.palette.append(action)
+            self._palette_codes[action] = code
+        return code
+
+    def code_of(self, action) -> int:
+        """Return the palette code of an action already in the palette."""
+        return self._palette_codes[action]
+
+    def index(self, dealer_value: int, hand_class: int, total: int) -> int:
+        """Return the flat table index of a cell."""
+        if total >= self.width:
+            total = self.width - 1
+        return ((dealer_value - 1) * HAND_CLASSES + hand_class) * self.width + total
+
+    def lookup(self, dealer_value: int, hand_class: int, total: int):
+        """Return the resolved action of a cell."""
+        return self.palette[self.cell_codes[self.index(dealer_value, hand_class, total)]]
+
+    def lookup_code(self, dealer_value: int, hand_class: int, total: int) -> int:
+        """Return the resolved action code of a cell."""
+        return self.cell_codes[self.index(dealer_value, hand_class, total)]
+
+    def lookup_batch(self, dealer_values: np.ndarray, hand_classes: np.ndarray,
+                     totals: np.ndarray) -> np.ndarray:
+        """Return resolved action codes for arrays of cells."""
+        return self.codes[self.index_batch(dealer_values, hand_classes, totals)]
+
+    def index_batch(self, dealer_values: np.ndarray, hand_classes: np.ndarray,
+                    totals: np.ndarray) -> np.ndarray:
+        """Return flat table indices for arrays of cells."""
+        dealer_values = np.clip(dealer_values, 1, len(CARD_RANKS)).astype(np.intp)
+        totals = np.minimum(totals, self.width - 1)
+        return ((dealer_values - 1) * HAND_CLASSES + hand_classes) * self.width + totals
@@ -0,0 +1,78 @@
+import json
+from services.decision_table import CARD_VALUES, HARD_HAND, PAIR_HAND, SOFT_HAND
+
+DEVIATIONS_FILE_NAME = "deviations.json"
+DEVIATIONS_NAME = "deviations"
+
+CHART_HAND_CLASSES = {"normal": HARD_HAND, "soft": SOFT_HAND, "split": PAIR_HAND}
+
+
+class StrategyDeviations:
+    """Count-based changes to chart actions.
+
+    Each entry names a chart cell and the action to play there when the
+    true count is at least min_true_count and at most max_true_count. At
+    least one of the two bounds is required, for example
+    {"chart": "normal", "dealer": "10", "total": "16", "action": "S",
+    "min_true_count": 0}. The first matching entry of a cell wins.
+    """
+
+    def __init__(self, entries, valid_actions=None):
+        """Initialize deviations from entry dictionaries.
+
+        Actions are checked against valid_actions when it is given.
+        """
+        self.entries = list(entries)
+        self._cells = {}
+        for index, entry in enumerate(self.entries):
+            cell, bounds = self._parse_entry(index, entry, valid_actions)
+            self._cells.setdefault(cell, []).append(bounds)
+
+    @staticmethod
+    def _parse_entry(index: int, entry, valid_actions):
+        """Return the lookup cell and (min, max, action) of the entry at index."""
+        try:
+            chart_name, dealer, total, action = (
+                entry["chart"], entry["dealer"], entry["total"], entry["action"])
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"Invalid deviation: {entry}") from e
+
+        if chart_name not in CHART_HAND_CLASSES:
+            raise ValueError(f"Invalid deviation chart: {chart_name}")
+        if dealer not in CARD_VALUES or not str(total).isdigit():
+            raise ValueError(f"Invalid deviation cell: {dealer} -> {total}")
+        if valid_actions is not None and action not in valid_actions:
+            raise ValueError(f"Invalid deviation action: {action}")
+
+        min_true_count = entry.get("min_true_count")
+        max_true_count = entry.get("max_true_count")
+        if min_true_count is None and max_true_count is None:
+            raise ValueError(f"Deviation needs a true count bound: {entry}")
+        for bound in (min_true_count, max_true_count):
+            if bound is not None and (isinstance(bound, bool)
+                                      or not isinstance(bound, (int, float))):
+                raise ValueError(f"Invalid deviation true count bound at entry {index}: "
+                                 f"{bound!r}")
+
+        cell = (CARD_VALUES[dealer], CHART_HAND_CLASSES[chart_name], int(total))
+        bounds = (float("-inf") if min_true_count is None else min_true_count,
+                  float("inf") if max_true_count is None else max_true_count, action)
+        return cell, bounds
+
+    @staticmethod
+    def from_file(path: str, valid_actions=None):
+        """Load deviations from a JSON list of entries."""
+        with open(path, "r", encoding="utf-8") as f:
+            return StrategyDeviations(json.load(f), valid_actions)
+
+    def __len__(self):
+        """Return the number of entries."""
+        return len(self.entries)
+
+    def action(self, dealer_value: int, hand_class: int, total: int, true_count: float):
+        """Return the deviating action of a cell at true_count, or None."""
+        for min_true_count, max_true_count, action in self._cells.get(
+                (dealer_value, hand_class, total), ()):
+            if min_true_count <= true_count <= max_true_count:
+                return action
+        return None
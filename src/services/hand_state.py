@@ -0,0 +1,90 @@
+from services.decision_table import CARD_VALUES, HARD_HAND, PAIR_HAND, SOFT_HAND
+
+
+class HandState:
+    """Player hand that keeps its total, softness and pair status up to date.
+
+    Adding, removing and replacing a card only adjusts running counters
+    instead of rescanning the hand. Cards that are not valid ranks are
+    counted, and a hand holding any of them has no classification.
+    """
+
+    __slots__ = ("cards", "hard_total", "aces", "invalid_cards")
+
+    def __init__(self, cards=()):
+        """Initialize hand from card strings."""
+        self.cards = []
+        self.hard_total = 0
+        self.aces = 0
+        self.invalid_cards = 0
+        for card in cards:
+            self.add(card)
+
+    def _count(self, card: str, sign: int):
+        """Add (sign 1) or remove (sign -1) a card from the running counters."""
+        card_value = CARD_VALUES.get(card)
+        if card_value is None:
+            self.invalid_cards += sign
+            return
+        self.hard_total += sign * card_value
+        if card_value == 1:
+            self.aces += sign
+
+    def add(self, card: str):
+        """Add a card to the end of the hand."""
+        self.cards.append(card)
+        self._count(card, 1)
+
+    def remove(self, index: int = -1) -> str:
+        """Remove and return the card at index, the last card by default."""
+        card = self.cards.pop(index)
+        self._count(card, -1)
+        return card
+
+    def replace(self, index: int, card: str):
+        """Replace the card at index."""
+        self._count(self.cards[index], -1)
+        self.cards[index] = card
+        self._count(card, 1)
+
+    def __len__(self):
+        """Return the number of cards."""
+        return len(self.cards)
+
+    def __getitem__(self, index):
+        """Return the card at index."""
+        return self.cards[index]
+
+    def __iter__(self):
+        """Iterate over the cards."""
+        return iter(self.cards)
+
+    @property
+    def is_valid(self) -> bool:
+        """Check if every card is a valid rank."""
+        return self.invalid_cards == 0
+
+    @property
+    def is_pair(self) -> bool:
+        """Check if the hand is two identical cards."""
+        return len(self.cards) == 2 and self.cards[0] == self.cards[1]
+
+    @property
+    def is_soft(self) -> bool:
+        """Check if the hand counts an ace as eleven."""
+        return self.aces > 0 and self.hard_total + 10 <= 21
+
+    @property
+    def total(self) -> int:
+        """Return the best total of the hand."""
+        return self.hard_total + 10 if self.is_soft else self.hard_total
+
+    def classify(self):
+        """Return hand class and lookup total, or None for invalid cards."""
+        if self.invalid_cards:
+            return None
+        if self.is_pair:
+            return PAIR_HAND, self.hard_total // 2
+        if self.is_soft:
+            return SOFT_HAND, self.hard_total + 10
+        return HARD_HAND, self.hard_total
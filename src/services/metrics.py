@@ -0,0 +1,122 @@
+import bisect
+from collections import Counter
+import numpy as np
+from services.decision_table import HARD_HAND, PAIR_HAND, SOFT_HAND
+
+CHART_NAMES = {HARD_HAND: "normal", SOFT_HAND: "soft", PAIR_HAND: "split"}
+
+LATENCY_BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 1e-3, 1e-2)
+
+
+class LatencyHistogram:
+    """Counts of latencies below each bucket bound, plus their sum and count."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        """Initialize empty histogram with bucket bounds in seconds."""
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def record(self, seconds: float, count: int = 1):
+        """Add count latencies of seconds each."""
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += count
+        self.sum += seconds * count
+        self.count += count
+
+    def bucket_counts(self) -> dict:
+        """Return the count of each bucket by its upper bound, the last one being "+Inf"."""
+        return dict(zip([*map(str, self.buckets), "+Inf"], self.counts))
+
+
+class AdviceMetrics:
+    """Counters and a latency histogram for instrumented advice lookups.
+
+    Chart queries and fallback hits are counted per chart, fallback hits
+    also per (chart, dealer card, total) cell, so holes in a chart can be
+    found from production traffic.
+    """
+
+    def __init__(self, latency_buckets=LATENCY_BUCKETS):
+        """Initialize empty metrics with latency histogram bucket bounds in seconds."""
+        self.latency_buckets = tuple(latency_buckets)
+        self.reset()
+
+    def reset(self):
+        """Set every counter back to zero."""
+        self.queries = dict.fromkeys(CHART_NAMES.values(), 0)
+        self.fallbacks = dict.fromkeys(CHART_NAMES.values(), 0)
+        self.fallback_cells = Counter()
+        self.rule_rewrites = 0
+        self.deviations = 0
+        self.invalid_hands = 0
+        self.latency = LatencyHistogram(self.latency_buckets)
+
+    def record_lookup(self, chart_name: str, dealer_value: int, total: int, *,
+                      fallback: bool, rewritten: bool):
+        """Count one chart lookup."""
+        self.queries[chart_name] += 1
+        if fallback:
+            self.fallbacks[chart_name] += 1
+            self.fallback_cells[(chart_name, dealer_value, total)] += 1
+        if rewritten:
+            self.rule_rewrites += 1
+
+    def record_lookups(self, chart_classes: np.ndarray, dealer_values: np.ndarray,
+                       totals: np.ndarray, fallback: np.ndarray):
+        """Count many chart lookups given as arrays of chart cells and fallback flags."""
+        for chart_class, chart_name in CHART_NAMES.items():
+            in_chart = chart_classes == chart_class
+            self.queries[chart_name] += int(np.count_nonzero(in_chart))
+            self.fallbacks[chart_name] += int(np.count_nonzero(in_chart & fallback))
+
+        cells, counts = np.unique(np.stack([chart_classes[fallback], dealer_values[fallback],
+                                            totals[fallback]], axis=1),
+                                  axis=0, return_counts=True)
+        for (chart_class, dealer_value, total), count in zip(cells.tolist(), counts.tolist()):
+            self.fallback_cells[(CHART_NAMES[chart_class], dealer_value, total)] += count
+
+    def record_latency(self, seconds: float, count: int = 1):
+        """Add count lookups that took seconds each to the latency histogram."""
+        self.latency.record(seconds, count)
+
+    def snapshot(self, top_fallback_cells: int = 10):
+        """Return the metrics as a dictionary."""
+        return {
+            "queries": dict(self.queries),
+            "fallbacks": dict(self.fallbacks),
+            "top_fallback_cells": [
+                {"chart": chart_name, "dealer": dealer_value, "total": total, "count": count}
+                for (chart_name, dealer_value, total), count
+                in self.fallback_cells.most_common(top_fallback_cells)],
+            "rule_rewrites": self.rule_rewrites,
+            "deviations": self.deviations,
+            "invalid_hands": self.invalid_hands,
+            "latency": {
+                "buckets": self.latency.bucket_counts(),
+                "sum_seconds": self.latency.sum,
+                "count": self.latency.count,
+            },
+        }
+
+    def to_prometheus(self, prefix: str = "blackjack_helper") -> str:
+        """Return the metrics in the Prometheus text exposition format."""
+        lines = []
+        for name, values in (("queries", self.queries), ("fallbacks", self.fallbacks)):
+            lines.append(f"# TYPE {prefix}_{name}_total counter")
+            lines += [f'{prefix}_{name}_total{{chart="{chart_name}"}} {count}'
+                      for chart_name, count in values.items()]
+        for name, count in (("rule_rewrites", self.rule_rewrites),
+                            ("deviations", self.deviations),
+                            ("invalid_hands", self.invalid_hands)):
+            lines.append(f"# TYPE {prefix}_{name}_total counter")
+            lines.append(f"{prefix}_{name}_total {count}")
+
+        lines.append(f"# TYPE {prefix}_latency_seconds histogram")
+        cumulative = 0
+        for bound, count in self.latency.bucket_counts().items():
+            cumulative += count
+            lines.append(f'{prefix}_latency_seconds_bucket{{le="{bound}"}} {cumulative}')
+        lines.append(f"{prefix}_latency_seconds_sum {self.latency.sum}")
+        lines.append(f"{prefix}_latency_seconds_count {self.latency.count}")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,76 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+import numpy as np
+from services.simulator import BlackjackSimulator, CompiledStrategy, SimulationResult
+
+_worker_state = {}
+
+
+def split_rounds(rounds: int, shards: int) -> list[int]:
+    """Split rounds into shards whose sizes differ by at most one."""
+    base, extra = divmod(rounds, shards)
+    return [base + (1 if shard < extra else 0) for shard in range(shards)]
+
+
+def _attach_strategy(memory_name: str, table_count: int, table_width: int, palette,
+                     simulator_settings):
+    """Worker initializer that maps the shared decision tables once per process."""
+    shared_memory = SharedMemory(name=memory_name)
+    table_codes = np.ndarray((table_count,), dtype=np.uint8, buffer=shared_memory.buf)
+
+    strategy = CompiledStrategy(table_codes, table_width, palette)
+    _worker_state["shared_memory"] = shared_memory
+    _worker_state["simulator"] = BlackjackSimulator(strategy, **simulator_settings)
+
+
+def _simulate_shard(rounds: int, seed_sequence: np.random.SeedSequence,
+                    batch_size: int) -> SimulationResult:
+    """Simulate one shard with the worker's shared simulator."""
+    return _worker_state["simulator"].simulate(rounds, seed_sequence, batch_size)
+
+
+def simulate_parallel(simulator: BlackjackSimulator, rounds: int, seed: int,
+                      workers: int | None = None,
+                      batch_size: int = 200_000) -> SimulationResult:
+    """Simulate rounds split across a process pool and merge the results.
+
+    Each worker gets its own RNG stream spawned from seed, and the compiled
+    decision tables are placed in shared memory once instead of being rebuilt
+    in every worker. Results only depend on seed and the worker count.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError(f"Invalid worker count: {workers}")
+
+    seed_sequences = np.random.SeedSequence(seed).spawn(workers)
+    shard_rounds = split_rounds(rounds, workers)
+
+    strategy = simulator.strategy
+    table_codes = np.ascontiguousarray(strategy.table_codes, dtype=np.uint8)
+    shared_memory = SharedMemory(create=True, size=max(table_codes.nbytes, 1))
+    try:
+        np.ndarray(table_codes.shape, dtype=np.uint8,
+                   buffer=shared_memory.buf)[:] = table_codes
+        simulator_settings = {
+            "decks": simulator.decks,
+            "dealer_hits_soft_17": simulator.dealer_hits_soft_17,
+            "blackjack_payout": simulator.blackjack_payout,
+            "max_hands": simulator.max_hands,
+        }
+        with ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                initializer=_attach_strategy,
+                initargs=(shared_memory.name, len(table_codes), strategy.table_width,
+                          strategy.palette, simulator_settings)) as executor:
+            shard_results = list(executor.map(
+                _simulate_shard, shard_rounds, seed_sequences, [batch_size] * workers))
+    finally:
+        shared_memory.close()
+        shared_memory.unlink()
+
+    result = SimulationResult()
+    for shard_result in shard_results:
+        result = result.merge(shard_result)
+    return result
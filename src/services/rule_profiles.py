@@ -0,0 +1,68 @@
+import json
+import os
+from services.blackjack_helper import DEFAULT_RULES, BlackjackHelper, BlackjackRules
+from services.chart_registry import ChartRegistry, ChartVariant
+
+PROFILE_DIRECTORY = "data/profiles"
+
+
+class RuleProfile:
+    """Named table conditions: the chart variant to play with and the rules in force.
+
+    Profile files are JSON objects such as {"name": "Vegas Strip",
+    "decks": 1, "dealer_hits_soft_17": false, "rules": {"surrender_allowed":
+    true}}. Rules left out of a file keep their default values.
+    """
+
+    def __init__(self, name: str, variant: ChartVariant, rules=None):
+        """Initialize profile from a name, chart variant and rule values."""
+        self.name = name
+        self.variant = variant
+        self.rules = {**DEFAULT_RULES, **(rules or {})}
+
+    @staticmethod
+    def from_file(path: str):
+        """Load a profile from a JSON file."""
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        try:
+            name, decks, dealer_hits_soft_17 = (
+                data["name"], data["decks"], data["dealer_hits_soft_17"])
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"Invalid rule profile: {path}") from e
+
+        rules = {}
+        for rule_name, value in data.get("rules", {}).items():
+            if rule_name not in BlackjackRules or not isinstance(value, bool):
+                raise ValueError(f"Invalid rule in {path}: {rule_name}")
+            rules[BlackjackRules(rule_name)] = value
+
+        return RuleProfile(name, ChartVariant(decks, dealer_hits_soft_17, data.get("tag", "")),
+                           rules)
+
+    def apply(self, blackjack_helper: BlackjackHelper, chart_registry: ChartRegistry):
+        """Switch a helper to this profile's charts and rules.
+
+        The charts are only changed when the helper uses another chart set, so
+        moving between profiles of the same variant only swaps compiled tables.
+        Charts and rules of another variant are published in one swap.
+        """
+        charts = chart_registry.charts(self.variant)
+        if blackjack_helper.normal_chart is not charts["normal"]:
+            blackjack_helper.change_charts_and_rules(charts, self.rules)
+        else:
+            blackjack_helper.set_rules(self.rules)
+
+
+def load_profiles(directory: str = PROFILE_DIRECTORY):
+    """Return the profiles of every JSON file in directory by name."""
+    profiles = {}
+    for file in sorted(os.listdir(directory)):
+        if not file.endswith(".json"):
+            continue
+        profile = RuleProfile.from_file(os.path.join(directory, file))
+        if profile.name in profiles:
+            raise ValueError(f"Duplicate rule profile: {profile.name}")
+        profiles[profile.name] = profile
+    return profiles
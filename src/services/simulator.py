@@ -0,0 +1,438 @@
+import math
+import numpy as np
+from services.blackjack_helper import (
+    BlackjackActions, BlackjackHelper, BlackjackRules, get_blackjack_action_name,
+    split_hand_rules)
+from services.split_hands import DEFAULT_MAX_HANDS
+from services.decision_table import HAND_CLASSES, HARD_HAND, PAIR_HAND, SOFT_HAND
+
+MOVE_HIT = 0
+MOVE_STAND = 1
+MOVE_DOUBLE = 2
+MOVE_SPLIT = 3
+MOVE_SURRENDER = 4
+
+ACTION_MOVES = {
+    BlackjackActions.HIT: MOVE_HIT,
+    BlackjackActions.STAND: MOVE_STAND,
+    BlackjackActions.DOUBLE: MOVE_DOUBLE,
+    BlackjackActions.SPLIT: MOVE_SPLIT,
+    BlackjackActions.SURRENDER: MOVE_SURRENDER,
+}
+
+FIRST_DECISION_TABLE = 0
+SPLIT_HAND_TABLE = 1
+LATER_DECISION_TABLE = 2
+LAST_SPLIT_HAND_TABLE = 3
+DECISION_TABLES = 4
+CARDS_PER_RANK = np.array([4] * 9 + [16], dtype=np.int16)
+
+
+class SimulationResult:
+    """Mergeable summary statistics of simulated rounds.
+
+    Round results are kept in half bet units so sums stay exact integers and
+    results from separate runs merge without rounding.
+    """
+
+    def __init__(self, rounds=0, half_units=0, half_units_squared=0, action_counts=None):
+        """Initialize statistics from round count, payout sums and action counts."""
+        self.rounds = rounds
+        self.half_units = half_units
+        self.half_units_squared = half_units_squared
+        self.action_counts = action_counts or {}
+
+    def add_rounds(self, half_unit_results: np.ndarray):
+        """Add the results of rounds given in half bet units."""
+        half_unit_results = half_unit_results.astype(np.int64)
+        self.rounds += len(half_unit_results)
+        self.half_units += int(half_unit_results.sum())
+        self.half_units_squared += int((half_unit_results * half_unit_results).sum())
+
+    def add_actions(self, action, count: int):
+        """Count how many times action was taken."""
+        if count:
+            self.action_counts[action] = self.action_counts.get(action, 0) + count
+
+    def merge(self, other: "SimulationResult") -> "SimulationResult":
+        """Return statistics combining this result with other."""
+        action_counts = dict(self.action_counts)
+        for action, count in other.action_counts.items():
+            action_counts[action] = action_counts.get(action, 0) + count
+
+        return SimulationResult(self.rounds + other.rounds,
+                                self.half_units + other.half_units,
+                                self.half_units_squared + other.half_units_squared,
+                                action_counts)
+
+    @property
+    def expected_value(self) -> float:
+        """Mean result per round in initial bets."""
+        return self.half_units / self.rounds / 2 if self.rounds else 0.0
+
+    @property
+    def variance(self) -> float:
+        """Sample variance of round results in squared initial bets."""
+        if self.rounds < 2:
+            return 0.0
+        squared_deviations = (self.half_units_squared
+                              - self.half_units * self.half_units / self.rounds)
+        return squared_deviations / (self.rounds - 1) / 4
+
+    @property
+    def standard_error(self) -> float:
+        """Standard error of the expected value."""
+        return math.sqrt(self.variance / self.rounds) if self.rounds else 0.0
+
+    def confidence_interval(self, z_score: float = 1.96):
+        """Return the normal approximation confidence interval of the expected value."""
+        margin = z_score * self.standard_error
+        return self.expected_value - margin, self.expected_value + margin
+
+    def action_frequencies(self):
+        """Return the share of decisions taken per readable action name."""
+        decisions = sum(self.action_counts.values())
+        return {get_blackjack_action_name(action): count / decisions
+                for action, count in self.action_counts.items()} if decisions else {}
+
+    def to_dict(self):
+        """Return the statistics as a plain dictionary."""
+        return {
+            "rounds": self.rounds,
+            "expected_value": self.expected_value,
+            "variance": self.variance,
+            "standard_error": self.standard_error,
+            "confidence_interval": list(self.confidence_interval()),
+            "action_frequencies": self.action_frequencies(),
+        }
+
+
+class Shoe:
+    """Shoe compositions of many rows stored as a (rows x ranks) count matrix.
+
+    A row is one round of a simulation, or one session when the shoe is
+    kept between rounds.
+    """
+
+    def __init__(self, rows: int, decks: int, rng: np.random.Generator):
+        """Fill a fresh shoe for every row."""
+        self.decks = decks
+        self.counts = np.tile(CARDS_PER_RANK * decks, (rows, 1))
+        self.remaining = np.full(rows, 52 * decks, dtype=np.int32)
+        self.rng = rng
+
+    def __len__(self):
+        """Return the number of rows."""
+        return len(self.remaining)
+
+    def reshuffle(self, rows: np.ndarray):
+        """Put every card back into the listed rows' shoes."""
+        self.counts[rows] = CARDS_PER_RANK * self.decks
+        self.remaining[rows] = 52 * self.decks
+
+    def take(self, rows: np.ndarray) -> "Shoe":
+        """Return a shoe holding copies of the listed rows."""
+        shoe = Shoe(0, self.decks, self.rng)
+        shoe.counts = self.counts[rows]
+        shoe.remaining = self.remaining[rows]
+        return shoe
+
+    def put(self, rows: np.ndarray, shoe: "Shoe"):
+        """Write the rows of a shoe made by take back into the listed rows."""
+        self.counts[rows] = shoe.counts
+        self.remaining[rows] = shoe.remaining
+
+    def draw(self, rows: np.ndarray) -> np.ndarray:
+        """Draw one card without replacement from each listed row's shoe.
+
+        Empty shoes are reshuffled first.
+        """
+        empty = rows[self.remaining[rows] == 0]
+        if len(empty):
+            self.reshuffle(empty)
+        targets = (self.rng.random(len(rows)) * self.remaining[rows]).astype(np.int32)
+        cumulative = self.counts[rows].cumsum(axis=1)
+        rank_indexes = (cumulative <= targets[:, None]).sum(axis=1)
+
+        self.counts[rows, rank_indexes] -= 1
+        self.remaining[rows] -= 1
+        return rank_indexes + 1
+
+
+class CompiledStrategy:
+    """Stacked decision table codes used to play rounds.
+
+    Holds one table for first decisions, one for freshly split hands that may
+    be resplit, one for hands of three or more cards and one for split hands
+    once the round has no room for another hand, concatenated into a single
+    code array.
+    """
+
+    def __init__(self, table_codes: np.ndarray, table_width: int, palette):
+        """Initialize strategy from stacked table codes and their action palette."""
+        self.table_codes = table_codes
+        self.table_width = table_width
+        self.table_size = len(table_codes) // DECISION_TABLES
+        self.palette = list(palette)
+        self.code_moves = np.array([ACTION_MOVES.get(action, MOVE_STAND)
+                                    for action in self.palette], dtype=np.int8)
+
+    @staticmethod
+    def from_helper(blackjack_helper: BlackjackHelper):
+        """Compile the helper's charts and rules into a strategy."""
+        rules = blackjack_helper.rules
+        last_split_hand_rules = split_hand_rules(rules, False)
+        later_decision_rules = dict(last_split_hand_rules)
+        later_decision_rules[BlackjackRules.DOUBLE_ALLOWED] = False
+
+        tables = [blackjack_helper.compile_decision_table(table_rules)
+                  for table_rules in (rules, split_hand_rules(rules, True),
+                                      later_decision_rules, last_split_hand_rules)]
+
+        palette = tables[0].palette
+        for table in tables[1:]:
+            if table.palette[:len(palette)] != palette:
+                raise ValueError("Decision tables use different action palettes")
+            palette = table.palette
+
+        return CompiledStrategy(np.concatenate([table.codes for table in tables]),
+                                tables[0].width, palette)
+
+
+class BlackjackSimulator:
+    """Monte Carlo simulator that plays full rounds with a helper's chart strategy.
+
+    Rounds are simulated side by side as NumPy arrays. Every round is dealt
+    from a freshly shuffled shoe, the dealer peeks for blackjack, naturals
+    pay blackjack_payout, surrender is late surrender and pairs are resplit
+    up to max_hands hands. Split aces receive one card each and are never
+    resplit.
+    """
+
+    def __init__(self, strategy, decks: int = 1, *,
+                 dealer_hits_soft_17: bool = False, blackjack_payout: float = 1.5,
+                 max_hands: int = DEFAULT_MAX_HANDS):
+        """Initialize simulator from a BlackjackHelper or a CompiledStrategy."""
+        if decks < 1:
+            raise ValueError(f"Invalid deck count: {decks}")
+        if max_hands < 2:
+            raise ValueError(f"Invalid hand limit: {max_hands}")
+        if (blackjack_payout * 2) % 1:
+            raise ValueError(f"Invalid blackjack payout: {blackjack_payout}")
+
+        if isinstance(strategy, BlackjackHelper):
+            strategy = CompiledStrategy.from_helper(strategy)
+
+        self.strategy = strategy
+        self.decks = decks
+        self.dealer_hits_soft_17 = dealer_hits_soft_17
+        self.blackjack_payout = blackjack_payout
+        self.blackjack_half_units = int(blackjack_payout * 2)
+        self.max_hands = max_hands
+
+    def simulate(self, rounds: int, seed=None, batch_size: int = 200_000) -> SimulationResult:
+        """Simulate rounds and return their summary statistics."""
+        rng = np.random.default_rng(seed)
+        result = SimulationResult()
+        palette = self.strategy.palette
+        action_codes = np.zeros(len(palette), dtype=np.int64)
+
+        while rounds > 0:
+            batch_rounds = min(rounds, batch_size)
+            half_unit_results = self._simulate_batch(batch_rounds, rng, action_codes)
+            result.add_rounds(half_unit_results)
+            rounds -= batch_rounds
+
+        for code, count in enumerate(action_codes.tolist()):
+            result.add_actions(palette[code], count)
+        return result
+
+    def _lookup_moves(self, hands: "_Hands", rows, slot: int, upcards):
+        """Return the chart move and palette code of the hand in slot of each listed round."""
+        hand_classes, totals = hands.chart_cells(rows, slot)
+        tables = np.where(hands.card_counts[rows, slot] > 2, LATER_DECISION_TABLE,
+                          np.where(hands.split[rows, slot],
+                                   np.where(hands.hand_counts[rows] < self.max_hands,
+                                            SPLIT_HAND_TABLE, LAST_SPLIT_HAND_TABLE),
+                                   FIRST_DECISION_TABLE))
+        strategy = self.strategy
+        totals = np.minimum(totals, strategy.table_width - 1)
+
+        cells = ((upcards - 1) * HAND_CLASSES + hand_classes) * strategy.table_width + totals
+        codes = strategy.table_codes[tables * strategy.table_size + cells]
+        return strategy.code_moves[codes], codes
+
+    def _simulate_batch(self, rounds: int, rng: np.random.Generator,
+                        action_codes: np.ndarray) -> np.ndarray:
+        """Play rounds side by side from fresh shoes and return their results in half bet units."""
+        return self.play_rounds(Shoe(rounds, self.decks, rng), action_codes)
+
+    def play_rounds(self, shoe: Shoe, action_codes: np.ndarray) -> np.ndarray:
+        """Play one round from every row of shoe and return the results in half bet units.
+
+        Decisions are counted into action_codes by palette code.
+        """
+        all_rounds = np.arange(len(shoe))
+        first_cards, upcards, second_cards, hole_cards = (shoe.draw(all_rounds)
+                                                          for _ in range(4))
+        results, playing = self._settle_naturals(first_cards, second_cards, upcards,
+                                                 hole_cards)
+
+        hands = _Hands(len(shoe), self.max_hands)
+        hands.start(0, all_rounds[playing], first_cards[playing], second_cards[playing])
+        for slot in range(self.max_hands):
+            action_codes += self._play_slot(hands, slot, upcards, shoe)
+
+        dealer_totals = self._play_dealer(
+            upcards, hole_cards, hands.needs_dealer(playing), shoe)
+        results += hands.settle(dealer_totals, playing)
+        return results
+
+    def _settle_naturals(self, first_cards, second_cards, upcards, hole_cards):
+        """Return round results in half bet units after naturals, and the rounds still playing."""
+        player_naturals = (first_cards + second_cards == 11) & (
+            (first_cards == 1) | (second_cards == 1))
+        dealer_naturals = (upcards + hole_cards == 11) & ((upcards == 1) | (hole_cards == 1))
+
+        results = np.zeros(len(first_cards), dtype=np.int64)
+        results[player_naturals] = self.blackjack_half_units
+        results[dealer_naturals] = -2
+        results[dealer_naturals & player_naturals] = 0
+        return results, ~(player_naturals | dealer_naturals)
+
+    def _play_slot(self, hands: "_Hands", slot: int, upcards, shoe: Shoe) -> np.ndarray:
+        """Play every live hand in one hand slot to completion and count its decisions."""
+        action_codes = np.zeros(len(self.strategy.palette), dtype=np.int64)
+        rows = np.flatnonzero(hands.live[:, slot])
+        if len(rows) == 0:
+            return action_codes
+
+        needs_card = hands.card_counts[rows, slot] < 2
+        hands.add_cards(rows[needs_card], slot, shoe.draw(rows[needs_card]))
+        split_aces = hands.split[rows, slot] & (hands.first_ranks[rows, slot] == 1)
+        hands.live[rows[split_aces], slot] = False
+
+        while len(rows := np.flatnonzero(hands.live[:, slot])):
+            moves, codes = self._lookup_moves(hands, rows, slot, upcards[rows])
+            action_codes += np.bincount(codes, minlength=len(action_codes))
+            hands.play_moves(rows, slot, moves, shoe)
+        return action_codes
+
+    def _play_dealer(self, upcards, hole_cards, rows, shoe) -> np.ndarray:
+        """Draw dealer cards for the listed rounds and return final dealer totals."""
+        totals = upcards + hole_cards
+        has_ace = (upcards == 1) | (hole_cards == 1)
+
+        while len(rows):
+            soft = has_ace[rows] & (totals[rows] + 10 <= 21)
+            best_totals = np.where(soft, totals[rows] + 10, totals[rows])
+            hitting = (best_totals < 17) | (
+                self.dealer_hits_soft_17 & soft & (best_totals == 17))
+            rows = rows[hitting]
+
+            cards = shoe.draw(rows)
+            totals[rows] += cards
+            has_ace[rows] |= cards == 1
+
+        return np.where(has_ace & (totals + 10 <= 21), totals + 10, totals)
+
+
+class _Hands:
+    """Player hands of many rounds stored as (rounds x hand slots) arrays.
+
+    A surrendered hand keeps its cards but has no bet left in play.
+    """
+
+    def __init__(self, rounds: int, max_hands: int):
+        """Allocate max_hands empty hand slots for every round."""
+        shape = (rounds, max_hands)
+        self.totals = np.zeros(shape, dtype=np.int32)
+        self.has_ace = np.zeros(shape, dtype=bool)
+        self.card_counts = np.zeros(shape, dtype=np.int8)
+        self.first_ranks = np.zeros(shape, dtype=np.int8)
+        self.bets = np.zeros(shape, dtype=np.int8)
+        self.live = np.zeros(shape, dtype=bool)
+        self.split = np.zeros(shape, dtype=bool)
+        self.hand_counts = np.zeros(rounds, dtype=np.int8)
+
+    def start(self, slot, rows, first_cards, second_cards):
+        """Open a hand in slot for the listed rounds with two cards."""
+        self.bets[rows, slot] = 1
+        self.live[rows, slot] = True
+        self.hand_counts[rows] = slot + 1
+        self.add_cards(rows, slot, first_cards)
+        self.add_cards(rows, slot, second_cards)
+
+    def add_cards(self, rows, slot, cards):
+        """Add one card to the hand in slot of each listed round."""
+        self.first_ranks[rows, slot] = np.where(
+            self.card_counts[rows, slot] == 0, cards, self.first_ranks[rows, slot])
+        self.card_counts[rows, slot] += 1
+        self.totals[rows, slot] += cards
+        self.has_ace[rows, slot] |= cards == 1
+        self.live[rows[self.totals[rows, slot] > 21], slot] = False
+
+    def chart_cells(self, rows, slot) -> tuple[np.ndarray, np.ndarray]:
+        """Return the chart hand class and total of the hand in slot of each listed round."""
+        totals = self.totals[rows, slot]
+        pairs = (self.card_counts[rows, slot] == 2) & (totals == 2 * self.first_ranks[rows, slot])
+        soft = self.has_ace[rows, slot] & (totals + 10 <= 21)
+        return (np.select([pairs, soft], [PAIR_HAND, SOFT_HAND], HARD_HAND),
+                np.select([pairs, soft], [totals // 2, totals + 10], totals))
+
+    def play_moves(self, rows, slot, moves, shoe: Shoe):
+        """Apply one chart move to the hand in slot of each listed round."""
+        finished = rows[(moves == MOVE_STAND) | (moves == MOVE_SURRENDER)]
+        self.live[finished, slot] = False
+        self.bets[rows[moves == MOVE_SURRENDER], slot] = 0
+
+        doubling = rows[moves == MOVE_DOUBLE]
+        self.bets[doubling, slot] = 2
+        self.live[doubling, slot] = False
+
+        splitting = rows[moves == MOVE_SPLIT]
+        self.split_hand(splitting, slot)
+
+        hitting = np.concatenate([rows[moves == MOVE_HIT], doubling, splitting])
+        self.add_cards(hitting, slot, shoe.draw(hitting))
+        self.live[splitting[self.first_ranks[splitting, slot] == 1], slot] = False
+
+    def split_hand(self, rows, slot):
+        """Move the second card of each listed pair into a new hand slot."""
+        new_slots = self.hand_counts[rows].astype(np.intp)
+        ranks = self.first_ranks[rows, slot]
+
+        self.totals[rows, new_slots] = ranks
+        self.has_ace[rows, new_slots] = ranks == 1
+        self.card_counts[rows, new_slots] = 1
+        self.first_ranks[rows, new_slots] = ranks
+        self.bets[rows, new_slots] = 1
+        self.live[rows, new_slots] = True
+        self.split[rows, new_slots] = True
+        self.hand_counts[rows] += 1
+
+        self.totals[rows, slot] = ranks
+        self.card_counts[rows, slot] = 1
+        self.split[rows, slot] = True
+
+    def best_totals(self) -> np.ndarray:
+        """Return hand totals counting one ace as eleven where it does not bust."""
+        return np.where(self.has_ace & (self.totals + 10 <= 21), self.totals + 10, self.totals)
+
+    def needs_dealer(self, playing) -> np.ndarray:
+        """Return rounds with at least one hand waiting for the dealer."""
+        standing = (self.bets > 0) & (self.totals <= 21)
+        return np.flatnonzero(playing & standing.any(axis=1))
+
+    def settle(self, dealer_totals, playing) -> np.ndarray:
+        """Return each round's net result in half bet units."""
+        player_totals = self.best_totals()
+        dealer_totals = dealer_totals[:, None]
+
+        outcomes = np.select(
+            [self.totals > 21, dealer_totals > 21, player_totals > dealer_totals,
+             player_totals < dealer_totals],
+            [-1, 1, 1, -1], 0)
+        half_units = outcomes * self.bets * 2
+        half_units[(self.bets == 0) & (self.card_counts > 0)] = -1
+        return np.where(playing, half_units.sum(axis=1), 0)
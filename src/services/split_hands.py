@@ -0,0 +1,103 @@
+from services.hand_state import HandState
+
+DEFAULT_MAX_HANDS = 4
+
+
+class SplitHands:
+    """Player hands of one round, including the hands made by splitting pairs.
+
+    Hands are kept in playing order, and splitting a hand moves its second
+    card into a new hand right after it. Every hand is a HandState, so
+    adding cards only updates running totals. At most max_hands hands are
+    played, split aces receive one card each and are never resplit.
+    """
+
+    def __init__(self, cards=(), max_hands: int = DEFAULT_MAX_HANDS):
+        """Initialize round with one hand of card strings."""
+        if max_hands < 1:
+            raise ValueError(f"Invalid hand limit: {max_hands}")
+
+        self.max_hands = max_hands
+        self.hands = [HandState(cards)]
+        self.split = [False]
+        self.finished = [False]
+
+    def __len__(self):
+        """Return the number of hands."""
+        return len(self.hands)
+
+    def __getitem__(self, index: int) -> HandState:
+        """Return the hand at index."""
+        return self.hands[index]
+
+    @property
+    def is_split(self) -> bool:
+        """Check if a pair has been split this round."""
+        return len(self.hands) > 1
+
+    @property
+    def can_resplit(self) -> bool:
+        """Check if there is room for another hand."""
+        return len(self.hands) < self.max_hands
+
+    def _is_split_ace(self, index: int) -> bool:
+        """Check if a hand was made by splitting aces."""
+        return self.split[index] and self.hands[index].cards[:1] == ["1"]
+
+    def can_split(self, index: int) -> bool:
+        """Check if the hand at index is a pair that may be split."""
+        return (self.can_resplit and not self.finished[index]
+                and self.hands[index].is_pair and not self._is_split_ace(index))
+
+    def split_hand(self, index: int):
+        """Split the pair at index into two hands of one card each."""
+        if not self.can_split(index):
+            raise ValueError(f"Hand {index} cannot be split")
+
+        card = self.hands[index].remove()
+        self.hands.insert(index + 1, HandState([card]))
+        self.split[index] = True
+        self.split.insert(index + 1, True)
+        self.finished.insert(index + 1, False)
+
+    def add_card(self, index: int, card: str):
+        """Add a card to the hand at index, finishing it on a bust or a split ace's second card."""
+        if self.finished[index]:
+            raise ValueError(f"Hand {index} is already finished")
+
+        self.hands[index].add(card)
+        self.finished[index] = self._is_complete(index)
+
+    def replace_card(self, index: int, card_index: int, card: str):
+        """Replace a card of the hand at index, for example to correct a mistyped card.
+
+        The hand is finished afterwards exactly when it busts or completes a
+        split ace, so correcting a card can reopen a busted hand.
+        """
+        self.hands[index].replace(card_index, card)
+        self.finished[index] = self._is_complete(index)
+
+    def _is_complete(self, index: int) -> bool:
+        """Check if the hand at index busted or is a split ace with its one card."""
+        hand = self.hands[index]
+        return hand.hard_total > 21 or (self._is_split_ace(index) and len(hand) == 2)
+
+    def finish(self, index: int):
+        """Mark the hand at index as finished, for example after standing or doubling."""
+        self.finished[index] = True
+
+    def advice_text(self, advice, active_hand: int = 0) -> str:
+        """Return ask_help_split advice as shown to the player.
+
+        Before a split this is the action of the only hand, after it one
+        line per hand with active_hand marked. Finished hands read "Done".
+        """
+        if not self.is_split:
+            return advice[0] or "Done"
+        return "\n".join(
+            f"{'>' if index == active_hand else ' '} Hand {index + 1}: {action or 'Done'}"
+            for index, action in enumerate(advice))
+
+    def live_hands(self) -> list[int]:
+        """Return the indexes of hands that still need a decision."""
+        return [index for index, finished in enumerate(self.finished) if not finished]
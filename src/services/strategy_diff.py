@@ -0,0 +1,167 @@
+import numpy as np
+from services.blackjack_helper import (
+    BlackjackActions, BlackjackHelper, BlackjackRules, get_blackjack_action_name)
+from services.dealer_probabilities import DealerProbabilityCache, full_shoe, remove_card
+from services.simulator import (
+    ACTION_MOVES, MOVE_DOUBLE, MOVE_HIT, MOVE_SPLIT, MOVE_STAND, MOVE_SURRENDER)
+from services.strategy_solver import PAIR_RANKS, SPLIT_WITH_DOUBLE, StrategySolver
+
+MOVES = 5
+
+_expected_value_tables = {}
+
+
+class HandExpectedValues:
+    """Expected values of each first decision for every upcard and two-card hand.
+
+    Row i describes dealer_cards[i] against player_cards[i], which occurs
+    with probability frequencies[i] in a fresh shoe. values[i] holds the
+    expected value of each move indexed by the simulator's MOVE_ constants,
+    with NaN for splitting a hand that is not a pair.
+    """
+
+    def __init__(self, dealer_cards: np.ndarray, player_cards: np.ndarray,
+                 frequencies: np.ndarray, values: np.ndarray):
+        """Initialize table from per-cell arrays."""
+        self.dealer_cards = dealer_cards
+        self.player_cards = player_cards
+        self.frequencies = frequencies
+        self.values = values
+
+    def __len__(self):
+        """Return the number of cells."""
+        return len(self.dealer_cards)
+
+    @staticmethod
+    def solve(decks: int = 1, dealer_hits_soft_17: bool = False,
+              double_after_split: bool = False,
+              dealer_cache: DealerProbabilityCache | None = None):
+        """Compute the table with the strategy solver for a rule set."""
+        solver = StrategySolver(decks, dealer_hits_soft_17, double_after_split,
+                                dealer_cache=dealer_cache)
+        split_key = SPLIT_WITH_DOUBLE if double_after_split else BlackjackActions.SPLIT
+        shoe = full_shoe(decks)
+        cards = sum(shoe)
+        pairs = (cards - 1) * (cards - 2)
+
+        rows = []
+        for upcard in PAIR_RANKS:
+            upcard_frequency = shoe[upcard - 1] / cards
+            for first_rank, second_rank, weight in _two_card_hands(remove_card(shoe, upcard)):
+                rows.append((upcard, first_rank, second_rank,
+                             upcard_frequency * weight / pairs,
+                             _move_values(solver.hand_expected_values(
+                                 upcard, first_rank, second_rank), split_key)))
+
+        return HandExpectedValues(
+            np.array([row[0] for row in rows], dtype=np.int32),
+            np.array([row[1:3] for row in rows], dtype=np.int32),
+            np.array([row[3] for row in rows], dtype=np.float64),
+            np.array([row[4] for row in rows], dtype=np.float64))
+
+
+def _two_card_hands(remaining):
+    """Yield the ranks of every two-card hand that can be drawn from remaining
+    and the number of ordered ways to draw it."""
+    for first_rank in PAIR_RANKS:
+        for second_rank in range(first_rank, 11):
+            if first_rank == second_rank:
+                weight = remaining[first_rank - 1] * (remaining[first_rank - 1] - 1)
+            else:
+                weight = 2 * remaining[first_rank - 1] * remaining[second_rank - 1]
+            if weight > 0:
+                yield first_rank, second_rank, weight
+
+
+def _move_values(expected_values, split_key) -> list:
+    """Return solver expected values indexed by the simulator's MOVE_ constants."""
+    values = [np.nan] * MOVES
+    values[MOVE_HIT] = expected_values[BlackjackActions.HIT]
+    values[MOVE_STAND] = expected_values[BlackjackActions.STAND]
+    values[MOVE_DOUBLE] = expected_values[BlackjackActions.DOUBLE]
+    values[MOVE_SURRENDER] = expected_values[BlackjackActions.SURRENDER]
+    if split_key in expected_values:
+        values[MOVE_SPLIT] = expected_values[split_key]
+    return values
+
+
+def hand_expected_values(decks: int = 1, dealer_hits_soft_17: bool = False,
+                         double_after_split: bool = False,
+                         dealer_cache: DealerProbabilityCache | None = None):
+    """Return the HandExpectedValues of a rule set, solving each rule set once per process."""
+    key = (decks, dealer_hits_soft_17, double_after_split)
+    if key not in _expected_value_tables:
+        _expected_value_tables[key] = HandExpectedValues.solve(
+            decks, dealer_hits_soft_17, double_after_split, dealer_cache)
+    return _expected_value_tables[key]
+
+
+def _action_moves(blackjack_helper: BlackjackHelper, expected_values: HandExpectedValues):
+    """Return the resolved action and its move for every cell of expected_values."""
+    codes = blackjack_helper.ask_help_batch(
+        expected_values.dealer_cards, expected_values.player_cards)
+    palette = blackjack_helper.decision_table.palette
+    code_moves = np.array([ACTION_MOVES.get(action, MOVE_STAND) for action in palette],
+                          dtype=np.intp)
+    return [palette[code] for code in codes.tolist()], code_moves[codes]
+
+
+def diff_strategies(reference_helper: BlackjackHelper, other_helper: BlackjackHelper,
+                    expected_values: HandExpectedValues):
+    """Compare the advice of two helpers on every cell and price the differences.
+
+    ev_loss is how much worse the other helper's action is than the reference
+    helper's in initial bets, negative when it is better, and weighted_ev_loss
+    multiplies it by how often the cell occurs. total_ev_loss is the expected
+    cost per round of playing the other helper's chart, counting the first
+    decision of two-card hands.
+    """
+    reference_actions, reference_moves = _action_moves(reference_helper, expected_values)
+    other_actions, other_moves = _action_moves(other_helper, expected_values)
+
+    cells = np.arange(len(expected_values))
+    reference_values = expected_values.values[cells, reference_moves]
+    other_values = expected_values.values[cells, other_moves]
+    losses = reference_values - other_values
+    weighted_losses = losses * expected_values.frequencies
+
+    different = np.flatnonzero(reference_moves != other_moves)
+    different = different[np.argsort(-weighted_losses[different], kind="stable")]
+    differences = [{
+        "dealer": str(expected_values.dealer_cards[cell]),
+        "cards": [str(card) for card in expected_values.player_cards[cell]],
+        "reference_action": get_blackjack_action_name(reference_actions[cell]),
+        "other_action": get_blackjack_action_name(other_actions[cell]),
+        "reference_ev": float(reference_values[cell]),
+        "other_ev": float(other_values[cell]),
+        "ev_loss": float(losses[cell]),
+        "frequency": float(expected_values.frequencies[cell]),
+        "weighted_ev_loss": float(weighted_losses[cell]),
+    } for cell in different.tolist()]
+
+    return {
+        "cells": len(expected_values),
+        "differences": differences,
+        "total_ev_loss": float(np.nansum(weighted_losses[different])),
+    }
+
+
+def compare_chart_directories(reference_directory: str, other_directory: str,
+                              decks: int = 1, *, dealer_hits_soft_17: bool = False,
+                              rules=None, dealer_cache: DealerProbabilityCache | None = None):
+    """Compare the charts of two directories under one rule set.
+
+    rules holds BlackjackRules values applied to both helpers on top of the
+    default rules, and decks and dealer_hits_soft_17 choose the game the
+    expected values are computed for.
+    """
+    helpers = [BlackjackHelper.from_charts_directory(directory)
+               for directory in (reference_directory, other_directory)]
+    for blackjack_helper in helpers:
+        for rule_name, value in (rules or {}).items():
+            blackjack_helper.set_rule(rule_name, value)
+
+    expected_values = hand_expected_values(
+        decks, dealer_hits_soft_17,
+        helpers[0].get_rule(BlackjackRules.DOUBLE_AFTER_SPLIT_ALLOWED), dealer_cache)
+    return diff_strategies(*helpers, expected_values)
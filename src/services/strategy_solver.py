@@ -0,0 +1,277 @@
+import json
+import os
+from collections import deque
+import numpy as np
+from services.blackjack_helper import BlackjackActions
+from services.dealer_probabilities import (
+    BUST, DEALER_OUTCOMES, DealerProbabilityCache, best_total, full_shoe, remove_card)
+
+HARD_TOTALS = range(4, 22)
+SOFT_TOTALS = range(12, 22)
+PAIR_RANKS = range(1, 11)
+
+SPLIT_WITH_DOUBLE = "split_with_double"
+
+
+def _stand_ev(player_total: int, dealer_outcomes) -> float:
+    """Return the expected value of standing on player_total."""
+    if player_total > 21:
+        return -1.0
+
+    expected_value = dealer_outcomes[BUST]
+    for dealer_total, probability in zip(DEALER_OUTCOMES, dealer_outcomes):
+        if player_total > dealer_total:
+            expected_value += probability
+        elif player_total < dealer_total:
+            expected_value -= probability
+    return expected_value
+
+
+def _player_card_sets():
+    """Return every set of player cards whose stand value the solver needs.
+
+    These are all hands of two or more cards up to 21, plus each such hand
+    together with the other card of a split pair.
+    """
+    pending = deque([()])
+    card_sets = set()
+    while pending:
+        hand = pending.popleft()
+        if len(hand) >= 2:
+            card_sets.add(hand)
+            for rank in set(hand):
+                card_sets.add(tuple(sorted(hand + (rank,))))
+        for rank in range(hand[-1] if hand else 1, 11):
+            if sum(hand) + rank <= 21:
+                pending.append(hand + (rank,))
+    return card_sets
+
+
+class StrategySolver:
+    """Composition-dependent expected value solver for chart generation.
+
+    Expected values are exact for standing, hitting, doubling and surrender
+    given the cards removed from the shoe. Splitting is evaluated as two
+    independent post-split hands without resplitting, and split aces receive
+    one card each. The dealer peeks for blackjack, so all values are
+    conditioned on the dealer not having one.
+    """
+
+    def __init__(self, decks: int = 1, dealer_hits_soft_17: bool = False,
+                 double_after_split: bool = False, surrender: bool = False, *,
+                 dealer_cache: DealerProbabilityCache | None = None):
+        """Initialize solver for the given rules, optionally sharing a dealer cache."""
+        if decks < 1:
+            raise ValueError(f"Invalid deck count: {decks}")
+
+        self.decks = decks
+        self.dealer_hits_soft_17 = dealer_hits_soft_17
+        self.double_after_split = double_after_split
+        self.surrender = surrender
+        if dealer_cache is None:
+            dealer_cache = DealerProbabilityCache(dealer_hits_soft_17)
+        self.dealer_cache = dealer_cache
+        if dealer_cache.hits_soft_17 != dealer_hits_soft_17:
+            raise ValueError("Dealer cache was created for another soft 17 rule")
+        self._hit_cache = {}
+        self._prefetched_upcards = set()
+
+    def dealer_outcomes(self, upcard: int, shoe: tuple):
+        """Return dealer probabilities of 17 to 21 and bust given no dealer blackjack.
+
+        shoe holds the unseen cards, so it must not contain the upcard.
+        """
+        return self.dealer_cache.get(upcard, shoe)
+
+    def _prefetch_dealer_outcomes(self, upcard: int):
+        """Compute dealer outcomes for every shoe the solver can reach in batches."""
+        if upcard in self._prefetched_upcards:
+            return
+        self._prefetched_upcards.add(upcard)
+
+        start_shoe = np.array(remove_card(full_shoe(self.decks), upcard))
+        shoes = []
+        for card_set in _player_card_sets():
+            shoe = start_shoe - np.bincount(card_set, minlength=11)[1:]
+            if shoe.min() >= 0:
+                shoes.append(shoe)
+        self.dealer_cache.prefetch(upcard, shoes)
+
+    def _hit_ev(self, upcard: int, hard_total: int, has_ace: bool, shoe: tuple) -> float:
+        """Return the expected value of hitting and then playing optimally."""
+        key = (upcard, hard_total, has_ace, shoe)
+        expected_value = self._hit_cache.get(key)
+        if expected_value is not None:
+            return expected_value
+
+        remaining = sum(shoe)
+        expected_value = 0.0
+        for rank, count in enumerate(shoe, start=1):
+            if count == 0:
+                continue
+            next_total = hard_total + rank
+            if next_total > 21:
+                expected_value -= count / remaining
+                continue
+            next_ace = has_ace or rank == 1
+            next_shoe = remove_card(shoe, rank)
+            stand = _stand_ev(best_total(next_total, next_ace),
+                              self.dealer_outcomes(upcard, next_shoe))
+            expected_value += count / remaining * max(
+                stand, self._hit_ev(upcard, next_total, next_ace, next_shoe))
+
+        self._hit_cache[key] = expected_value
+        return expected_value
+
+    def _double_ev(self, upcard: int, hard_total: int, has_ace: bool, shoe: tuple) -> float:
+        """Return the expected value of doubling with one more card."""
+        remaining = sum(shoe)
+        expected_value = 0.0
+        for rank, count in enumerate(shoe, start=1):
+            if count == 0:
+                continue
+            next_total = hard_total + rank
+            if next_total > 21:
+                expected_value -= count / remaining
+                continue
+            next_shoe = remove_card(shoe, rank)
+            expected_value += count / remaining * _stand_ev(
+                best_total(next_total, has_ace or rank == 1),
+                self.dealer_outcomes(upcard, next_shoe))
+        return 2 * expected_value
+
+    def _split_ev(self, upcard: int, rank: int, shoe: tuple, double_allowed: bool) -> float:
+        """Return the expected value of splitting a pair into two hands."""
+        remaining = sum(shoe)
+        expected_value = 0.0
+        for second_rank, count in enumerate(shoe, start=1):
+            if count == 0:
+                continue
+            hard_total = rank + second_rank
+            has_ace = rank == 1 or second_rank == 1
+            next_shoe = remove_card(shoe, second_rank)
+            hand_ev = _stand_ev(best_total(hard_total, has_ace),
+                                self.dealer_outcomes(upcard, next_shoe))
+            if rank != 1:
+                hand_ev = max(hand_ev, self._hit_ev(upcard, hard_total, has_ace, next_shoe))
+                if double_allowed:
+                    hand_ev = max(hand_ev, self._double_ev(
+                        upcard, hard_total, has_ace, next_shoe))
+            expected_value += count / remaining * hand_ev
+        return 2 * expected_value
+
+    def hand_expected_values(self, upcard: int, first_rank: int, second_rank: int):
+        """Return the expected value of each action for a two-card starting hand.
+
+        Pairs also get the value of splitting without doubling afterwards under
+        SPLIT and with doubling afterwards under SPLIT_WITH_DOUBLE.
+        """
+        self._prefetch_dealer_outcomes(upcard)
+        shoe = remove_card(remove_card(remove_card(
+            full_shoe(self.decks), upcard), first_rank), second_rank)
+        hard_total = first_rank + second_rank
+        has_ace = first_rank == 1 or second_rank == 1
+
+        expected_values = {
+            BlackjackActions.STAND: _stand_ev(best_total(hard_total, has_ace),
+                                              self.dealer_outcomes(upcard, shoe)),
+            BlackjackActions.HIT: self._hit_ev(upcard, hard_total, has_ace, shoe),
+            BlackjackActions.DOUBLE: self._double_ev(upcard, hard_total, has_ace, shoe),
+            BlackjackActions.SURRENDER: -0.5,
+        }
+        if first_rank == second_rank:
+            expected_values[BlackjackActions.SPLIT] = self._split_ev(
+                upcard, first_rank, shoe, False)
+            expected_values[SPLIT_WITH_DOUBLE] = self._split_ev(
+                upcard, first_rank, shoe, True)
+        return expected_values
+
+    def _starting_hands(self, upcard: int, hand_filter):
+        """Yield (first rank, second rank, weight) for two-card hands matching hand_filter."""
+        shoe = remove_card(full_shoe(self.decks), upcard)
+        for first_rank in PAIR_RANKS:
+            for second_rank in range(first_rank, 11):
+                if not hand_filter(first_rank, second_rank):
+                    continue
+                if first_rank == second_rank:
+                    weight = shoe[first_rank - 1] * (shoe[first_rank - 1] - 1)
+                else:
+                    weight = 2 * shoe[first_rank - 1] * shoe[second_rank - 1]
+                if weight > 0:
+                    yield first_rank, second_rank, weight
+
+    def cell_expected_values(self, upcard: int, hand_filter):
+        """Return action expected values averaged over the hands matching hand_filter."""
+        totals = {}
+        total_weight = 0
+        for first_rank, second_rank, weight in self._starting_hands(upcard, hand_filter):
+            total_weight += weight
+            for action, expected_value in self.hand_expected_values(
+                    upcard, first_rank, second_rank).items():
+                totals[action] = totals.get(action, 0.0) + weight * expected_value
+
+        if not total_weight:
+            return None
+        return {action: value / total_weight for action, value in totals.items()}
+
+    def _chart_action(self, expected_values, pair: bool) -> str:
+        """Encode the best action of a cell with the chart fallback notation."""
+        basic = max(BlackjackActions.HIT, BlackjackActions.STAND, key=expected_values.get)
+        best = basic
+        if expected_values[BlackjackActions.DOUBLE] > expected_values[best]:
+            best = BlackjackActions.DOUBLE
+        if self.surrender and expected_values[BlackjackActions.SURRENDER] > expected_values[best]:
+            best = BlackjackActions.SURRENDER
+
+        action = {
+            BlackjackActions.DOUBLE: {BlackjackActions.HIT: BlackjackActions.DOUBLE_HIT,
+                                      BlackjackActions.STAND: BlackjackActions.DOUBLE_STAND},
+            BlackjackActions.SURRENDER: {BlackjackActions.HIT: BlackjackActions.SURRENDER_HIT,
+                                         BlackjackActions.STAND: BlackjackActions.SURRENDER_STAND},
+        }.get(best, {}).get(basic, best)
+
+        if not pair:
+            return str(action)
+
+        best_ev = expected_values[best]
+        if expected_values[BlackjackActions.SPLIT] > best_ev:
+            return str(BlackjackActions.SPLIT)
+        if self.double_after_split and expected_values[SPLIT_WITH_DOUBLE] > best_ev:
+            return str({BlackjackActions.STAND: BlackjackActions.SPLIT_STAND,
+                        BlackjackActions.DOUBLE: BlackjackActions.SPLIT_DOUBLE}.get(
+                            best, BlackjackActions.SPLIT_HIT))
+        return str(action)
+
+    def _solve_chart(self, totals, hand_filter_for_total, pair: bool):
+        """Return chart data for the given totals."""
+        chart_data = {}
+        for upcard in PAIR_RANKS:
+            row = {}
+            for total in totals:
+                expected_values = self.cell_expected_values(
+                    upcard, hand_filter_for_total(total))
+                if expected_values is not None:
+                    row[str(total)] = self._chart_action(expected_values, pair)
+            chart_data[str(upcard)] = row
+        return chart_data
+
+    def solve_charts(self):
+        """Return normal, soft and split chart data for the solver's rules."""
+        return {
+            "normal": self._solve_chart(
+                HARD_TOTALS, lambda total: lambda a, b: a != 1 and a + b == total
+                and (a != b or total in (4, 20)), False),
+            "soft": self._solve_chart(
+                SOFT_TOTALS, lambda total: lambda a, b: a == 1 and b + 11 == total, False),
+            "split": self._solve_chart(
+                PAIR_RANKS, lambda rank: lambda a, b: a == b == rank, True),
+        }
+
+
+def write_charts(directory: str, charts):
+    """Write chart data as normal.json, soft.json and split.json into directory."""
+    os.makedirs(directory, exist_ok=True)
+    for chart_name, chart_data in charts.items():
+        with open(os.path.join(directory, f"{chart_name}.json"), "w", encoding="utf-8") as f:
+            json.dump(chart_data, f, indent=2)
+            f.write("\n")
@@ -0,0 +1,165 @@
+import numpy as np
+from services.blackjack_helper import BlackjackHelper
+from services.chart_registry import ChartRegistry
+from services.decision_table import CARD_VALUES, classify_hand_totals
+
+NO_CARD = 0
+
+
+# One array per seat field keeps every tick vectorized.
+class TableSessions:  # pylint: disable=too-many-instance-attributes
+    """Headless state of many tables and their seats kept in parallel arrays.
+
+    Table t owns seats t * seats_per_table up to the next table's first seat.
+    A seat stores its hand as running counters, the hard total, whether it
+    holds an ace, the card count and its first two ranks, plus its latest
+    advice code, so it takes a few bytes instead of a card list. Every table
+    plays by one of helpers, chosen by its profile index.
+
+    Dealing and changing a dealer card or profile only mark seats as changed,
+    and tick answers every changed seat with one batched lookup per profile,
+    queuing the answers in decision_log when one is given.
+    """
+
+    def __init__(self, helpers: list[BlackjackHelper], tables: int, seats_per_table: int = 7,
+                 decision_log=None):
+        """Initialize empty tables that all use the first helper."""
+        if not helpers:
+            raise ValueError("Table sessions need at least one helper")
+        if tables < 1 or seats_per_table < 1:
+            raise ValueError(f"Invalid table size: {tables} tables of {seats_per_table} seats")
+
+        self.helpers = list(helpers)
+        self.tables = tables
+        self.seats_per_table = seats_per_table
+        self.decision_log = decision_log
+        seats = tables * seats_per_table
+
+        self.dealer_cards = np.zeros(tables, dtype=np.uint8)
+        self.table_profiles = np.zeros(tables, dtype=np.uint16)
+        self.hard_totals = np.zeros(seats, dtype=np.uint8)
+        self.has_ace = np.zeros(seats, dtype=bool)
+        self.card_counts = np.zeros(seats, dtype=np.uint8)
+        self.first_ranks = np.zeros(seats, dtype=np.uint8)
+        self.second_ranks = np.zeros(seats, dtype=np.uint8)
+        self.advice = np.zeros(seats, dtype=np.uint8)
+        self.changed = np.zeros(seats, dtype=bool)
+
+    @staticmethod
+    def from_profiles(profiles, chart_registry: ChartRegistry, tables: int,
+                      seats_per_table: int = 7, decision_log=None):
+        """Create sessions with one helper per rule profile, in the order given."""
+        helpers = [chart_registry.helper(profile.variant, dict(profile.rules))
+                   for profile in profiles]
+        return TableSessions(helpers, tables, seats_per_table, decision_log)
+
+    @property
+    def seats(self) -> int:
+        """Return the number of seats."""
+        return len(self.hard_totals)
+
+    @property
+    def bytes_per_seat(self) -> float:
+        """Return the array memory per seat, including the per-table arrays."""
+        arrays = (self.dealer_cards, self.table_profiles, self.hard_totals, self.has_ace,
+                  self.card_counts, self.first_ranks, self.second_ranks, self.advice,
+                  self.changed)
+        return sum(array.nbytes for array in arrays) / self.seats
+
+    def table_seats(self, table: int) -> np.ndarray:
+        """Return the seat indexes of a table."""
+        start = table * self.seats_per_table
+        return np.arange(start, start + self.seats_per_table)
+
+    def _mark_occupied(self, table: int):
+        """Mark the seats of a table that hold cards as changed."""
+        seats = self.table_seats(table)
+        self.changed[seats[self.card_counts[seats] > 0]] = True
+
+    def set_profile(self, table: int, profile: int):
+        """Make a table play by the helper at index profile."""
+        if not 0 <= profile < len(self.helpers):
+            raise ValueError(f"Unknown profile: {profile}")
+        self.table_profiles[table] = profile
+        self._mark_occupied(table)
+
+    def set_dealer_card(self, table: int, card: str):
+        """Set the dealer up-card of a table."""
+        if card not in CARD_VALUES:
+            raise ValueError(f"Invalid card: {card}")
+        self.dealer_cards[table] = CARD_VALUES[card]
+        self._mark_occupied(table)
+
+    def deal(self, seats, ranks):
+        """Add one card rank to each listed seat; a seat may appear only once per call."""
+        seats = np.asarray(seats, dtype=np.intp)
+        ranks = np.asarray(ranks)
+        if len(np.unique(seats)) != len(seats):
+            raise ValueError("A seat can only be dealt one card per call")
+        if ((ranks < 1) | (ranks > 10)).any():
+            raise ValueError("Card ranks must be between 1 and 10")
+
+        card_counts = self.card_counts[seats]
+        self.first_ranks[seats] = np.where(card_counts == 0, ranks, self.first_ranks[seats])
+        self.second_ranks[seats] = np.where(card_counts == 1, ranks, self.second_ranks[seats])
+        self.hard_totals[seats] += ranks.astype(np.uint8)
+        self.has_ace[seats] |= ranks == 1
+        self.card_counts[seats] += 1
+        self.changed[seats] = True
+
+    def deal_card(self, seat: int, card: str):
+        """Add one card string to a seat."""
+        if card not in CARD_VALUES:
+            raise ValueError(f"Invalid card: {card}")
+        self.deal([seat], [CARD_VALUES[card]])
+
+    def clear_seats(self, seats):
+        """Empty the hands of the listed seats."""
+        seats = np.asarray(seats, dtype=np.intp)
+        for array in (self.hard_totals, self.has_ace, self.card_counts, self.first_ranks,
+                      self.second_ranks, self.advice):
+            array[seats] = 0
+        self.changed[seats] = False
+
+    def clear_table(self, table: int):
+        """Empty every seat of a table and remove its dealer card."""
+        self.clear_seats(self.table_seats(table))
+        self.dealer_cards[table] = NO_CARD
+
+    def tick(self) -> np.ndarray:
+        """Update the advice of every changed seat and return those seats."""
+        seats = np.flatnonzero(self.changed)
+        if seats.size == 0:
+            return seats
+
+        tables = seats // self.seats_per_table
+        profiles = self.table_profiles[tables]
+        for profile in np.unique(profiles).tolist():
+            rows = profiles == profile
+            profile_seats = seats[rows]
+            hands = classify_hand_totals(
+                self.hard_totals[profile_seats], self.has_ace[profile_seats],
+                self.card_counts[profile_seats], self.first_ranks[profile_seats],
+                self.second_ranks[profile_seats])
+            self.advice[profile_seats] = self.helpers[profile].ask_help_classified(
+                self.dealer_cards[tables[rows]].astype(np.int32), hands)
+
+        if self.decision_log is not None:
+            chart_sets = np.array([helper.decision_table.fingerprint for helper in self.helpers],
+                                  dtype=np.uint32)
+            self.decision_log.record_batch({
+                "table": tables, "chart_set": chart_sets[profiles], "profile": profiles,
+                "dealer": self.dealer_cards[tables], "hard_total": self.hard_totals[seats],
+                "has_ace": self.has_ace[seats], "card_count": self.card_counts[seats],
+                "first_rank": self.first_ranks[seats], "second_rank": self.second_ranks[seats],
+                "action": self.advice[seats]})
+
+        self.changed[seats] = False
+        return seats
+
+    def advice_names(self, seats) -> list[str]:
+        """Return the readable latest advice of the listed seats."""
+        seats = np.asarray(seats, dtype=np.intp)
+        profiles = self.table_profiles[seats // self.seats_per_table].tolist()
+        return [self.helpers[profile].action_names[code]
+                for profile, code in zip(profiles, self.advice[seats].tolist())]
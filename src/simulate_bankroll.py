@@ -0,0 +1,77 @@
+import argparse
+import json
+from services.bankroll import BankrollSimulator, CountRampBet, FlatBet, KellyBet
+from services.card_counting import COUNTING_SYSTEMS
+from services.chart_registry import ChartRegistry
+from services.rule_profiles import PROFILE_DIRECTORY, load_profiles
+from services.simulator import BlackjackSimulator
+
+
+def parse_ramp(ramp: str):
+    """Parse "true count:amount" pairs separated by commas."""
+    return [tuple(map(float, step.split(":"))) for step in ramp.split(",")]
+
+
+def parse_args(profile_names):
+    parser = argparse.ArgumentParser(
+        description="Simulate bankroll sessions and risk of ruin for every rule profile.")
+    parser.add_argument("--profile", action="append", choices=profile_names,
+                        help="rule profile to simulate, every profile by default")
+    parser.add_argument("--sessions", type=int, default=10000)
+    parser.add_argument("--bankroll", type=float, default=1000)
+    parser.add_argument("--hours", type=float, default=20)
+    parser.add_argument("--rounds-per-hour", type=int, default=100)
+    parser.add_argument("--min-bet", type=float, default=10)
+    parser.add_argument("--max-bet", type=float, default=1000)
+    parser.add_argument("--stop-loss", type=float)
+    parser.add_argument("--win-goal", type=float)
+    parser.add_argument("--spread", choices=["flat", "ramp", "kelly"], default="flat")
+    parser.add_argument("--ramp", default="1:20,2:40,3:80",
+                        help="true count:bet pairs for the ramp spread")
+    parser.add_argument("--kelly-fraction", type=float, default=0.5)
+    parser.add_argument("--counting-system", choices=list(COUNTING_SYSTEMS), default="Hi-Lo")
+    parser.add_argument("--penetration", type=float, default=0.75)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--report", help="file to write the full JSON report into")
+    return parser.parse_args()
+
+
+def main():
+    profiles = load_profiles(PROFILE_DIRECTORY)
+    args = parse_args(list(profiles))
+    bet_spread = {
+        "flat": lambda: FlatBet(args.min_bet),
+        "ramp": lambda: CountRampBet(parse_ramp(args.ramp), args.min_bet),
+        "kelly": lambda: KellyBet(args.kelly_fraction),
+    }[args.spread]()
+
+    chart_registry = ChartRegistry("data/charts")
+    report = {}
+    for name in args.profile or profiles:
+        profile = profiles[name]
+        blackjack_helper = chart_registry.helper(profile.variant, dict(profile.rules))
+        simulator = BlackjackSimulator(
+            blackjack_helper, profile.variant.decks,
+            dealer_hits_soft_17=profile.variant.dealer_hits_soft_17)
+        result = BankrollSimulator(
+            simulator, bet_spread, table_limits=(args.min_bet, args.max_bet),
+            penetration=args.penetration,
+            counting_system=COUNTING_SYSTEMS[args.counting_system],
+            rounds_per_hour=args.rounds_per_hour).simulate(
+                args.sessions, args.bankroll, args.hours, stop_loss=args.stop_loss,
+                win_goal=args.win_goal, seed=args.seed)
+        report[name] = result.to_dict()
+
+        hours_to_double = report[name]["hours_to_double"]["p50"]
+        print(f"{name}: risk of ruin {result.risk_of_ruin:.2%}, "
+              f"doubled {report[name]['doubled_rate']:.2%}, median hours to double "
+              f"{'-' if hours_to_double is None else f'{hours_to_double:.1f}'}, "
+              f"median final bankroll {report[name]['curve']['p50'][-1]:.2f}")
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import asyncio
+import json
+import os
+import unittest
+from services.advice_server import AdviceBatcher, AdviceServer, LatencyRecorder
+from services.blackjack_helper import BlackjackHelper
+
+CHARTS_DIRECTORY = os.path.join(
+    os.path.dirname(__file__), "..", "..", "data", "charts", "single_deck", "stand_on_soft_17")
+
+
+class TestLatencyRecorder(unittest.TestCase):
+    def test_percentiles(self):
+        recorder = LatencyRecorder()
+        self.assertEqual(recorder.percentiles_ms(), {"p50_ms": None, "p99_ms": None})
+        for latency in range(1, 101):
+            recorder.record(latency / 1000)
+        percentiles = recorder.percentiles_ms()
+        self.assertAlmostEqual(percentiles["p50_ms"], 50.5)
+        self.assertAlmostEqual(percentiles["p99_ms"], 99.01)
+
+
+class TestAdviceBatcher(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.blackjack_helper = BlackjackHelper.from_charts_directory(CHARTS_DIRECTORY)
+
+    async def test_concurrent_requests_are_batched(self):
+        batcher = AdviceBatcher(self.blackjack_helper, max_batch_size=50, batch_window=0.05)
+        batcher.start()
+        hands = [("6", ["10", "6"]), ("10", ["5", "6"]), ("6", ["8", "8"]), ("X", ["5"])] * 25
+        advice = await asyncio.gather(*(batcher.advise(*hand, 1.0) for hand in hands))
+        await batcher.stop()
+
+        self.assertEqual(advice, [self.blackjack_helper.ask_help(*hand) for hand in hands])
+        metrics = batcher.metrics()
+        self.assertEqual(metrics["requests"], 100)
+        self.assertEqual(metrics["batches"], 2)
+        self.assertEqual(metrics["mean_batch_size"], 50)
+        self.assertIsNotNone(metrics["p99_ms"])
+        self.assertNotIn("helper", metrics)
+
+    async def test_metrics_include_enabled_helper_metrics(self):
+        self.blackjack_helper.enable_metrics()
+        batcher = AdviceBatcher(self.blackjack_helper)
+        batcher.start()
+        await batcher.advise("6", ["10", "6"], 1.0)
+        await batcher.stop()
+        self.assertEqual(batcher.metrics()["helper"]["queries"]["normal"], 1)
+
+    async def test_requests_time_out_without_batches(self):
+        batcher = AdviceBatcher(self.blackjack_helper, max_pending=1)
+        with self.assertRaises(TimeoutError):
+            await batcher.advise("6", ["10", "6"], 0.01)
+        with self.assertRaises(TimeoutError):
+            await batcher.advise("6", ["10", "6"], 0.01)
+        self.assertEqual(batcher.metrics()["timeouts"], 2)
+
+        batcher.start()
+        self.assertEqual(await batcher.advise("6", ["10", "6"], 1.0), "Stand")
+        await batcher.stop()
+
+
+class TestAdviceServer(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        blackjack_helper = BlackjackHelper.from_charts_directory(CHARTS_DIRECTORY)
+        self.server = AdviceServer(blackjack_helper, port=0, batch_window=0.01)
+        port = await self.server.start()
+        self.reader, self.writer = await asyncio.open_connection("127.0.0.1", port)
+
+    async def asyncTearDown(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+        await self.server.close()
+
+    async def _send(self, *requests):
+        for request in requests:
+            line = request if isinstance(request, bytes) else json.dumps(request).encode()
+            self.writer.write(line + b"\n")
+        await self.writer.drain()
+        return [json.loads(await self.reader.readline()) for _ in requests]
+
+    async def test_pipelined_requests_get_answers(self):
+        replies = await self._send(*({"id": index, "dealer": "6", "cards": ["10", "6"]}
+                                     for index in range(20)))
+        self.assertEqual(sorted(reply["id"] for reply in replies), list(range(20)))
+        self.assertTrue(all(reply["action"] == "Stand" for reply in replies))
+
+        metrics = (await self._send({"command": "metrics"}))[0]["metrics"]
+        self.assertEqual(metrics["requests"], 20)
+        self.assertLess(metrics["batches"], 20)
+
+    async def test_invalid_requests_get_errors(self):
+        replies = await self._send(b"not json", {"id": 1, "dealer": 6})
+        self.assertTrue(replies[0]["error"].startswith("Invalid request"))
+        self.assertEqual(replies[1], {
+            "id": 1, "error": "Request needs a dealer card and a list of cards"})
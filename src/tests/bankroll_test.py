@@ -0,0 +1,82 @@
+import os
+import unittest
+import numpy as np
+from services.bankroll import BankrollSimulator, CountRampBet, FlatBet, KellyBet
+from services.blackjack_helper import BlackjackHelper
+from services.card_counting import KO
+from services.simulator import BlackjackSimulator, Shoe
+
+CHARTS_DIRECTORY = os.path.join(
+    os.path.dirname(__file__), "..", "..", "data", "charts", "single_deck", "stand_on_soft_17")
+
+
+class TestBetSpreads(unittest.TestCase):
+    def test_flat_bet(self):
+        np.testing.assert_array_equal(FlatBet(10).bets(np.array([-3.0, 5.0]), np.zeros(2)),
+                                      [10, 10])
+
+    def test_count_ramp_bets_by_true_count(self):
+        spread = CountRampBet([(2, 40), (1, 20)], 10)
+        np.testing.assert_array_equal(
+            spread.bets(np.array([-1.0, 1.0, 1.5, 2.0, 6.0]), np.zeros(5)), [10, 20, 20, 40, 40])
+
+    def test_kelly_bets_fraction_of_bankroll_edge(self):
+        spread = KellyBet(fraction=0.5, base_edge=-0.005, edge_per_true_count=0.005, variance=1)
+        np.testing.assert_allclose(spread.bets(np.array([0.0, 3.0]), np.array([1000.0, 1000.0])),
+                                   [0, 5])
+
+
+class TestBankrollSimulator(unittest.TestCase):
+    def setUp(self):
+        self.simulator = BlackjackSimulator(BlackjackHelper.from_charts_directory(CHARTS_DIRECTORY))
+
+    def test_true_count_follows_dealt_cards(self):
+        bankroll_simulator = BankrollSimulator(self.simulator, FlatBet(10))
+        shoe = Shoe(2, 1, np.random.default_rng(0))
+        shoe.counts[1, 9] -= 13
+        shoe.remaining[1] -= 13
+        np.testing.assert_allclose(bankroll_simulator.true_counts(shoe), [0, -13 * 52 / 39])
+
+        ko_simulator = BankrollSimulator(self.simulator, FlatBet(10), counting_system=KO)
+        np.testing.assert_allclose(ko_simulator.true_counts(shoe), [0, -13])
+
+    def test_same_seed_gives_same_sessions(self):
+        bankroll_simulator = BankrollSimulator(
+            self.simulator, CountRampBet([(1, 20), (3, 50)], 10), rounds_per_hour=50)
+        first = bankroll_simulator.simulate(200, 500, 2, seed=4)
+        second = bankroll_simulator.simulate(200, 500, 2, seed=4)
+        self.assertEqual(first.to_dict(), second.to_dict())
+        self.assertEqual(first.curve.shape, (3, 5))
+        self.assertEqual(first.curve_hours.tolist(), [0, 1, 2])
+        self.assertEqual(first.rounds_played.max(), 100)
+
+    def test_small_bankroll_is_ruined(self):
+        result = BankrollSimulator(self.simulator, FlatBet(10), rounds_per_hour=50).simulate(
+            300, 20, 4, seed=1)
+        self.assertGreater(result.risk_of_ruin, 0.5)
+        self.assertTrue((result.final_bankrolls[result.ruined] < 10).all())
+        self.assertTrue((result.final_bankrolls >= 0).all())
+        self.assertTrue((result.rounds_played[~result.ruined] == 200).all())
+        self.assertLess(result.rounds_played[result.ruined].min(), 200)
+
+    def test_stop_loss_and_win_goal_end_sessions(self):
+        result = BankrollSimulator(self.simulator, FlatBet(10), rounds_per_hour=50).simulate(
+            300, 1000, 10, stop_loss=50, win_goal=50, seed=2)
+        finished = result.stopped | result.reached_goal
+        self.assertGreater(finished.mean(), 0.9)
+        self.assertTrue((result.final_bankrolls[result.stopped] <= 950).all())
+        self.assertTrue((result.final_bankrolls[result.reached_goal] >= 1050).all())
+
+    def test_hours_to_double_only_for_doubled_sessions(self):
+        result = BankrollSimulator(self.simulator, FlatBet(10), rounds_per_hour=50).simulate(
+            300, 40, 4, seed=3)
+        doubled = ~np.isnan(result.hours_to_double)
+        self.assertTrue(doubled.any())
+        self.assertTrue((result.hours_to_double[doubled] <= 4).all())
+        self.assertIsNotNone(result.to_dict()["hours_to_double"]["p50"])
+
+    def test_invalid_settings_raise_error(self):
+        with self.assertRaisesRegex(ValueError, "Invalid penetration"):
+            BankrollSimulator(self.simulator, FlatBet(10), penetration=0)
+        with self.assertRaisesRegex(ValueError, "Invalid table limits"):
+            BankrollSimulator(self.simulator, FlatBet(10), table_limits=(100, 10))
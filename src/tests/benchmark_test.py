@@ -0,0 +1,38 @@
+import os
+import unittest
+from services.benchmark import (
+    HIGHER_IS_BETTER, LOWER_IS_BETTER, compare_to_baseline, run_benchmarks)
+
+CHARTS_ROOT = os.path.join(os.path.dirname(__file__), "..", "..", "data", "charts")
+
+
+def _results(**values):
+    better = {"latency": LOWER_IS_BETTER, "throughput": HIGHER_IS_BETTER}
+    return {"metrics": {name: {"value": value, "unit": "", "better": better[name]}
+                        for name, value in values.items()}}
+
+
+class TestCompareToBaseline(unittest.TestCase):
+    def test_flags_metrics_worse_than_tolerance(self):
+        baseline = _results(latency=10, throughput=100)
+        self.assertEqual(compare_to_baseline(_results(latency=11, throughput=90), baseline), [])
+
+        regressions = compare_to_baseline(_results(latency=13, throughput=70), baseline)
+        self.assertEqual([name for name, *_ in regressions], ["latency", "throughput"])
+        self.assertAlmostEqual(regressions[0][3], 0.3)
+        self.assertAlmostEqual(regressions[1][3], 0.3)
+
+    def test_improvements_and_new_metrics_are_not_regressions(self):
+        baseline = _results(latency=10)
+        self.assertEqual(compare_to_baseline(_results(latency=1, throughput=1), baseline), [])
+
+
+class TestRunBenchmarks(unittest.TestCase):
+    def test_quick_run_reports_every_metric(self):
+        results = run_benchmarks(CHARTS_ROOT, quick=True)
+        self.assertEqual(compare_to_baseline(results, results), [])
+        for name in ["ask_help_p50_us", "batch_hands_per_second", "load_cold_ms",
+                     "load_pack_ms", "chart_set_bytes", "simulation_rounds_per_second",
+                     "threaded_batch_2_threads_hands_per_second"]:
+            self.assertGreater(results["metrics"][name]["value"], 0, name)
+        self.assertEqual(results["metrics"]["thread_scaling_1_threads"]["value"], 1)
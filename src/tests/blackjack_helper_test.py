@@ -1,7 +1,15 @@
+import threading
+import time
 import unittest
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
+import numpy as np
 from services.chart import Chart
-from services.blackjack_helper import BlackjackHelper, BlackjackActions, BlackjackRules
+from services.decision_table import classify_card_ranks
+from services.blackjack_helper import (
+    BlackjackHelper, BlackjackActions, BlackjackRules, HelperSnapshot,
+    get_blackjack_action_name)
+from services.deviations import StrategyDeviations
+from services.split_hands import SplitHands
 
 
 class TestVerifyBlackjackChart(unittest.TestCase):
@@ -214,3 +222,297 @@ class TestBlackjackHelperRules(unittest.TestCase):
         blackjack_action = self.blackjack_helper._get_correct_action("3", [
                                                                      "3", "3"])
         self.assertEqual(blackjack_action, BlackjackActions.HIT)
+
+
+class TestBlackjackHelperAskHelpBatch(unittest.TestCase):
+    def setUp(self):
+        normal_chart = Chart({
+            "2": {"5": BlackjackActions.DOUBLE_HIT, "12": BlackjackActions.HIT},
+        })
+        soft_chart = Chart({
+            "2": {"14": BlackjackActions.DOUBLE_STAND},
+        })
+        split_chart = Chart({
+            "2": {"8": BlackjackActions.SPLIT_HIT},
+        })
+
+        self.blackjack_helper = BlackjackHelper(
+            normal_chart, soft_chart, split_chart)
+
+    def _action_names(self, codes):
+        palette = self.blackjack_helper.decision_table.palette
+        return [get_blackjack_action_name(palette[code]) for code in codes]
+
+    def test_matches_ask_help_for_card_ranks(self):
+        codes = self.blackjack_helper.ask_help_batch(
+            np.array([2, 2, 2, 2, 2]),
+            np.array([[2, 3, 0], [1, 3, 0], [8, 8, 0], [1, 4, 7], [5, 0, 0]]))
+        self.assertEqual(self._action_names(codes),
+                         ["Double", "Double", "Hit", "Hit", "Hit"])
+
+    def test_matches_ask_help_for_card_counts(self):
+        counts = np.zeros((3, 10), dtype=np.int8)
+        counts[0, [1, 2]] = 1
+        counts[1, [0, 2]] = 1
+        counts[2, 7] = 2
+        codes = self.blackjack_helper.ask_help_batch_counts(
+            np.array([2, 2, 2]), counts)
+        self.assertEqual(self._action_names(codes), ["Double", "Double", "Hit"])
+
+    def test_invalid_cards_return_invalid_code(self):
+        codes = self.blackjack_helper.ask_help_batch(
+            np.array([0, 2]), np.array([[2, 3], [2, 11]]))
+        self.assertEqual(codes.tolist(), [0, 0])
+
+    def test_classified_hands_are_not_modified(self):
+        hands = classify_card_ranks(np.array([[2, 3], [10, 6]]))
+        codes = self.blackjack_helper.ask_help_classified(np.array([0, 2]), hands)
+        self.assertEqual(codes[0], 0)
+        self.assertEqual(hands[3].tolist(), [True, True])
+
+    def test_rules_apply_to_batch(self):
+        self.blackjack_helper.set_rule(BlackjackRules.DOUBLE_ALLOWED, False)
+        codes = self.blackjack_helper.ask_help_batch(
+            np.array([2, 2]), np.array([[2, 3], [1, 3]]))
+        self.assertEqual(self._action_names(codes), ["Hit", "Stand"])
+
+    def test_ask_help_hands_matches_ask_help(self):
+        dealer_cards = ["2", "2", "2", "X", "2", "2"]
+        player_hands = [["2", "3"], ["1", "3"], ["8", "8"], ["2", "3"], ["2", "B"], []]
+        self.assertEqual(
+            self.blackjack_helper.ask_help_hands(dealer_cards, player_hands),
+            [self.blackjack_helper.ask_help(dealer_card, player_cards)
+             for dealer_card, player_cards in zip(dealer_cards, player_hands)])
+
+    def test_action_codes_map_to_actions_and_names(self):
+        for dealer_card, player_cards in [("2", ["2", "3"]), ("2", ["8", "8"]),
+                                          ("X", ["2", "3"]), ("2", ["2"])]:
+            code = self.blackjack_helper._get_correct_action_code(dealer_card, player_cards)
+            self.assertEqual(self.blackjack_helper.decision_table.palette[code],
+                             self.blackjack_helper._get_correct_action(dealer_card, player_cards))
+            self.assertEqual(self.blackjack_helper.action_names[code],
+                             self.blackjack_helper.ask_help(dealer_card, player_cards))
+
+
+class TestBlackjackHelperAskHelpSplit(unittest.TestCase):
+    def setUp(self):
+        self.blackjack_helper = BlackjackHelper(
+            Chart({"6": {"11": BlackjackActions.DOUBLE_HIT, "16": BlackjackActions.STAND}}),
+            Chart({}), Chart({"6": {"8": BlackjackActions.SPLIT}}))
+
+    def _split_eights(self, max_hands=4):
+        split_hands = SplitHands(["8", "8"], max_hands)
+        split_hands.split_hand(0)
+        return split_hands
+
+    def test_unsplit_hand_matches_ask_help(self):
+        self.assertEqual(self.blackjack_helper.ask_help_split("6", SplitHands(["8", "8"])),
+                         ["Split"])
+
+    def test_double_after_split_applies_to_each_hand(self):
+        split_hands = self._split_eights()
+        split_hands.add_card(0, "3")
+        self.assertEqual(self.blackjack_helper.ask_help_split("6", split_hands),
+                         ["Hit", "Hit"])
+        self.assertEqual(self.blackjack_helper.ask_help("6", ["8", "3"]), "Double")
+
+        self.blackjack_helper.set_rule(BlackjackRules.DOUBLE_AFTER_SPLIT_ALLOWED, True)
+        self.assertEqual(self.blackjack_helper.ask_help_split("6", split_hands),
+                         ["Double", "Hit"])
+
+    def test_resplit_only_while_room_for_another_hand(self):
+        split_hands = self._split_eights()
+        split_hands.add_card(0, "8")
+        split_hands.add_card(1, "8")
+        self.assertEqual(self.blackjack_helper.ask_help_split("6", split_hands),
+                         ["Split", "Split"])
+
+        split_hands = self._split_eights(max_hands=2)
+        split_hands.add_card(0, "8")
+        split_hands.finish(1)
+        self.assertEqual(self.blackjack_helper.ask_help_split("6", split_hands),
+                         ["Stand", None])
+
+    def test_split_hands_are_recorded_in_metrics(self):
+        split_hands = self._split_eights()
+        split_hands.add_card(0, "3")
+        self.blackjack_helper.enable_metrics()
+        self.blackjack_helper.ask_help_split("6", split_hands)
+        metrics = self.blackjack_helper.metrics
+        self.assertEqual(metrics.latency.count, 2)
+        self.assertEqual(metrics.queries["normal"], 1)
+
+    def test_split_hands_use_deviations_with_split_rules(self):
+        self.blackjack_helper.deviations = StrategyDeviations([
+            {"chart": "normal", "dealer": "6", "total": "12", "action": "Dh",
+             "min_true_count": 2}])
+        split_hands = self._split_eights()
+        split_hands.add_card(0, "4")
+        self.assertEqual(self.blackjack_helper.ask_help_split("6", split_hands), ["Stand", "Hit"])
+        self.assertEqual(self.blackjack_helper.ask_help_split("6", split_hands, 3),
+                         ["Hit", "Hit"])
+        self.blackjack_helper.set_rule(BlackjackRules.DOUBLE_AFTER_SPLIT_ALLOWED, True)
+        self.assertEqual(self.blackjack_helper.ask_help_split("6", split_hands, 3),
+                         ["Double", "Hit"])
+
+    def test_busted_single_hand_reads_done(self):
+        split_hands = SplitHands(["8", "8"])
+        split_hands.add_card(0, "10")
+        advice = self.blackjack_helper.ask_help_split("6", split_hands)
+        self.assertEqual(advice, [None])
+        self.assertEqual(split_hands.advice_text(advice), "Done")
+
+    def test_invalid_dealer_card_is_unknown(self):
+        self.assertEqual(self.blackjack_helper.ask_help_split("X", self._split_eights()),
+                         ["Unknown", "Unknown"])
+
+
+class TestBlackjackHelperRuleTables(unittest.TestCase):
+    def setUp(self):
+        self.blackjack_helper = BlackjackHelper(
+            Chart({"6": {"11": BlackjackActions.DOUBLE_HIT}}), Chart({}), Chart({}))
+
+    def test_switching_back_reuses_compiled_table(self):
+        first_table = self.blackjack_helper.decision_table
+        self.blackjack_helper.set_rule(BlackjackRules.DOUBLE_ALLOWED, False)
+        self.assertEqual(self.blackjack_helper.ask_help("6", ["8", "3"]), "Hit")
+        self.blackjack_helper.set_rule(BlackjackRules.DOUBLE_ALLOWED, True)
+        self.assertIs(self.blackjack_helper.decision_table, first_table)
+        self.assertEqual(self.blackjack_helper.ask_help("6", ["8", "3"]), "Double")
+
+    def test_precompile_covers_every_rule_combination(self):
+        self.assertEqual(self.blackjack_helper.precompile_rule_tables(), 16)
+
+    def test_set_rules_changes_several_rules(self):
+        self.blackjack_helper.set_rules({BlackjackRules.DOUBLE_ALLOWED: False,
+                                         BlackjackRules.SURRENDER_ALLOWED: True})
+        self.assertFalse(self.blackjack_helper.get_rule(BlackjackRules.DOUBLE_ALLOWED))
+        self.assertTrue(self.blackjack_helper.get_rule(BlackjackRules.SURRENDER_ALLOWED))
+        with self.assertRaisesRegex(ValueError, "Unknown rule: no_hole_card"):
+            self.blackjack_helper.set_rules({"no_hole_card": True})
+
+    def test_changing_charts_drops_compiled_tables(self):
+        self.blackjack_helper.set_rule(BlackjackRules.DOUBLE_ALLOWED, False)
+        self.blackjack_helper.change_charts({
+            "normal": Chart({"6": {"11": BlackjackActions.STAND}}),
+            "soft": Chart({}), "split": Chart({})})
+        self.blackjack_helper.set_rule(BlackjackRules.DOUBLE_ALLOWED, True)
+        self.assertEqual(self.blackjack_helper.ask_help("6", ["8", "3"]), "Stand")
+
+
+class TestBlackjackHelperChartSet(unittest.TestCase):
+    def setUp(self):
+        self.blackjack_helper = BlackjackHelper(
+            Chart({"6": {"11": BlackjackActions.DOUBLE_HIT}}), Chart({}), Chart({}))
+
+    def test_published_chart_set_is_not_modified(self):
+        chart_set = self.blackjack_helper.chart_set
+        first_table = chart_set.decision_table
+        self.blackjack_helper.set_rule(BlackjackRules.DOUBLE_ALLOWED, False)
+        self.blackjack_helper.change_charts({
+            "normal": Chart({"6": {"11": BlackjackActions.STAND}}),
+            "soft": Chart({}), "split": Chart({})})
+        self.assertIs(chart_set.decision_table, first_table)
+        self.assertEqual(self.blackjack_helper._get_correct_action_code("6", ["8", "3"],
+                                                                        chart_set=chart_set),
+                         first_table.code_of(BlackjackActions.DOUBLE))
+
+    def test_generation_counts_chart_changes(self):
+        self.assertEqual(self.blackjack_helper.generation, 0)
+        self.blackjack_helper.set_rule(BlackjackRules.DOUBLE_ALLOWED, False)
+        self.assertEqual(self.blackjack_helper.generation, 0)
+        first_chart_set = self.blackjack_helper.chart_set
+        self.blackjack_helper.change_charts({
+            "normal": Chart({"6": {"11": BlackjackActions.STAND}}),
+            "soft": Chart({}), "split": Chart({})})
+        self.assertEqual(self.blackjack_helper.generation, 1)
+
+        self.blackjack_helper.restore_chart_set(first_chart_set)
+        self.assertEqual(self.blackjack_helper.generation, 2)
+        self.assertEqual(self.blackjack_helper.ask_help("6", ["8", "3"]), "Hit")
+
+    def test_concurrent_reloads_and_rule_changes_are_not_lost(self):
+        charts = [{"normal": Chart({"6": {"11": action}}), "soft": Chart({}), "split": Chart({})}
+                  for action in (BlackjackActions.STAND, BlackjackActions.DOUBLE_HIT)]
+        compile_table = BlackjackHelper._compile_table
+
+        def slow_compile_table(blackjack_helper, rules, chart_set):
+            time.sleep(0.0002)
+            return compile_table(blackjack_helper, rules, chart_set)
+
+        def reload_charts(started, index):
+            started.wait()
+            self.blackjack_helper.change_charts(charts[index % 2])
+
+        def change_rules(started, index):
+            started.wait()
+            self.blackjack_helper.set_rule(BlackjackRules.DOUBLE_ALLOWED, index % 2 == 0)
+
+        with patch.object(BlackjackHelper, "_compile_table", slow_compile_table):
+            for index in range(50):
+                started = threading.Barrier(2)
+                threads = [threading.Thread(target=target, args=(started, index))
+                           for target in (reload_charts, change_rules)]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+
+                self.assertEqual(self.blackjack_helper.generation, index + 1)
+                self.assertIs(self.blackjack_helper.normal_chart, charts[index % 2]["normal"])
+                self.assertIs(self.blackjack_helper.decision_table,
+                              self.blackjack_helper._compile_rule_tables(
+                                  self.blackjack_helper.rules)[0])
+
+
+class TestHelperSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.blackjack_helper = BlackjackHelper(
+            Chart({"6": {"11": BlackjackActions.DOUBLE_HIT}}), Chart({}), Chart({}))
+        self.snapshot = self.blackjack_helper.snapshot()
+
+    def test_snapshot_is_frozen(self):
+        self.assertIsInstance(self.snapshot, HelperSnapshot)
+        with self.assertRaises(AttributeError):
+            self.snapshot.set_rule(BlackjackRules.DOUBLE_ALLOWED, False)
+        with self.assertRaises(AttributeError):
+            self.snapshot.change_charts({"normal": Chart({}), "soft": Chart({}),
+                                         "split": Chart({})})
+        with self.assertRaises(AttributeError):
+            self.snapshot.enable_metrics()
+        with self.assertRaises(TypeError):
+            self.snapshot.rules[BlackjackRules.DOUBLE_ALLOWED] = False
+        self.assertIs(self.snapshot.snapshot(), self.snapshot)
+
+    def test_helper_changes_do_not_reach_snapshot(self):
+        self.blackjack_helper.set_rule(BlackjackRules.DOUBLE_ALLOWED, False)
+        self.blackjack_helper.change_charts({
+            "normal": Chart({"6": {"11": BlackjackActions.STAND}}),
+            "soft": Chart({}), "split": Chart({})})
+        self.assertEqual(self.snapshot.ask_help("6", ["8", "3"]), "Double")
+        self.assertTrue(self.snapshot.get_rule(BlackjackRules.DOUBLE_ALLOWED))
+
+    def test_with_rule_shares_charts_and_tables(self):
+        no_double = self.snapshot.with_rule(BlackjackRules.DOUBLE_ALLOWED, False)
+        self.assertEqual(no_double.ask_help("6", ["8", "3"]), "Hit")
+        self.assertEqual(self.snapshot.ask_help("6", ["8", "3"]), "Double")
+        self.assertIs(no_double.normal_chart, self.snapshot.normal_chart)
+
+        double_again = no_double.with_rules({BlackjackRules.DOUBLE_ALLOWED: True})
+        self.assertIs(double_again.decision_table, self.snapshot.decision_table)
+        with self.assertRaisesRegex(ValueError, "Unknown rule: no_hole_card"):
+            self.snapshot.with_rules({"no_hole_card": True})
+
+    def test_threads_share_one_snapshot(self):
+        answers = []
+
+        def ask():
+            answers.append(self.snapshot.ask_help("6", ["8", "3"]))
+
+        threads = [threading.Thread(target=ask) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        self.blackjack_helper.set_rule(BlackjackRules.DOUBLE_ALLOWED, False)
+        for thread in threads:
+            thread.join()
+        self.assertEqual(answers, ["Double"] * 8)
@@ -0,0 +1,86 @@
+import gzip
+import io
+import json
+import os
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from services.blackjack_helper import BlackjackHelper, BlackjackRules
+from services.bulk_advice import (
+    CSV_FORMAT, JSONL_FORMAT, advise_batch_threaded, advise_stream, advise_stream_parallel,
+    detect_format, open_input, read_chunks)
+
+CHARTS_DIRECTORY = os.path.join(
+    os.path.dirname(__file__), "..", "..", "data", "charts", "single_deck", "stand_on_soft_17")
+
+CSV_HANDS = "dealer,card1,card2\n6,10,6\n10,5,6\n\n6,8,8\nX,1\n"
+CSV_ADVICE = "dealer,card1,card2,action\n6,10,6,Stand\n10,5,6,Double\n6,8,8,Split\nX,1,Unknown\n"
+
+
+class TestBulkAdvice(unittest.TestCase):
+    def setUp(self):
+        self.blackjack_helper = BlackjackHelper.from_charts_directory(CHARTS_DIRECTORY)
+
+    def _advise(self, text, input_format, chunk_size=2):
+        output = io.StringIO()
+        advise_stream(self.blackjack_helper, io.StringIO(text), output, input_format, chunk_size)
+        return output.getvalue()
+
+    def test_detect_format(self):
+        self.assertEqual(detect_format("hands.jsonl.gz"), JSONL_FORMAT)
+        self.assertEqual(detect_format("hands.csv"), CSV_FORMAT)
+        self.assertEqual(detect_format("-"), CSV_FORMAT)
+
+    def test_read_chunks(self):
+        chunks = list(read_chunks(io.StringIO("a\nb\nc\n"), 2))
+        self.assertEqual(chunks, [["a\n", "b\n"], ["c\n"]])
+
+    def test_csv_advice(self):
+        self.assertEqual(self._advise(CSV_HANDS, CSV_FORMAT), CSV_ADVICE)
+
+    def test_jsonl_advice_keeps_fields(self):
+        output = self._advise(
+            '{"id": 7, "dealer": "6", "cards": ["8", "8"]}\n{"dealer": 6}\nnot json\n[1]\n',
+            JSONL_FORMAT)
+        records = [json.loads(line) for line in output.splitlines()]
+        self.assertEqual(records[0], {"id": 7, "dealer": "6", "cards": ["8", "8"],
+                                      "action": "Split"})
+        self.assertEqual(records[1]["dealer"], 6)
+        self.assertIn("error", records[1])
+        self.assertTrue(records[2]["error"].startswith("Invalid hand"))
+        self.assertEqual(records[3]["hand"], [1])
+
+    def test_gzip_input_is_detected(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "hands.csv")
+            with gzip.open(path, "wt", encoding="utf-8") as f:
+                f.write(CSV_HANDS)
+            with open_input(path) as input_stream:
+                self.assertEqual(input_stream.read(), CSV_HANDS)
+
+    def test_parallel_matches_serial(self):
+        rules = {BlackjackRules.SURRENDER_ALLOWED: True}
+        self.blackjack_helper.set_rule(BlackjackRules.SURRENDER_ALLOWED, True)
+        hands = "".join(f"{dealer},{first},{second}\n" for dealer in range(1, 11)
+                        for first in range(1, 11) for second in range(1, 11))
+
+        output = io.StringIO()
+        advise_stream_parallel(CHARTS_DIRECTORY, rules, io.StringIO(hands), output,
+                               CSV_FORMAT, chunk_size=37, workers=2)
+        self.assertEqual(output.getvalue(), self._advise(hands, CSV_FORMAT, 1000))
+
+    def test_threaded_batch_matches_serial(self):
+        generator = np.random.default_rng(3)
+        dealer_cards = generator.integers(0, 12, 1001)
+        player_cards = generator.integers(0, 11, (1001, 3))
+        expected = self.blackjack_helper.ask_help_batch(dealer_cards, player_cards)
+
+        snapshot = self.blackjack_helper.snapshot()
+        np.testing.assert_array_equal(
+            advise_batch_threaded(snapshot, dealer_cards, player_cards, workers=4), expected)
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            np.testing.assert_array_equal(advise_batch_threaded(
+                snapshot, dealer_cards, player_cards, 3, executor), expected)
+        self.assertEqual(len(advise_batch_threaded(snapshot, dealer_cards[:0],
+                                                   player_cards[:0], 2)), 0)
@@ -0,0 +1,46 @@
+import unittest
+from services.card_counting import COUNTING_SYSTEMS, HI_LO, KO, OMEGA_II, CardCounter
+
+
+class TestCountingSystems(unittest.TestCase):
+    def test_balanced_systems_sum_to_zero_over_a_deck(self):
+        for system in (HI_LO, OMEGA_II):
+            counter = CardCounter(system)
+            counter.see_cards([str(rank) for rank in range(1, 10)] * 4 + ["10"] * 16)
+            self.assertEqual(counter.running_count, 0, system.name)
+
+    def test_ko_ends_a_full_shoe_at_plus_four(self):
+        counter = CardCounter(KO, decks=6)
+        self.assertEqual(counter.running_count, -20)
+        counter.see_cards(([str(rank) for rank in range(1, 10)] * 4 + ["10"] * 16) * 6)
+        self.assertEqual(counter.running_count, 4)
+
+    def test_systems_are_registered_by_name(self):
+        self.assertIs(COUNTING_SYSTEMS["Omega II"], OMEGA_II)
+
+
+class TestCardCounter(unittest.TestCase):
+    def test_true_count_divides_by_remaining_decks(self):
+        counter = CardCounter(HI_LO, decks=2)
+        counter.see_cards(["2", "3", "4", "5"] * 13)
+        self.assertEqual(counter.running_count, 52)
+        self.assertEqual(counter.decks_remaining, 1)
+        self.assertEqual(counter.true_count, 52)
+
+    def test_unbalanced_true_count_is_running_count(self):
+        counter = CardCounter(KO, decks=2)
+        counter.see("5")
+        self.assertEqual(counter.true_count, -3)
+
+    def test_reset_starts_a_fresh_shoe(self):
+        counter = CardCounter(OMEGA_II)
+        counter.see_cards(["4", "10", "9"])
+        self.assertEqual((counter.running_count, counter.cards_seen), (-1, 3))
+        counter.reset()
+        self.assertEqual((counter.running_count, counter.cards_seen), (0, 0))
+
+    def test_invalid_input_raises_error(self):
+        with self.assertRaisesRegex(ValueError, "Invalid card: X"):
+            CardCounter().see("X")
+        with self.assertRaisesRegex(ValueError, "Invalid deck count: 0"):
+            CardCounter(decks=0)
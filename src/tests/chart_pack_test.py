@@ -0,0 +1,78 @@
+import os
+import shutil
+import tempfile
+import unittest
+from services.blackjack_helper import BlackjackHelper
+from services.chart import Chart
+from services.chart_pack import (
+    PACK_FILE_NAME, PackedChart, chart_pack_is_current, load_chart_pack, write_chart_pack)
+
+CHARTS_DIRECTORY = os.path.join(
+    os.path.dirname(__file__), "..", "..", "data", "charts", "single_deck", "hit_on_soft_17")
+
+
+class TestChartPack(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        for file in os.listdir(CHARTS_DIRECTORY):
+            shutil.copy(os.path.join(CHARTS_DIRECTORY, file), self.directory)
+        self.pack_path = os.path.join(self.directory, PACK_FILE_NAME)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_packed_charts_match_json_charts(self):
+        json_charts = BlackjackHelper.load_charts_directory(self.directory)
+        BlackjackHelper.pack_charts_directory(self.directory)
+        packed_charts = load_chart_pack(self.pack_path)
+
+        for chart_name, chart in json_charts.items():
+            packed_chart = packed_charts[chart_name]
+            self.assertIsInstance(packed_chart, PackedChart)
+            self.assertEqual(packed_chart.get_chart_data(), chart.get_chart_data())
+            for row in ["0", "1", "10", "11", "x"]:
+                for col in ["0", "2", "12", "17", "21", "40", "x"]:
+                    self.assertEqual(packed_chart(row, col), chart(row, col))
+
+    def test_helper_prefers_current_pack(self):
+        json_helper = BlackjackHelper.from_charts_directory(self.directory)
+        BlackjackHelper.pack_charts_directory(self.directory)
+        charts = BlackjackHelper.load_charts_directory(self.directory)
+        self.assertTrue(all(isinstance(chart, PackedChart) for chart in charts.values()))
+
+        blackjack_helper = BlackjackHelper.from_charts_directory(self.directory)
+        for dealer_card in ["1", "6", "10"]:
+            for player_cards in [["10", "6"], ["1", "7"], ["8", "8"], ["5", "6"]]:
+                self.assertEqual(blackjack_helper.ask_help(dealer_card, player_cards),
+                                 json_helper.ask_help(dealer_card, player_cards))
+
+    def test_edited_json_makes_pack_stale(self):
+        BlackjackHelper.pack_charts_directory(self.directory)
+        normal_path = os.path.join(self.directory, "normal.json")
+        pack_time = os.path.getmtime(self.pack_path)
+        os.utime(normal_path, (pack_time + 1, pack_time + 1))
+
+        self.assertFalse(chart_pack_is_current(self.directory))
+        charts = BlackjackHelper.load_charts_directory(self.directory)
+        self.assertNotIsInstance(charts["normal"], PackedChart)
+
+    def test_corrupt_pack_falls_back_to_json(self):
+        BlackjackHelper.pack_charts_directory(self.directory)
+        with open(self.pack_path, "r+b") as f:
+            f.seek(-1, os.SEEK_END)
+            f.write(b"\xff")
+
+        with self.assertRaisesRegex(ValueError, "checksum mismatch"):
+            load_chart_pack(self.pack_path)
+        charts = BlackjackHelper.load_charts_directory(self.directory)
+        self.assertNotIsInstance(charts["normal"], PackedChart)
+
+    def test_invalid_file_raises_error(self):
+        with open(self.pack_path, "wb") as f:
+            f.write(b"not a chart pack at all")
+        with self.assertRaisesRegex(ValueError, "Invalid chart pack"):
+            load_chart_pack(self.pack_path)
+
+    def test_non_numeric_keys_cannot_be_packed(self):
+        with self.assertRaisesRegex(ValueError, "Cannot pack inner key: A in 1"):
+            write_chart_pack(self.pack_path, {"normal": Chart({"1": {"A": "H"}})})
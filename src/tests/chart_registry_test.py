@@ -0,0 +1,82 @@
+import os
+import shutil
+import tempfile
+import unittest
+from services.blackjack_helper import BlackjackRules
+from services.chart_registry import ChartRegistry, ChartVariant, parse_chart_variant
+
+CHARTS_DIRECTORY = os.path.join(os.path.dirname(__file__), "..", "..", "data", "charts")
+
+
+class TestParseChartVariant(unittest.TestCase):
+    def test_deck_and_soft_17_names(self):
+        self.assertEqual(parse_chart_variant("single_deck/hit_on_soft_17"),
+                         ChartVariant(1, True))
+        self.assertEqual(parse_chart_variant("6_decks/stand_on_soft_17/no_hole_card"),
+                         ChartVariant(6, False, "no_hole_card"))
+
+    def test_incomplete_path_has_no_variant(self):
+        self.assertIsNone(parse_chart_variant("single_deck"))
+        self.assertIsNone(parse_chart_variant("custom/hit_on_soft_17"))
+
+
+class TestChartRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = ChartRegistry(CHARTS_DIRECTORY)
+        self.stand_variant = ChartVariant(1, False)
+        self.hit_variant = ChartVariant(1, True)
+
+    def test_indexes_chart_directories(self):
+        self.assertEqual(self.registry.variants(), [self.stand_variant, self.hit_variant])
+        self.assertTrue(self.registry.directory(self.hit_variant).endswith("hit_on_soft_17"))
+
+    def test_unknown_variant_raises_error(self):
+        with self.assertRaisesRegex(ValueError, "Unknown chart variant"):
+            self.registry.charts(ChartVariant(8, True))
+
+    def test_switching_back_is_a_cache_hit(self):
+        first = self.registry.charts(self.stand_variant)
+        self.registry.charts(self.hit_variant)
+        self.assertIs(self.registry.charts(self.stand_variant), first)
+        self.assertIs(self.registry.charts_directory(
+            self.registry.directory(self.stand_variant)), first)
+
+        stats = self.registry.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["evictions"]), (2, 2, 0))
+        self.assertEqual(len(self.registry), 2)
+
+    def test_memory_cap_evicts_least_recently_used(self):
+        registry = ChartRegistry(CHARTS_DIRECTORY, max_bytes=0)
+        registry.charts(self.stand_variant)
+        registry.charts(self.hit_variant)
+        self.assertEqual(len(registry), 1)
+        self.assertEqual(registry.stats()["evictions"], 1)
+
+        registry.charts(self.stand_variant)
+        self.assertEqual(registry.stats()["misses"], 3)
+
+    def test_invalidate_reloads_chart_set(self):
+        first = self.registry.charts(self.stand_variant)
+        self.registry.invalidate(self.registry.directory(self.stand_variant))
+        self.assertEqual(self.registry.size, 0)
+        self.assertIsNot(self.registry.charts(self.stand_variant), first)
+
+    def test_helpers_share_charts_with_separate_rules(self):
+        first = self.registry.helper(self.hit_variant)
+        second = self.registry.helper(self.hit_variant)
+        first.set_rule(BlackjackRules.SPLIT_ALLOWED, False)
+
+        self.assertIs(first.split_chart, second.split_chart)
+        self.assertEqual(first.ask_help("6", ["8", "8"]), "Stand")
+        self.assertEqual(second.ask_help("6", ["8", "8"]), "Split")
+
+    def test_duplicate_variant_raises_error(self):
+        root = tempfile.mkdtemp()
+        try:
+            source = os.path.join(CHARTS_DIRECTORY, "single_deck", "hit_on_soft_17")
+            shutil.copytree(source, os.path.join(root, "single_deck", "hit_on_soft_17"))
+            shutil.copytree(source, os.path.join(root, "1_deck", "hit_on_soft_17"))
+            with self.assertRaisesRegex(ValueError, "Duplicate chart variant"):
+                ChartRegistry(root)
+        finally:
+            shutil.rmtree(root)
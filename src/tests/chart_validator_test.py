@@ -0,0 +1,130 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from services.chart_validator import (
+    CACHE_FILE_NAME, IMPOSSIBLE_TOTAL, INVALID_ACTION, INVALID_DEALER, MISSING_CELL,
+    MISSING_CHART, NON_PAIR_SPLIT_ROW, REFERENCE_DISAGREEMENT, UNREADABLE_CHART, check_chart,
+    chart_directories, compare_to_reference, validate_library)
+
+CHARTS_DIRECTORY = os.path.join(os.path.dirname(__file__), "..", "..", "data", "charts")
+
+
+def full_chart(totals, action="S"):
+    return {str(dealer): {str(total): action for total in totals} for dealer in range(1, 11)}
+
+
+class TestCheckChart(unittest.TestCase):
+    def test_complete_chart_has_no_issues(self):
+        self.assertEqual(check_chart("soft", full_chart(range(12, 22))), [])
+
+    def test_reports_missing_cells_with_stand_fallback(self):
+        chart_data = full_chart(range(12, 22))
+        del chart_data["6"]["18"]
+        self.assertEqual(check_chart("soft", chart_data), [
+            {"kind": MISSING_CELL, "chart": "soft", "dealer": "6", "total": "18",
+             "fallback": "S"}])
+
+    def test_reports_impossible_cells_and_actions(self):
+        chart_data = full_chart(range(4, 22))
+        chart_data["2"]["22"] = "H"
+        chart_data["3"]["10"] = "X"
+        chart_data["11"] = {"12": "H"}
+        kinds = [(issue["kind"], issue["dealer"], issue["total"])
+                 for issue in check_chart("normal", chart_data)]
+        self.assertEqual(kinds, [(IMPOSSIBLE_TOTAL, "2", "22"), (INVALID_ACTION, "3", "10"),
+                                 (INVALID_DEALER, "11", None)])
+
+    def test_non_string_cells_are_invalid_actions(self):
+        chart_data = full_chart(range(1, 11), "P")
+        chart_data["5"]["5"] = ["P"]
+        chart_data["6"]["6"] = {"action": "P"}
+        kinds = [(issue["kind"], issue["dealer"], issue["total"])
+                 for issue in check_chart("split", chart_data)]
+        self.assertEqual(kinds, [(INVALID_ACTION, "5", "5"), (INVALID_ACTION, "6", "6")])
+
+    def test_split_rows_must_be_pair_ranks(self):
+        chart_data = full_chart(range(1, 11), "P")
+        chart_data["5"]["16"] = "P"
+        self.assertEqual(check_chart("split", chart_data)[0]["kind"], NON_PAIR_SPLIT_ROW)
+
+    def test_non_object_chart_is_unreadable(self):
+        self.assertEqual(check_chart("split", ["P"])[0]["kind"], UNREADABLE_CHART)
+
+
+class TestCompareToReference(unittest.TestCase):
+    def test_reports_disagreements_but_not_missing_cells(self):
+        chart_data = {"2": {"12": "H", "13": "S"}}
+        reference_data = {"2": {"12": "S", "13": "S", "14": "S"}}
+        self.assertEqual(compare_to_reference("normal", chart_data, reference_data), [
+            {"kind": REFERENCE_DISAGREEMENT, "chart": "normal", "dealer": "2", "total": "12",
+             "action": "H", "reference": "S"}])
+
+
+class TestValidateLibrary(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        shutil.copytree(CHARTS_DIRECTORY, self.root, dirs_exist_ok=True)
+        self.stand_directory = os.path.join(self.root, "single_deck", "stand_on_soft_17")
+        self.custom_directory = os.path.join(self.root, "custom")
+        os.makedirs(self.custom_directory)
+        with open(os.path.join(self.custom_directory, "normal.json"),
+                  "w", encoding="utf-8") as f:
+            json.dump(full_chart(range(4, 22)), f)
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_reports_every_directory(self):
+        report = validate_library(self.root, workers=1, reference=False)
+        self.assertEqual([directory_report["directory"]
+                          for directory_report in report["directories"]],
+                         [self.custom_directory,
+                          os.path.join(self.root, "single_deck", "hit_on_soft_17"),
+                          self.stand_directory])
+        custom_report = report["directories"][0]
+        self.assertEqual([issue["kind"] for issue in custom_report["issues"]],
+                         [MISSING_CHART, MISSING_CHART])
+        self.assertIsNone(custom_report["reference"])
+        self.assertGreaterEqual(custom_report["seconds"], 0)
+        self.assertEqual(report["issues"], sum(
+            len(directory_report["issues"]) for directory_report in report["directories"]))
+
+    def test_complete_chart_directories_skip_other_json_files(self):
+        validate_library(self.root, workers=1, reference=False)
+        self.assertTrue(os.path.exists(os.path.join(self.root, CACHE_FILE_NAME)))
+        self.assertEqual(chart_directories(self.root, complete=True),
+                         [os.path.join(self.root, "single_deck", "hit_on_soft_17"),
+                          self.stand_directory])
+
+    def test_unchanged_directories_are_cached(self):
+        first = validate_library(self.root, workers=1, reference=False)
+        self.assertEqual((first["validated"], first["cached"]), (3, 0))
+
+        with open(os.path.join(self.stand_directory, "soft.json"), "a", encoding="utf-8") as f:
+            f.write("\n")
+        second = validate_library(self.root, workers=1, reference=False)
+        self.assertEqual((second["validated"], second["cached"]), (1, 2))
+        self.assertEqual([directory_report["issues"]
+                          for directory_report in second["directories"]],
+                         [directory_report["issues"]
+                          for directory_report in first["directories"]])
+
+        third = validate_library(self.root, workers=1, reference=False,
+                                 double_after_split=False)
+        self.assertEqual(third["validated"], 3)
+
+    def test_process_pool_matches_serial_validation(self):
+        serial = validate_library(self.root, workers=1, reference=False,
+                                  cache_path=os.path.join(self.root, "serial.json"))
+        parallel = validate_library(self.root, workers=2, reference=False,
+                                    cache_path=os.path.join(self.root, "parallel.json"))
+        self.assertEqual([directory_report["issues"]
+                          for directory_report in parallel["directories"]],
+                         [directory_report["issues"]
+                          for directory_report in serial["directories"]])
+
+    def test_invalid_worker_count_raises_error(self):
+        with self.assertRaisesRegex(ValueError, "Invalid worker count"):
+            validate_library(self.root, workers=-1, reference=False)
@@ -0,0 +1,116 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from services.blackjack_helper import BlackjackHelper
+from services.chart_watcher import ChartWatcher, chart_problems
+
+CHARTS_DIRECTORY = os.path.join(
+    os.path.dirname(__file__), "..", "..", "data", "charts", "single_deck", "stand_on_soft_17")
+
+
+class TestChartWatcher(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "charts")
+        shutil.copytree(CHARTS_DIRECTORY, self.path)
+        self.blackjack_helper = BlackjackHelper.from_charts_directory(self.path)
+        self.watcher = ChartWatcher(self.blackjack_helper, self.path, poll_interval=0.01)
+
+    def tearDown(self):
+        self.watcher.stop()
+        self.directory.cleanup()
+
+    def write_normal_cell(self, dealer: str, total: str, action: str):
+        path = os.path.join(self.path, "normal.json")
+        with open(path, "r", encoding="utf-8") as f:
+            chart_data = json.load(f)
+        chart_data[dealer][total] = action
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(chart_data, f)
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    def test_unchanged_directory_is_not_reloaded(self):
+        self.assertFalse(self.watcher.check())
+        self.assertEqual(self.watcher.generation, 0)
+
+    def test_changed_chart_is_published(self):
+        self.assertEqual(self.blackjack_helper.ask_help("10", ["10", "7"]), "Stand")
+        self.write_normal_cell("10", "17", "H")
+        self.assertTrue(self.watcher.check())
+        self.assertEqual((self.watcher.generation, self.watcher.reloads), (1, 1))
+        self.assertEqual(self.blackjack_helper.ask_help("10", ["10", "7"]), "Hit")
+
+    def test_invalid_chart_keeps_current_charts(self):
+        chart_set = self.blackjack_helper.chart_set
+        self.write_normal_cell("10", "17", "Fold")
+        self.assertFalse(self.watcher.check())
+        self.assertIs(self.blackjack_helper.chart_set, chart_set)
+        self.assertEqual(self.watcher.failures, 1)
+        self.assertIn("Fold", self.watcher.last_error)
+
+        with open(os.path.join(self.path, "soft.json"), "w", encoding="utf-8") as f:
+            f.write("{")
+        self.assertFalse(self.watcher.check())
+        self.assertIs(self.blackjack_helper.chart_set, chart_set)
+        self.assertEqual(self.watcher.failures, 2)
+
+    def test_unexpected_errors_are_rejected_and_polling_goes_on(self):
+        errors = [TypeError("unhashable type: 'list'")]
+
+        def validate(charts):
+            if errors:
+                raise errors.pop()
+            return chart_problems(charts)
+
+        self.watcher.stop()
+        self.watcher = ChartWatcher(self.blackjack_helper, self.path, poll_interval=0.01,
+                                    validate=validate)
+        with self.assertLogs("services.chart_watcher", "WARNING") as logs:
+            self.watcher.start()
+            self.write_normal_cell("10", "17", "S")
+            deadline = time.monotonic() + 5
+            while self.watcher.failures == 0 and time.monotonic() < deadline:
+                time.sleep(0.01)
+        self.assertIn("unhashable", logs.output[0])
+        self.assertEqual(self.watcher.generation, 0)
+
+        self.write_normal_cell("10", "17", "H")
+        deadline = time.monotonic() + 5
+        while self.watcher.generation == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.blackjack_helper.ask_help("10", ["10", "7"]), "Hit")
+
+    def test_rollback_restores_previous_charts(self):
+        self.assertFalse(self.watcher.rollback())
+        self.write_normal_cell("10", "17", "H")
+        self.watcher.check()
+        self.assertTrue(self.watcher.rollback())
+        self.assertEqual(self.watcher.generation, 2)
+        self.assertEqual(self.blackjack_helper.ask_help("10", ["10", "7"]), "Stand")
+
+    def test_background_reload_does_not_disturb_readers(self):
+        answers = set()
+        stop = threading.Event()
+
+        def read_advice():
+            while not stop.is_set():
+                answers.add(self.blackjack_helper.ask_help("10", ["10", "7"]))
+
+        reader = threading.Thread(target=read_advice)
+        reader.start()
+        self.watcher.start()
+        self.write_normal_cell("10", "17", "H")
+        deadline = time.monotonic() + 5
+        while self.watcher.generation == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        stop.set()
+        reader.join()
+
+        self.assertEqual(self.watcher.generation, 1)
+        self.assertLessEqual(answers, {"Stand", "Hit"})
+        self.assertEqual(self.blackjack_helper.ask_help("10", ["10", "7"]), "Hit")
@@ -0,0 +1,83 @@
+import os
+import tempfile
+import unittest
+from services.dealer_probabilities import (
+    DealerProbabilityCache, dealer_outcome_probabilities, decode_shoe, encode_shoe, full_shoe)
+
+
+class TestDealerOutcomeProbabilities(unittest.TestCase):
+    def test_probabilities_sum_to_one(self):
+        for upcard in range(1, 11):
+            shoe = list(full_shoe(2))
+            shoe[upcard - 1] -= 1
+            outcomes = dealer_outcome_probabilities(upcard, tuple(shoe), False)
+            self.assertAlmostEqual(sum(outcomes), 1)
+
+    def test_large_shoe_matches_infinite_deck_bust_rate(self):
+        shoe = tuple(count * 1000 for count in full_shoe(1))
+        outcomes = dealer_outcome_probabilities(6, shoe, False)
+        self.assertAlmostEqual(outcomes[-1], 0.4228, places=3)
+
+    def test_hitting_soft_17_changes_outcomes(self):
+        shoe = full_shoe(1)
+        stand = dealer_outcome_probabilities(1, shoe, False)
+        hit = dealer_outcome_probabilities(1, shoe, True)
+        self.assertGreater(hit[-1], stand[-1])
+
+    def test_peek_excludes_dealer_blackjack(self):
+        outcomes = dealer_outcome_probabilities(10, (0,) * 9 + (5,), False)
+        self.assertEqual(outcomes, (0.0, 0.0, 0.0, 1.0, 0.0, 0.0))
+
+
+class TestDealerProbabilityCache(unittest.TestCase):
+    def setUp(self):
+        self.shoe = (4, 4, 4, 4, 3, 4, 4, 4, 4, 16)
+        self.dealer_cache = DealerProbabilityCache(max_entries=2)
+
+    def test_shoe_encoding_round_trips(self):
+        self.assertEqual(decode_shoe(encode_shoe(6, self.shoe)), (6, self.shoe))
+
+    def test_counts_hits_and_misses(self):
+        first = self.dealer_cache.get(5, self.shoe)
+        second = self.dealer_cache.get(5, self.shoe)
+        self.assertEqual(first, second)
+        self.assertEqual(first, dealer_outcome_probabilities(5, self.shoe, False))
+        self.assertEqual(self.dealer_cache.stats()["hits"], 1)
+        self.assertEqual(self.dealer_cache.stats()["misses"], 1)
+
+    def test_evicts_least_recently_used(self):
+        self.dealer_cache.get(5, self.shoe)
+        self.dealer_cache.get(6, self.shoe)
+        self.dealer_cache.get(5, self.shoe)
+        self.dealer_cache.get(7, self.shoe)
+        self.assertEqual(len(self.dealer_cache), 2)
+
+        self.dealer_cache.get(5, self.shoe)
+        self.assertEqual(self.dealer_cache.hits, 2)
+        self.dealer_cache.get(6, self.shoe)
+        self.assertEqual(self.dealer_cache.misses, 4)
+
+    def test_prefetch_fills_cache(self):
+        dealer_cache = DealerProbabilityCache()
+        dealer_cache.prefetch(5, [self.shoe, full_shoe(2)])
+        self.assertEqual(len(dealer_cache), 2)
+        self.assertEqual(dealer_cache.get(5, self.shoe),
+                         dealer_outcome_probabilities(5, self.shoe, False))
+        self.assertEqual(dealer_cache.misses, 0)
+
+    def test_warm_starts_from_saved_table(self):
+        self.dealer_cache.get(5, self.shoe)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "dealer.npz")
+            self.dealer_cache.save(path)
+            warm_cache = DealerProbabilityCache()
+            warm_cache.load(path)
+        self.assertEqual(warm_cache.get(5, self.shoe), self.dealer_cache.get(5, self.shoe))
+        self.assertEqual(warm_cache.misses, 0)
+
+    def test_table_for_other_rule_raises_error(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "dealer.npz")
+            self.dealer_cache.save(path)
+            with self.assertRaisesRegex(ValueError, "another soft 17 rule"):
+                DealerProbabilityCache(hits_soft_17=True).load(path)
@@ -0,0 +1,140 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+import numpy as np
+from services.blackjack_helper import (
+    ACTION_CODES, INVALID_ACTION_CODE, BlackjackActions, BlackjackHelper)
+from services.chart import Chart
+from services.chart_registry import ChartRegistry, ChartVariant
+from services.decision_log import (
+    BLOCK_HEADER, RECORD_BYTES, DecisionLog, log_segments, read_log, rescore_log)
+from services.hand_state import HandState
+from services.split_hands import SplitHands
+from services.table_sessions import TableSessions
+
+CHARTS_DIRECTORY = os.path.join(os.path.dirname(__file__), "..", "..", "data", "charts")
+
+
+class TestDecisionLog(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = self.directory.name
+        self.registry = ChartRegistry(CHARTS_DIRECTORY)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_logged_ask_help_is_replayed(self):
+        blackjack_helper = self.registry.helper(ChartVariant(1, False))
+        with DecisionLog(self.path) as decision_log:
+            blackjack_helper.enable_decision_log(decision_log, table=3, profile=1)
+            advice = blackjack_helper.ask_help("10", ["10", "6"])
+            blackjack_helper.ask_help("6", HandState(["8", "8"]))
+            blackjack_helper.ask_help("5", ["1", "7", "2"])
+            blackjack_helper.disable_decision_log()
+            blackjack_helper.ask_help("5", ["10", "2"])
+
+        self.assertEqual(advice, "Hit")
+        columns = read_log(self.path)
+        self.assertEqual(columns["table"].tolist(), [3, 3, 3])
+        self.assertEqual(columns["profile"].tolist(), [1, 1, 1])
+        self.assertEqual(columns["dealer"].tolist(), [10, 6, 5])
+        self.assertEqual(columns["hard_total"].tolist(), [16, 16, 10])
+        self.assertEqual(columns["has_ace"].tolist(), [0, 0, 1])
+        self.assertEqual(columns["card_count"].tolist(), [2, 2, 3])
+        self.assertEqual(columns["first_rank"].tolist(), [10, 8, 1])
+        self.assertEqual(columns["second_rank"].tolist(), [6, 8, 7])
+        self.assertEqual(columns["action"][0], ACTION_CODES[BlackjackActions.HIT])
+        self.assertEqual(set(columns["chart_set"].tolist()),
+                         {blackjack_helper.decision_table.fingerprint})
+
+    def test_split_hands_are_logged(self):
+        blackjack_helper = self.registry.helper(ChartVariant(1, False))
+        split_hands = SplitHands(["8", "8"])
+        split_hands.split_hand(0)
+        split_hands.add_card(0, "3")
+        split_hands.add_card(1, "10")
+        with DecisionLog(self.path) as decision_log:
+            blackjack_helper.enable_decision_log(decision_log)
+            blackjack_helper.ask_help_split("6", split_hands)
+
+        columns = read_log(self.path)
+        self.assertEqual(columns["hard_total"].tolist(), [11, 18])
+        self.assertEqual(len(set(columns["chart_set"].tolist())), 1)
+
+    def test_invalid_cards_are_logged_invalid(self):
+        blackjack_helper = self.registry.helper(ChartVariant(1, False))
+        with DecisionLog(self.path) as decision_log:
+            blackjack_helper.enable_decision_log(decision_log)
+            blackjack_helper.ask_help("10", ["10", "K"])
+
+        columns = read_log(self.path)
+        self.assertEqual((columns["dealer"][0], columns["action"][0]),
+                         (0, INVALID_ACTION_CODE))
+        self.assertEqual(rescore_log(self.path, blackjack_helper)["changed"], 0)
+
+    def test_segments_rotate(self):
+        with DecisionLog(self.path, segment_records=4) as decision_log:
+            for table in range(10):
+                decision_log.record(table, "10", ["10", "6"], 1)
+        segments = log_segments(self.path)
+        self.assertEqual(len(segments), 3)
+        self.assertEqual(read_log(self.path)["table"].tolist(), list(range(10)))
+
+        with DecisionLog(self.path, segment_records=4) as decision_log:
+            decision_log.record(10, "10", ["10", "6"], 1)
+        self.assertEqual(len(log_segments(self.path)), 4)
+        self.assertEqual(len(read_log(self.path)["table"]), 11)
+
+    def test_interrupted_block_is_ignored(self):
+        with DecisionLog(self.path) as decision_log:
+            decision_log.record(0, "10", ["10", "6"], 1)
+        with open(log_segments(self.path)[0], "ab") as f:
+            f.write(np.array([(0x474C4A42, 5)], dtype=BLOCK_HEADER).tobytes())
+            f.write(bytes(RECORD_BYTES))
+        self.assertEqual(len(read_log(self.path)["table"]), 1)
+
+    def test_flush_writes_queued_decisions(self):
+        with DecisionLog(self.path, flush_interval=60) as decision_log:
+            decision_log.record(0, "10", ["10", "6"], 1)
+            with patch("services.decision_log.os.fsync") as fsync:
+                decision_log.flush()
+            fsync.assert_called_once()
+            self.assertEqual(len(read_log(self.path)["table"]), 1)
+
+    def test_full_queue_drops_decisions(self):
+        decision_log = DecisionLog(self.path, flush_interval=60, max_pending=2)
+        for _ in range(5):
+            decision_log.record(0, "10", ["10", "6"], 1)
+        decision_log.close()
+        self.assertEqual((decision_log.written, decision_log.dropped), (2, 3))
+
+    def test_rescore_counts_changed_advice(self):
+        with DecisionLog(self.path) as decision_log:
+            stand_helper = BlackjackHelper(Chart({"10": {"16": "S"}}), Chart({}), Chart({}))
+            stand_helper.enable_decision_log(decision_log)
+            stand_helper.ask_help("10", ["10", "6"])
+            stand_helper.ask_help("10", ["9", "7"])
+            stand_helper.ask_help("10", ["10", "7"])
+
+        report = rescore_log(
+            self.path, BlackjackHelper(Chart({"10": {"16": "H"}}), Chart({}), Chart({})))
+        self.assertEqual((report["records"], report["changed"]), (3, 2))
+        self.assertEqual(report["changes"], [{"from": "Stand", "to": "Hit", "count": 2}])
+        with self.assertRaises(ValueError):
+            rescore_log(self.path, [])
+
+    def test_table_sessions_log_every_tick(self):
+        with DecisionLog(self.path) as decision_log:
+            sessions = TableSessions([self.registry.helper(ChartVariant(1, False))], 2,
+                                     decision_log=decision_log)
+            sessions.set_dealer_card(1, "6")
+            sessions.deal([7, 8], [8, 9])
+            sessions.deal([7, 8], [8, 2])
+            sessions.tick()
+
+        columns = read_log(self.path)
+        self.assertEqual(columns["table"].tolist(), [1, 1])
+        self.assertEqual(columns["action"].tolist(), sessions.advice[[7, 8]].tolist())
+        self.assertEqual(rescore_log(self.path, sessions.helpers)["changed"], 0)
@@ -0,0 +1,68 @@
+import os
+import unittest
+from services.chart import Chart
+from services.decision_table import DecisionTable, HARD_HAND, SOFT_HAND, PAIR_HAND
+from services.blackjack_helper import BlackjackHelper, BlackjackActions, BlackjackRules
+
+CHARTS_DIRECTORY = os.path.join(
+    os.path.dirname(__file__), "..", "..", "data", "charts", "single_deck")
+
+
+class TestDecisionTable(unittest.TestCase):
+    def setUp(self):
+        self.normal_chart = Chart({
+            "2": {"4": "2-4-NORMAL", "16": "2-16-NORMAL"},
+        }, "NOT_FOUND")
+        self.soft_chart = Chart({
+            "2": {"12": "2-12-SOFT", "18": "2-18-SOFT"},
+        }, "NOT_FOUND")
+        self.split_chart = Chart({
+            "2": {"1": "2-1-SPLIT", "2": "2-2-SPLIT"},
+        }, "NOT_FOUND")
+
+    def _compile(self, split_allowed=True):
+        return DecisionTable(self.normal_chart, self.soft_chart, self.split_chart,
+                             lambda action: action, split_allowed=split_allowed)
+
+    def test_finds_values_from_each_chart(self):
+        table = self._compile()
+        self.assertEqual(table.lookup(2, HARD_HAND, 16), "2-16-NORMAL")
+        self.assertEqual(table.lookup(2, SOFT_HAND, 18), "2-18-SOFT")
+        self.assertEqual(table.lookup(2, PAIR_HAND, 2), "2-2-SPLIT")
+
+    def test_missing_cells_use_fallback(self):
+        table = self._compile()
+        self.assertEqual(table.lookup(3, HARD_HAND, 16), "NOT_FOUND")
+        self.assertEqual(table.lookup(2, HARD_HAND, 30), "NOT_FOUND")
+
+    def test_pairs_use_normal_and_soft_charts_when_split_not_allowed(self):
+        table = self._compile(split_allowed=False)
+        self.assertEqual(table.lookup(2, PAIR_HAND, 2), "2-4-NORMAL")
+        self.assertEqual(table.lookup(2, PAIR_HAND, 1), "2-12-SOFT")
+
+    def test_actions_are_resolved_when_compiled(self):
+        table = DecisionTable(self.normal_chart, self.soft_chart, self.split_chart,
+                              lambda action: action.lower(), split_allowed=True)
+        self.assertEqual(table.lookup(2, HARD_HAND, 4), "2-4-normal")
+
+
+class TestBlackjackHelperDecisionTable(unittest.TestCase):
+    def setUp(self):
+        normal_chart = Chart({"2": {"11": BlackjackActions.DOUBLE_HIT}})
+        soft_chart = Chart({"2": {"13": BlackjackActions.DOUBLE_STAND}})
+        split_chart = Chart({"2": {"8": BlackjackActions.SPLIT}})
+        self.blackjack_helper = BlackjackHelper(
+            normal_chart, soft_chart, split_chart)
+
+    def test_set_rule_rebuilds_table(self):
+        first_table = self.blackjack_helper.decision_table
+        self.blackjack_helper.set_rule(BlackjackRules.DOUBLE_ALLOWED, False)
+        self.assertIsNot(self.blackjack_helper.decision_table, first_table)
+        self.assertEqual(self.blackjack_helper.ask_help("2", ["5", "6"]), "Hit")
+
+    def test_change_charts_directory_rebuilds_table(self):
+        first_table = self.blackjack_helper.decision_table
+        self.blackjack_helper.change_charts_directory(
+            os.path.join(CHARTS_DIRECTORY, "stand_on_soft_17"))
+        self.assertIsNot(self.blackjack_helper.decision_table, first_table)
+        self.assertEqual(self.blackjack_helper.ask_help("6", ["8", "8"]), "Split")
@@ -0,0 +1,73 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from services.blackjack_helper import BlackjackActions, BlackjackHelper, BlackjackRules
+from services.decision_table import HARD_HAND
+from services.deviations import DEVIATIONS_FILE_NAME, StrategyDeviations
+
+CHARTS_DIRECTORY = os.path.join(
+    os.path.dirname(__file__), "..", "..", "data", "charts", "single_deck", "stand_on_soft_17")
+
+DEVIATIONS = [
+    {"chart": "normal", "dealer": "10", "total": "16", "action": "S", "min_true_count": 0},
+    {"chart": "normal", "dealer": "2", "total": "13", "action": "H", "max_true_count": -1},
+    {"chart": "split", "dealer": "6", "total": "10", "action": "P", "min_true_count": 4},
+]
+
+
+class TestStrategyDeviations(unittest.TestCase):
+    def test_action_within_bounds(self):
+        deviations = StrategyDeviations(DEVIATIONS)
+        self.assertEqual(len(deviations), 3)
+        self.assertEqual(deviations.action(10, HARD_HAND, 16, 0), "S")
+        self.assertIsNone(deviations.action(10, HARD_HAND, 16, -0.5))
+        self.assertEqual(deviations.action(2, HARD_HAND, 13, -3), "H")
+        self.assertIsNone(deviations.action(3, HARD_HAND, 13, -3))
+
+    def test_invalid_entries_raise_error(self):
+        with self.assertRaisesRegex(ValueError, "Invalid deviation chart: hard"):
+            StrategyDeviations([{**DEVIATIONS[0], "chart": "hard"}])
+        with self.assertRaisesRegex(ValueError, "Invalid deviation action: E"):
+            StrategyDeviations([{**DEVIATIONS[0], "action": "E"}], BlackjackActions)
+        with self.assertRaisesRegex(ValueError, "needs a true count bound"):
+            StrategyDeviations([{"chart": "soft", "dealer": "2", "total": "18", "action": "S"}])
+        with self.assertRaisesRegex(ValueError, "Invalid deviation"):
+            StrategyDeviations([{"chart": "soft"}])
+
+    def test_non_numeric_true_count_bounds_raise_error(self):
+        with self.assertRaisesRegex(ValueError, "bound at entry 1: '0'"):
+            StrategyDeviations([DEVIATIONS[0], {**DEVIATIONS[1], "max_true_count": "0"}])
+        with self.assertRaisesRegex(ValueError, "bound at entry 0: True"):
+            StrategyDeviations([{**DEVIATIONS[0], "min_true_count": True}])
+
+
+class TestBlackjackHelperDeviations(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        for file in os.listdir(CHARTS_DIRECTORY):
+            shutil.copy(os.path.join(CHARTS_DIRECTORY, file), self.directory)
+        with open(os.path.join(self.directory, DEVIATIONS_FILE_NAME), "w",
+                  encoding="utf-8") as f:
+            json.dump(DEVIATIONS, f)
+        self.blackjack_helper = BlackjackHelper.from_charts_directory(self.directory)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_deviations_apply_only_with_true_count(self):
+        self.assertEqual(self.blackjack_helper.ask_help("10", ["10", "6"]), "Hit")
+        self.assertEqual(self.blackjack_helper.ask_help("10", ["10", "6"], -1), "Hit")
+        self.assertEqual(self.blackjack_helper.ask_help("10", ["10", "6"], 0.5), "Stand")
+        self.assertEqual(self.blackjack_helper.ask_help("2", ["10", "3"], -2), "Hit")
+        self.assertEqual(self.blackjack_helper.ask_help("6", ["10", "10"], 5), "Split")
+
+    def test_pair_deviations_need_split_rule(self):
+        self.blackjack_helper.set_rule(BlackjackRules.SPLIT_ALLOWED, False)
+        self.assertEqual(self.blackjack_helper.ask_help("6", ["10", "10"], 5), "Stand")
+
+    def test_change_charts_directory_replaces_deviations(self):
+        self.blackjack_helper.change_charts_directory(CHARTS_DIRECTORY)
+        self.assertIsNone(self.blackjack_helper.deviations)
+        self.assertEqual(self.blackjack_helper.ask_help("10", ["10", "6"], 3), "Hit")
@@ -0,0 +1,64 @@
+import os
+import random
+import unittest
+from services.blackjack_helper import BlackjackHelper
+from services.decision_table import HARD_HAND, PAIR_HAND
+from services.hand_state import HandState
+
+CHARTS_DIRECTORY = os.path.join(
+    os.path.dirname(__file__), "..", "..", "data", "charts", "single_deck", "stand_on_soft_17")
+
+
+class TestHandState(unittest.TestCase):
+    def test_tracks_total_softness_and_pairs(self):
+        hand = HandState(["1", "6"])
+        self.assertEqual((hand.total, hand.is_soft, hand.is_pair), (17, True, False))
+        hand.add("10")
+        self.assertEqual((hand.total, hand.is_soft), (17, False))
+        hand.remove()
+        hand.replace(1, "1")
+        self.assertEqual(hand.classify(), (PAIR_HAND, 1))
+        self.assertEqual(list(hand), ["1", "1"])
+
+    def test_invalid_cards_have_no_classification(self):
+        hand = HandState(["5", "X"])
+        self.assertFalse(hand.is_valid)
+        self.assertIsNone(hand.classify())
+        hand.replace(1, "6")
+        self.assertEqual(hand.classify(), (HARD_HAND, 11))
+
+    def test_has_no_instance_dict(self):
+        with self.assertRaises(AttributeError):
+            HandState().extra = 1
+
+    def test_matches_full_rescan_after_random_updates(self):
+        generator = random.Random(11)
+        cards = [str(rank) for rank in range(1, 11)] + ["X"]
+        hand = HandState()
+        for _ in range(2000):
+            operation = generator.random()
+            if operation < 0.4 or len(hand) == 0:
+                hand.add(generator.choice(cards))
+            elif operation < 0.6:
+                hand.remove(generator.randrange(len(hand)))
+            else:
+                hand.replace(generator.randrange(len(hand)), generator.choice(cards))
+
+            self.assertEqual(hand.classify(), BlackjackHelper._classify_hand(list(hand)))
+
+
+class TestBlackjackHelperHandState(unittest.TestCase):
+    def setUp(self):
+        self.blackjack_helper = BlackjackHelper.from_charts_directory(CHARTS_DIRECTORY)
+
+    def test_ask_help_matches_card_list(self):
+        hand = HandState(["8"])
+        self.assertEqual(self.blackjack_helper.ask_help("6", hand), "Hit")
+        for card in ["8", "1", "2", "10"]:
+            if len(hand) == 2:
+                hand.replace(1, card)
+            else:
+                hand.add(card)
+            for dealer_card in ["2", "6", "10", "X"]:
+                self.assertEqual(self.blackjack_helper.ask_help(dealer_card, hand),
+                                 self.blackjack_helper.ask_help(dealer_card, list(hand)))
@@ -0,0 +1,92 @@
+import unittest
+import numpy as np
+from services.blackjack_helper import BlackjackActions, BlackjackHelper, BlackjackRules
+from services.chart import Chart
+from services.deviations import StrategyDeviations
+from services.metrics import AdviceMetrics
+
+
+class TestAdviceMetrics(unittest.TestCase):
+    def test_latency_histogram_buckets(self):
+        metrics = AdviceMetrics(latency_buckets=(1e-6, 1e-5))
+        metrics.record_latency(5e-7)
+        metrics.record_latency(5e-6, 2)
+        metrics.record_latency(1)
+        self.assertEqual(metrics.snapshot()["latency"]["buckets"],
+                         {"1e-06": 1, "1e-05": 2, "+Inf": 1})
+        self.assertEqual(metrics.latency.count, 4)
+
+    def test_prometheus_export(self):
+        metrics = AdviceMetrics(latency_buckets=(1e-6,))
+        metrics.record_lookup("soft", 2, 13, fallback=True, rewritten=False)
+        metrics.record_latency(5e-7)
+        metrics.record_latency(1)
+        text = metrics.to_prometheus()
+        self.assertIn('blackjack_helper_queries_total{chart="soft"} 1\n', text)
+        self.assertIn('blackjack_helper_fallbacks_total{chart="soft"} 1\n', text)
+        self.assertIn('blackjack_helper_latency_seconds_bucket{le="1e-06"} 1\n', text)
+        self.assertIn('blackjack_helper_latency_seconds_bucket{le="+Inf"} 2\n', text)
+        self.assertIn("blackjack_helper_latency_seconds_count 2\n", text)
+
+
+class TestBlackjackHelperMetrics(unittest.TestCase):
+    def setUp(self):
+        normal_chart = Chart({"2": {"5": BlackjackActions.DOUBLE_HIT, "12": BlackjackActions.HIT}})
+        soft_chart = Chart({"2": {"14": BlackjackActions.DOUBLE_STAND}})
+        split_chart = Chart({"2": {"8": BlackjackActions.SPLIT_HIT}})
+        self.blackjack_helper = BlackjackHelper(normal_chart, soft_chart, split_chart)
+
+    def test_disabled_helper_records_nothing(self):
+        metrics = self.blackjack_helper.enable_metrics()
+        self.blackjack_helper.ask_help("2", ["2", "3"])
+        self.blackjack_helper.disable_metrics()
+        self.assertIsNone(self.blackjack_helper.metrics)
+        self.assertEqual(self.blackjack_helper.ask_help("2", ["2", "3"]), "Double")
+        self.blackjack_helper.ask_help_batch(np.array([2]), np.array([[2, 3]]))
+        self.assertEqual(metrics.snapshot()["queries"]["normal"], 1)
+
+    def test_records_queries_fallbacks_and_rewrites(self):
+        metrics = self.blackjack_helper.enable_metrics()
+        for dealer_card, player_cards in [("2", ["2", "3"]), ("2", ["1", "3"]),
+                                          ("2", ["8", "8"]), ("3", ["10", "6"]),
+                                          ("3", ["10", "6"]), ("X", ["2", "3"]), ("2", ["5"])]:
+            self.blackjack_helper.ask_help(dealer_card, player_cards)
+
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot["queries"], {"normal": 3, "soft": 1, "split": 1})
+        self.assertEqual(snapshot["fallbacks"], {"normal": 2, "soft": 0, "split": 0})
+        self.assertEqual(snapshot["top_fallback_cells"],
+                         [{"chart": "normal", "dealer": 3, "total": 16, "count": 2}])
+        self.assertEqual(snapshot["rule_rewrites"], 3)
+        self.assertEqual(snapshot["invalid_hands"], 1)
+        self.assertEqual(snapshot["latency"]["count"], 7)
+
+    def test_unsplit_pairs_count_as_normal_chart(self):
+        self.blackjack_helper.set_rule(BlackjackRules.SPLIT_ALLOWED, False)
+        metrics = self.blackjack_helper.enable_metrics()
+        self.blackjack_helper.ask_help("2", ["6", "6"])
+        self.assertEqual(metrics.queries, {"normal": 1, "soft": 0, "split": 0})
+        self.assertEqual(metrics.rule_rewrites, 0)
+
+    def test_deviations_are_counted(self):
+        self.blackjack_helper.deviations = StrategyDeviations([
+            {"chart": "normal", "dealer": "2", "total": "12", "action": "S", "min_true_count": 2}])
+        metrics = self.blackjack_helper.enable_metrics()
+        self.assertEqual(self.blackjack_helper.ask_help("2", ["10", "2"], 3), "Stand")
+        self.assertEqual(metrics.deviations, 1)
+        self.assertEqual(metrics.queries["normal"], 0)
+
+    def test_batch_matches_single_lookups(self):
+        dealer_cards = np.array([2, 2, 2, 3, 3, 0, 2])
+        player_cards = np.array([[2, 3], [1, 3], [8, 8], [10, 6], [10, 6], [2, 3], [5, 0]])
+        batch_metrics = self.blackjack_helper.enable_metrics()
+        self.blackjack_helper.ask_help_batch(dealer_cards, player_cards)
+
+        single_metrics = self.blackjack_helper.enable_metrics(AdviceMetrics())
+        for dealer_card, cards in zip(dealer_cards, player_cards):
+            self.blackjack_helper.ask_help(str(dealer_card), [str(card) for card in cards if card])
+
+        batch_snapshot, single_snapshot = batch_metrics.snapshot(), single_metrics.snapshot()
+        del batch_snapshot["latency"], single_snapshot["latency"]
+        self.assertEqual(batch_snapshot, single_snapshot)
+        self.assertEqual(batch_metrics.latency.count, 7)
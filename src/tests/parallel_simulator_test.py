@@ -0,0 +1,38 @@
+import os
+import unittest
+from services.blackjack_helper import BlackjackHelper
+from services.simulator import BlackjackSimulator
+from services.parallel_simulator import simulate_parallel, split_rounds
+
+CHARTS_DIRECTORY = os.path.join(
+    os.path.dirname(__file__), "..", "..", "data", "charts", "single_deck")
+
+
+class TestSplitRounds(unittest.TestCase):
+    def test_shards_cover_all_rounds(self):
+        self.assertEqual(split_rounds(10, 3), [4, 3, 3])
+        self.assertEqual(split_rounds(2, 4), [1, 1, 0, 0])
+
+
+class TestSimulateParallel(unittest.TestCase):
+    def setUp(self):
+        blackjack_helper = BlackjackHelper.from_charts_directory(
+            os.path.join(CHARTS_DIRECTORY, "hit_on_soft_17"))
+        self.simulator = BlackjackSimulator(blackjack_helper, dealer_hits_soft_17=True)
+
+    def test_same_seed_and_workers_give_identical_results(self):
+        first = simulate_parallel(self.simulator, 9000, seed=11, workers=2)
+        second = simulate_parallel(self.simulator, 9000, seed=11, workers=2)
+        self.assertEqual(first.rounds, 9000)
+        self.assertEqual(first.half_units, second.half_units)
+        self.assertEqual(first.half_units_squared, second.half_units_squared)
+        self.assertEqual(first.action_counts, second.action_counts)
+
+    def test_different_seeds_give_different_results(self):
+        first = simulate_parallel(self.simulator, 9000, seed=1, workers=2)
+        second = simulate_parallel(self.simulator, 9000, seed=2, workers=2)
+        self.assertNotEqual(first.half_units_squared, second.half_units_squared)
+
+    def test_invalid_worker_count_raises_error(self):
+        with self.assertRaisesRegex(ValueError, "Invalid worker count: -1"):
+            simulate_parallel(self.simulator, 10, seed=1, workers=-1)
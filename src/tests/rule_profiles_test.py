@@ -0,0 +1,68 @@
+import json
+import os
+import tempfile
+import unittest
+from services.blackjack_helper import BlackjackRules
+from services.chart_registry import ChartRegistry, ChartVariant
+from services.rule_profiles import RuleProfile, load_profiles
+
+DATA_DIRECTORY = os.path.join(os.path.dirname(__file__), "..", "..", "data")
+CHARTS_DIRECTORY = os.path.join(DATA_DIRECTORY, "charts")
+PROFILE_DIRECTORY = os.path.join(DATA_DIRECTORY, "profiles")
+
+
+class TestRuleProfiles(unittest.TestCase):
+    def setUp(self):
+        self.profiles = load_profiles(PROFILE_DIRECTORY)
+        self.registry = ChartRegistry(CHARTS_DIRECTORY)
+
+    def test_loads_profiles_by_name(self):
+        vegas_strip = self.profiles["Vegas Strip"]
+        self.assertEqual(vegas_strip.variant, ChartVariant(1, False))
+        self.assertTrue(vegas_strip.rules[BlackjackRules.SURRENDER_ALLOWED])
+        self.assertEqual(self.profiles["Downtown"].variant, ChartVariant(1, True))
+
+    def test_apply_switches_charts_and_rules(self):
+        blackjack_helper = self.registry.helper(ChartVariant(1, False))
+        self.profiles["Downtown"].apply(blackjack_helper, self.registry)
+        self.assertIs(blackjack_helper.normal_chart,
+                      self.registry.charts(ChartVariant(1, True))["normal"])
+        self.assertFalse(blackjack_helper.get_rule(BlackjackRules.SURRENDER_ALLOWED))
+
+        self.profiles["Vegas Strip"].apply(blackjack_helper, self.registry)
+        self.assertTrue(blackjack_helper.get_rule(BlackjackRules.SURRENDER_ALLOWED))
+        self.assertEqual(blackjack_helper.ask_help("10", ["10", "6"]), "Surrender")
+
+    def test_other_variant_publishes_charts_and_rules_together(self):
+        blackjack_helper = self.registry.helper(ChartVariant(1, True))
+        self.profiles["Vegas Strip"].apply(blackjack_helper, self.registry)
+        self.assertEqual(blackjack_helper.generation, 1)
+        self.assertEqual(list(blackjack_helper.chart_set.rule_tables),
+                         [blackjack_helper._rules_key(blackjack_helper.rules)])
+        self.assertTrue(blackjack_helper.get_rule(BlackjackRules.SURRENDER_ALLOWED))
+
+    def test_same_variant_keeps_compiled_tables(self):
+        blackjack_helper = self.registry.helper(ChartVariant(1, False))
+        first_table = blackjack_helper.decision_table
+        self.profiles["Vegas Strip"].apply(blackjack_helper, self.registry)
+        RuleProfile("Default", ChartVariant(1, False)).apply(blackjack_helper, self.registry)
+        self.assertIs(blackjack_helper.decision_table, first_table)
+
+    def test_invalid_profiles_raise_error(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "profile.json")
+            for data, message in (({"name": "A", "decks": 1}, "Invalid rule profile"),
+                                  ({"name": "A", "decks": 1, "dealer_hits_soft_17": False,
+                                    "rules": {"no_hole_card": True}}, "Invalid rule")):
+                with open(path, "w", encoding="utf-8") as f:
+                    json.dump(data, f)
+                with self.assertRaisesRegex(ValueError, message):
+                    RuleProfile.from_file(path)
+
+    def test_duplicate_names_raise_error(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for file in ("a.json", "b.json"):
+                with open(os.path.join(directory, file), "w", encoding="utf-8") as f:
+                    json.dump({"name": "Same", "decks": 1, "dealer_hits_soft_17": False}, f)
+            with self.assertRaisesRegex(ValueError, "Duplicate rule profile: Same"):
+                load_profiles(directory)
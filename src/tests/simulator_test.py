@@ -0,0 +1,90 @@
+import os
+import unittest
+import numpy as np
+from services.chart import Chart
+from services.blackjack_helper import BlackjackHelper, BlackjackRules
+from services.simulator import BlackjackSimulator, SimulationResult
+
+CHARTS_DIRECTORY = os.path.join(
+    os.path.dirname(__file__), "..", "..", "data", "charts", "single_deck")
+
+
+class TestSimulationResult(unittest.TestCase):
+    def setUp(self):
+        self.result = SimulationResult()
+        self.result.add_rounds(np.array([2, -2, 3, 0]))
+        self.result.add_actions("S", 3)
+
+    def test_expected_value_and_variance(self):
+        self.assertEqual(self.result.rounds, 4)
+        self.assertAlmostEqual(self.result.expected_value, 0.375)
+        self.assertAlmostEqual(self.result.variance, np.var([1, -1, 1.5, 0], ddof=1))
+
+    def test_merge_matches_single_result(self):
+        other = SimulationResult()
+        other.add_rounds(np.array([-1, -2]))
+        other.add_actions("S", 1)
+        other.add_actions("H", 2)
+
+        merged = self.result.merge(other)
+        combined = SimulationResult()
+        combined.add_rounds(np.array([2, -2, 3, 0, -1, -2]))
+
+        self.assertEqual(merged.expected_value, combined.expected_value)
+        self.assertEqual(merged.variance, combined.variance)
+        self.assertEqual(merged.action_counts, {"S": 4, "H": 2})
+
+    def test_action_frequencies_use_readable_names(self):
+        self.assertEqual(self.result.action_frequencies(), {"Stand": 1.0})
+
+
+class TestBlackjackSimulator(unittest.TestCase):
+    def setUp(self):
+        self.blackjack_helper = BlackjackHelper.from_charts_directory(
+            os.path.join(CHARTS_DIRECTORY, "stand_on_soft_17"))
+
+    def test_same_seed_gives_same_result(self):
+        simulator = BlackjackSimulator(self.blackjack_helper)
+        first = simulator.simulate(20000, seed=7, batch_size=3000)
+        second = simulator.simulate(20000, seed=7, batch_size=3000)
+        self.assertEqual(first.rounds, 20000)
+        self.assertEqual(first.to_dict(), second.to_dict())
+
+    def test_chart_strategy_is_close_to_even(self):
+        result = BlackjackSimulator(self.blackjack_helper).simulate(200000, seed=1)
+        self.assertLess(abs(result.expected_value), 0.02)
+        self.assertGreater(result.variance, 1)
+
+    def test_disallowed_actions_are_never_taken(self):
+        self.blackjack_helper.set_rule(BlackjackRules.DOUBLE_ALLOWED, False)
+        self.blackjack_helper.set_rule(BlackjackRules.SPLIT_ALLOWED, False)
+        result = BlackjackSimulator(self.blackjack_helper).simulate(20000, seed=1)
+        self.assertEqual(set(result.action_frequencies()), {"Hit", "Stand"})
+
+    def test_always_standing_loses_to_dealer(self):
+        stand_chart = Chart({})
+        blackjack_helper = BlackjackHelper(stand_chart, stand_chart, stand_chart)
+        result = BlackjackSimulator(blackjack_helper, decks=6).simulate(50000, seed=3)
+        self.assertEqual(set(result.action_frequencies()), {"Stand"})
+        self.assertLess(result.expected_value, -0.1)
+
+    def test_dealer_hitting_soft_17_changes_results(self):
+        stand = BlackjackSimulator(self.blackjack_helper).simulate(5000, seed=5)
+        hit = BlackjackSimulator(
+            self.blackjack_helper, dealer_hits_soft_17=True).simulate(5000, seed=5)
+        self.assertNotEqual(stand.half_units, hit.half_units)
+
+    def test_resplitting_adds_split_decisions(self):
+        split_chart = Chart({str(dealer): {"8": "P"} for dealer in range(1, 11)})
+        blackjack_helper = BlackjackHelper(Chart({}), Chart({}), split_chart)
+        two_hands = BlackjackSimulator(blackjack_helper, max_hands=2).simulate(50000, seed=2)
+        four_hands = BlackjackSimulator(blackjack_helper, max_hands=4).simulate(50000, seed=2)
+        self.assertGreater(four_hands.action_counts["P"], two_hands.action_counts["P"])
+
+    def test_invalid_hand_limit_raises_error(self):
+        with self.assertRaisesRegex(ValueError, "Invalid hand limit: 1"):
+            BlackjackSimulator(self.blackjack_helper, max_hands=1)
+
+    def test_invalid_deck_count_raises_error(self):
+        with self.assertRaisesRegex(ValueError, "Invalid deck count: 0"):
+            BlackjackSimulator(self.blackjack_helper, decks=0)
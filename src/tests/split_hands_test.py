@@ -0,0 +1,62 @@
+import unittest
+from services.split_hands import SplitHands
+
+
+class TestSplitHands(unittest.TestCase):
+    def setUp(self):
+        self.split_hands = SplitHands(["8", "8"], max_hands=3)
+
+    def test_split_moves_second_card_into_next_hand(self):
+        self.split_hands.split_hand(0)
+        self.assertTrue(self.split_hands.is_split)
+        self.assertEqual([hand.cards for hand in self.split_hands.hands], [["8"], ["8"]])
+        self.assertEqual(self.split_hands.split, [True, True])
+        self.assertEqual(self.split_hands.live_hands(), [0, 1])
+
+    def test_resplits_stop_at_hand_limit(self):
+        self.split_hands.split_hand(0)
+        self.split_hands.add_card(0, "8")
+        self.split_hands.split_hand(0)
+        self.split_hands.add_card(0, "8")
+        self.assertFalse(self.split_hands.can_resplit)
+        self.assertFalse(self.split_hands.can_split(0))
+        with self.assertRaisesRegex(ValueError, "Hand 0 cannot be split"):
+            self.split_hands.split_hand(0)
+        self.assertEqual(self.split_hands[0].total, 16)
+
+    def test_bust_and_finish_end_hands(self):
+        self.split_hands.split_hand(0)
+        self.split_hands.add_card(0, "10")
+        self.split_hands.add_card(0, "5")
+        self.split_hands.finish(1)
+        self.assertEqual(self.split_hands.live_hands(), [])
+        with self.assertRaisesRegex(ValueError, "Hand 0 is already finished"):
+            self.split_hands.add_card(0, "2")
+
+    def test_split_aces_get_one_card_and_no_resplit(self):
+        split_hands = SplitHands(["1", "1"])
+        split_hands.split_hand(0)
+        split_hands.add_card(0, "1")
+        self.assertEqual(split_hands.live_hands(), [1])
+        self.assertFalse(split_hands.can_split(0))
+
+    def test_replacing_cards_updates_finished_hands(self):
+        self.split_hands.add_card(0, "5")
+        self.split_hands.replace_card(0, 2, "10")
+        self.assertEqual(self.split_hands.live_hands(), [])
+        self.split_hands.replace_card(0, 2, "2")
+        self.assertEqual(self.split_hands.live_hands(), [0])
+        self.assertEqual(self.split_hands[0].total, 18)
+
+    def test_advice_text_marks_active_hand_and_finished_hands(self):
+        self.assertEqual(self.split_hands.advice_text(["Split"]), "Split")
+        self.split_hands.split_hand(0)
+        self.assertEqual(self.split_hands.advice_text(["Hit", None], active_hand=1),
+                         "  Hand 1: Hit\n> Hand 2: Done")
+
+    def test_non_pair_cannot_be_split(self):
+        self.assertFalse(SplitHands(["8", "9"]).can_split(0))
+
+    def test_invalid_hand_limit_raises_error(self):
+        with self.assertRaisesRegex(ValueError, "Invalid hand limit: 0"):
+            SplitHands(max_hands=0)
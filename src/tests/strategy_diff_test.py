@@ -0,0 +1,73 @@
+import os
+import unittest
+import numpy as np
+from services.blackjack_helper import BlackjackHelper, BlackjackRules
+from services.chart import Chart
+from services.simulator import MOVE_DOUBLE, MOVE_HIT, MOVE_SPLIT, MOVE_STAND, MOVE_SURRENDER
+from services.strategy_diff import (
+    HandExpectedValues, compare_chart_directories, diff_strategies, hand_expected_values)
+
+CHARTS_DIRECTORY = os.path.join(os.path.dirname(__file__), "..", "..", "data", "charts")
+STAND_DIRECTORY = os.path.join(CHARTS_DIRECTORY, "single_deck", "stand_on_soft_17")
+HIT_DIRECTORY = os.path.join(CHARTS_DIRECTORY, "single_deck", "hit_on_soft_17")
+
+
+def helper_with_hard_action(action: str):
+    return BlackjackHelper(Chart({"10": {"16": action}}), Chart({}), Chart({}))
+
+
+class TestDiffStrategies(unittest.TestCase):
+    def setUp(self):
+        values = np.full((2, 5), np.nan)
+        values[0, [MOVE_HIT, MOVE_STAND, MOVE_DOUBLE, MOVE_SURRENDER]] = [-0.54, -0.5, -1.0, -0.5]
+        values[1, [MOVE_HIT, MOVE_STAND, MOVE_DOUBLE, MOVE_SURRENDER, MOVE_SPLIT]] = \
+            [-0.2, -0.5, -0.6, -0.5, 0.1]
+        self.expected_values = HandExpectedValues(
+            np.array([10, 10]), np.array([[6, 10], [8, 8]]), np.array([0.01, 0.001]), values)
+
+    def test_same_charts_have_no_differences(self):
+        blackjack_helper = helper_with_hard_action("H")
+        report = diff_strategies(blackjack_helper, blackjack_helper, self.expected_values)
+        self.assertEqual((report["cells"], report["differences"], report["total_ev_loss"]),
+                         (2, [], 0.0))
+
+    def test_differences_are_priced_by_frequency(self):
+        report = diff_strategies(helper_with_hard_action("S"), helper_with_hard_action("H"),
+                                 self.expected_values)
+        self.assertEqual(len(report["differences"]), 1)
+        difference = report["differences"][0]
+        self.assertEqual((difference["dealer"], difference["cards"]), ("10", ["6", "10"]))
+        self.assertEqual((difference["reference_action"], difference["other_action"]),
+                         ("Stand", "Hit"))
+        self.assertAlmostEqual(difference["ev_loss"], 0.04)
+        self.assertAlmostEqual(difference["weighted_ev_loss"], 0.0004)
+        self.assertAlmostEqual(report["total_ev_loss"], 0.0004)
+
+    def test_better_other_chart_has_negative_loss(self):
+        report = diff_strategies(helper_with_hard_action("H"), helper_with_hard_action("S"),
+                                 self.expected_values)
+        self.assertAlmostEqual(report["total_ev_loss"], -0.0004)
+
+
+class TestCompareChartDirectories(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.expected_values = hand_expected_values(1, False, True)
+
+    def test_frequencies_cover_every_starting_hand(self):
+        self.assertEqual(len(self.expected_values), 550)
+        self.assertAlmostEqual(self.expected_values.frequencies.sum(), 1.0)
+        self.assertIs(hand_expected_values(1, False, True), self.expected_values)
+
+    def test_charts_differ_and_wrong_chart_costs_money(self):
+        rules = {BlackjackRules.DOUBLE_AFTER_SPLIT_ALLOWED: True,
+                 BlackjackRules.SURRENDER_ALLOWED: True}
+        report = compare_chart_directories(STAND_DIRECTORY, HIT_DIRECTORY, rules=rules)
+        self.assertGreater(len(report["differences"]), 0)
+        self.assertGreater(report["total_ev_loss"], 0)
+        weighted_losses = [difference["weighted_ev_loss"]
+                           for difference in report["differences"]]
+        self.assertEqual(weighted_losses, sorted(weighted_losses, reverse=True))
+
+        same = compare_chart_directories(STAND_DIRECTORY, STAND_DIRECTORY, rules=rules)
+        self.assertEqual(same["differences"], [])
@@ -0,0 +1,58 @@
+import json
+import os
+import tempfile
+import unittest
+from services.blackjack_helper import BlackjackHelper, BlackjackActions
+from services.dealer_probabilities import DealerProbabilityCache
+from services.strategy_solver import StrategySolver, write_charts
+
+CHARTS_DIRECTORY = os.path.join(
+    os.path.dirname(__file__), "..", "..", "data", "charts", "single_deck")
+
+
+class TestStrategySolver(unittest.TestCase):
+    def setUp(self):
+        self.solver = StrategySolver(decks=1)
+
+    def test_hand_expected_values(self):
+        expected_values = self.solver.hand_expected_values(10, 10, 6)
+        self.assertGreater(expected_values[BlackjackActions.HIT],
+                           expected_values[BlackjackActions.STAND])
+        self.assertLess(expected_values[BlackjackActions.STAND], -0.5)
+        self.assertNotIn(BlackjackActions.SPLIT, expected_values)
+
+    def test_uses_shared_dealer_cache(self):
+        dealer_cache = DealerProbabilityCache()
+        StrategySolver(decks=1, dealer_cache=dealer_cache).hand_expected_values(10, 10, 6)
+        self.assertGreater(len(dealer_cache), 0)
+        self.assertGreater(dealer_cache.hits, 0)
+
+    def test_dealer_cache_rule_must_match(self):
+        with self.assertRaisesRegex(ValueError, "another soft 17 rule"):
+            StrategySolver(dealer_hits_soft_17=True, dealer_cache=DealerProbabilityCache())
+
+    def test_invalid_deck_count_raises_error(self):
+        with self.assertRaisesRegex(ValueError, "Invalid deck count: 0"):
+            StrategySolver(decks=0)
+
+    def test_solved_charts_match_authored_charts(self):
+        charts = StrategySolver(decks=1, surrender=True).solve_charts()
+        for chart_name in ("normal", "soft"):
+            with open(os.path.join(CHARTS_DIRECTORY, "stand_on_soft_17", f"{chart_name}.json"),
+                      encoding="utf-8") as f:
+                authored = json.load(f)
+            for dealer_card, row in authored.items():
+                for total, action in row.items():
+                    self.assertEqual(charts[chart_name][dealer_card][total], action)
+
+    def test_written_charts_load_into_helper(self):
+        charts = {
+            "normal": {"10": {"16": "Rh"}},
+            "soft": {"10": {"18": "H"}},
+            "split": {"10": {"8": "P"}},
+        }
+        with tempfile.TemporaryDirectory() as directory:
+            write_charts(directory, charts)
+            blackjack_helper = BlackjackHelper.from_charts_directory(directory)
+        self.assertEqual(blackjack_helper.ask_help("10", ["10", "6"]), "Hit")
+        self.assertEqual(blackjack_helper.ask_help("10", ["8", "8"]), "Split")
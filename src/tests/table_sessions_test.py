@@ -0,0 +1,93 @@
+import os
+import unittest
+import numpy as np
+from services.chart_registry import ChartRegistry
+from services.decision_table import CARD_VALUES
+from services.rule_profiles import load_profiles
+from services.table_sessions import TableSessions
+
+DATA_DIRECTORY = os.path.join(os.path.dirname(__file__), "..", "..", "data")
+CHARTS_DIRECTORY = os.path.join(DATA_DIRECTORY, "charts")
+PROFILE_DIRECTORY = os.path.join(DATA_DIRECTORY, "profiles")
+CARDS = list(CARD_VALUES)
+
+
+class TestTableSessions(unittest.TestCase):
+    def setUp(self):
+        profiles = load_profiles(PROFILE_DIRECTORY)
+        self.profiles = [profiles["Vegas Strip"], profiles["Downtown"]]
+        self.sessions = TableSessions.from_profiles(
+            self.profiles, ChartRegistry(CHARTS_DIRECTORY), tables=50, seats_per_table=7)
+
+    def test_advice_matches_helper(self):
+        rng = np.random.default_rng(7)
+        hands = {}
+        for table in range(self.sessions.tables):
+            self.sessions.set_profile(table, table % 2)
+            self.sessions.set_dealer_card(table, CARDS[rng.integers(len(CARDS))])
+        for _ in range(3):
+            seats = rng.choice(self.sessions.seats, 200, replace=False)
+            ranks = rng.integers(1, 11, len(seats))
+            self.sessions.deal(seats, ranks)
+            for seat, rank in zip(seats.tolist(), ranks.tolist()):
+                hands.setdefault(seat, []).append(str(rank))
+
+        changed = self.sessions.tick()
+        self.assertEqual(sorted(changed.tolist()), sorted(hands))
+        for seat, name in zip(changed.tolist(), self.sessions.advice_names(changed)):
+            table = seat // self.sessions.seats_per_table
+            helper = self.sessions.helpers[table % 2]
+            dealer = str(self.sessions.dealer_cards[table])
+            self.assertEqual(name, helper.ask_help(dealer, hands[seat]))
+
+    def test_only_changed_seats_are_answered(self):
+        self.sessions.set_dealer_card(0, "10")
+        self.sessions.deal_card(0, "10")
+        self.sessions.deal_card(0, "6")
+        self.sessions.deal_card(8, "5")
+        self.assertEqual(self.sessions.tick().tolist(), [0, 8])
+        self.assertEqual(len(self.sessions.tick()), 0)
+
+        self.sessions.set_dealer_card(0, "5")
+        self.assertEqual(self.sessions.tick().tolist(), [0])
+        self.assertEqual(self.sessions.advice_names([0]), ["Stand"])
+
+    def test_profile_change_updates_advice(self):
+        self.sessions.set_dealer_card(0, "10")
+        self.sessions.deal_card(0, "10")
+        self.sessions.deal_card(0, "6")
+        self.sessions.tick()
+        self.assertEqual(self.sessions.advice_names([0]), ["Surrender"])
+
+        self.sessions.set_profile(0, 1)
+        self.assertEqual(self.sessions.tick().tolist(), [0])
+        self.assertNotEqual(self.sessions.advice_names([0]), ["Surrender"])
+
+    def test_pairs_use_first_two_cards(self):
+        self.sessions.set_dealer_card(0, "6")
+        self.sessions.deal([0, 1], [8, 8])
+        self.sessions.deal([0, 1], [8, 3])
+        self.sessions.tick()
+        self.assertEqual(self.sessions.advice_names([0, 1]), ["Split", "Double"])
+
+    def test_clear_table_empties_seats(self):
+        self.sessions.set_dealer_card(1, "9")
+        self.sessions.deal_card(7, "1")
+        self.sessions.clear_table(1)
+        self.assertEqual(len(self.sessions.tick()), 0)
+        self.assertEqual((self.sessions.card_counts[7], self.sessions.dealer_cards[1]), (0, 0))
+
+    def test_seat_state_is_compact(self):
+        self.assertLessEqual(self.sessions.bytes_per_seat, 16)
+
+    def test_invalid_input_raises(self):
+        with self.assertRaises(ValueError):
+            self.sessions.deal([0, 0], [5, 6])
+        with self.assertRaises(ValueError):
+            self.sessions.deal([0], [11])
+        with self.assertRaises(ValueError):
+            self.sessions.set_dealer_card(0, "K")
+        with self.assertRaises(ValueError):
+            self.sessions.set_profile(0, 2)
+        with self.assertRaises(ValueError):
+            TableSessions([], 1)
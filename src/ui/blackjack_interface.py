@@ -1,9 +1,40 @@
 import json
 import math
+import time
 import dearpygui.dearpygui as dpg
 
 from services.blackjack_helper import BLACKJACK_CARDS, BlackjackHelper, BlackjackRules, get_blackjack_action_name
 from services.chart import Chart
+from services.chart_registry import ChartRegistry, ChartVariant
+from services.rule_profiles import PROFILE_DIRECTORY, load_profiles
+from services.split_hands import SplitHands
+from ui.texture_cache import TextureCache
+
+IMAGE_DIRECTORY = "data/images"
+TEXTURE_CACHE_PATH = "data/images/.texture_cache.npz"
+
+
+class CardTextures:
+    """Card textures that are created the first time each card is shown."""
+
+    def __init__(self, texture_cache: TextureCache, texture_registry):
+        """Initialize textures backed by a texture cache and a Dear PyGui texture registry."""
+        self.texture_cache = texture_cache
+        self.texture_registry = texture_registry
+        self._texture_tags = {}
+
+    def get(self, card: str, default=""):
+        """Return the texture tag of a card, creating the texture if needed."""
+        texture_tag = self._texture_tags.get(card)
+        if texture_tag is None:
+            if card not in BLACKJACK_CARDS:
+                return default
+            width, height, pixels = self.texture_cache.image(card)
+            texture_tag = dpg.add_static_texture(
+                width=width, height=height, default_value=pixels,
+                parent=self.texture_registry)
+            self._texture_tags[card] = texture_tag
+        return texture_tag
 
 
 class BlackjackInterface:
@@ -31,24 +62,47 @@ class BlackjackInterface:
         if (len(self.player_cards)-1 < card_index):
             raise IndexError("Invalid card index")
         else:
-            self.player_cards[card_index] = app_data
+            self.split_hands.replace_card(self.active_hand, card_index, app_data)
             dpg.configure_item(self.player_cards_images[card_index], texture_tag=self.card_textures.get(
                 self.player_cards[card_index], ""))
         self._update_help_text()
 
     def _add_player_card(self):
         """Add a new card to player's hand if max limit not reached."""
-        should_add = len(self.player_cards)+1 <= self.max_player_cards
+        should_add = (len(self.player_cards)+1 <= self.max_player_cards
+                      and not self.split_hands.finished[self.active_hand])
         if should_add:
-            self.player_cards.append(self.DEFAULT_CARD)
+            self.split_hands.add_card(self.active_hand, self.DEFAULT_CARD)
             self._update_card_listboxes()
             self._update_help_text()
 
+    @property
+    def player_cards(self):
+        """Return the hand that is being edited."""
+        return self.split_hands[self.active_hand]
+
+    def _split_hand(self):
+        """Split the edited hand if it is a pair and deal it a new default card."""
+        if self.split_hands.can_split(self.active_hand):
+            self.split_hands.split_hand(self.active_hand)
+            self.split_hands.add_card(self.active_hand, self.DEFAULT_CARD)
+            self._update_card_listboxes()
+            self._update_help_text()
+
+    def _next_hand(self):
+        """Move to editing the next split hand."""
+        self.active_hand = (self.active_hand + 1) % len(self.split_hands)
+        self._update_card_listboxes()
+        self._update_help_text()
+
+    def _help_text(self):
+        """Return advice for the only hand, or one line per hand after a split."""
+        advice = self.blackjack_helper.ask_help_split(self.dealer_card, self.split_hands)
+        return self.split_hands.advice_text(advice, self.active_hand)
+
     def _update_help_text(self):
         """Update the displayed helper text based on current cards and rules."""
-        new_text = self.blackjack_helper.ask_help(
-            self.dealer_card, self.player_cards)
-        dpg.set_value(self.help_text_tag, new_text)
+        dpg.set_value(self.help_text_tag, self._help_text())
 
     def _update_card_listboxes(self):
         """Refresh the listboxes and card images shown in the UI."""
@@ -74,7 +128,8 @@ class BlackjackInterface:
     def _reset_game(self):
         """Reset dealer and player cards to default and update UI."""
         self.dealer_card = self.DEFAULT_CARD
-        self.player_cards = [self.DEFAULT_CARD, self.DEFAULT_CARD]
+        self.split_hands = SplitHands([self.DEFAULT_CARD, self.DEFAULT_CARD])
+        self.active_hand = 0
 
         self._update_help_text()
         self._update_card_listboxes()
@@ -104,6 +159,18 @@ class BlackjackInterface:
         self._update_help_text()
         self._update_card_listboxes()
 
+    def _apply_profile(self, _, app_data):
+        """Switch to the charts and rules of a named rule profile."""
+        try:
+            self.rule_profiles[app_data].apply(self.blackjack_helper, self.chart_registry)
+        except Exception as e:
+            self._show_error_message(e)
+            return
+        for rule_name, checkbox in self.rule_checkboxes.items():
+            dpg.set_value(checkbox, self.blackjack_helper.get_rule(rule_name))
+        self._update_help_text()
+        self._update_card_listboxes()
+
     def _show_settings(self):
         """Show the settings window."""
         dpg.configure_item(self.settings_window, show=True)
@@ -131,19 +198,22 @@ class BlackjackInterface:
 
             dpg.add_button(label="Add new card",
                            callback=self._add_player_card)
+            with dpg.group(horizontal=True):
+                dpg.add_button(label="Split", callback=self._split_hand)
+                dpg.add_button(label="Next hand", callback=self._next_hand)
             dpg.add_button(label="Reset", callback=self._reset_game)
 
-            self.help_text_tag = dpg.add_text(
-                self.blackjack_helper.ask_help(self.dealer_card, self.player_cards))
+            self.help_text_tag = dpg.add_text(self._help_text())
 
         dpg.set_primary_window(blackjack_window, True)
         self.blackjack_window = blackjack_window
 
     def _update_chart_path(self, _, app_data):
-        """Update path to charts directory and reload chart data."""
+        """Switch to the charts of a directory, loading them only if not cached."""
         file_path = app_data['file_path_name']
         try:
-            self.blackjack_helper.change_charts_directory(file_path)
+            self.blackjack_helper.change_charts(
+                self.chart_registry.charts_directory(file_path))
         except Exception as e:
             self._show_error_message(e)
             return
@@ -156,40 +226,23 @@ class BlackjackInterface:
         with dpg.window() as settings_window:
             dpg.add_button(label="Select chart directory",
                            callback=lambda: dpg.show_item(file_dialog))
-            dpg.add_checkbox(label="Double allowed",
-                             default_value=self.blackjack_helper.get_rule(
-                                 BlackjackRules.DOUBLE_ALLOWED),
-                             callback=self._change_rule, user_data=BlackjackRules.DOUBLE_ALLOWED)
-
-            dpg.add_checkbox(label="Split allowed",
-                             default_value=self.blackjack_helper.get_rule(
-                                 BlackjackRules.SPLIT_ALLOWED),
-                             callback=self._change_rule, user_data=BlackjackRules.SPLIT_ALLOWED)
-
-            dpg.add_checkbox(label="Double after split allowed",
-                             default_value=self.blackjack_helper.get_rule(
-                                 BlackjackRules.DOUBLE_AFTER_SPLIT_ALLOWED),
-                             callback=self._change_rule, user_data=BlackjackRules.DOUBLE_AFTER_SPLIT_ALLOWED)
-
-            dpg.add_checkbox(label="Surrender allowed",
-                             default_value=self.blackjack_helper.get_rule(
-                                 BlackjackRules.SURRENDER_ALLOWED),
-                             callback=self._change_rule, user_data=BlackjackRules.SURRENDER_ALLOWED)
+            dpg.add_combo(label="Rule profile", items=list(self.rule_profiles),
+                          callback=self._apply_profile)
+            for label, rule_name in (
+                    ("Double allowed", BlackjackRules.DOUBLE_ALLOWED),
+                    ("Split allowed", BlackjackRules.SPLIT_ALLOWED),
+                    ("Double after split allowed", BlackjackRules.DOUBLE_AFTER_SPLIT_ALLOWED),
+                    ("Surrender allowed", BlackjackRules.SURRENDER_ALLOWED)):
+                self.rule_checkboxes[rule_name] = dpg.add_checkbox(
+                    label=label, default_value=self.blackjack_helper.get_rule(rule_name),
+                    callback=self._change_rule, user_data=rule_name)
 
         self.settings_window = settings_window
 
     def _setup_ui(self):
-        """Load textures and initialize all UI components and windows."""
-        self.card_textures = {}
-
-        for card in BLACKJACK_CARDS:
-            image_path = f"data/images/{card}.png"
-            width, height, _, data = dpg.load_image(image_path)
-
-            with dpg.texture_registry():
-                texture_tag = dpg.add_static_texture(
-                    width=width, height=height, default_value=data)
-                self.card_textures[card] = texture_tag
+        """Initialize all UI components and windows; card textures are created on first use."""
+        self.texture_cache = TextureCache(IMAGE_DIRECTORY, TEXTURE_CACHE_PATH, dpg.load_image)
+        self.card_textures = CardTextures(self.texture_cache, dpg.add_texture_registry())
 
         dpg.create_viewport(title='Blackjack Helper', width=800, height=520)
 
@@ -201,20 +254,38 @@ class BlackjackInterface:
         self.max_player_cards = 5
         self.cards_per_row = 5
         self.dealer_card = self.DEFAULT_CARD
-        self.player_cards = [self.DEFAULT_CARD, self.DEFAULT_CARD]
+        self.split_hands = SplitHands([self.DEFAULT_CARD, self.DEFAULT_CARD])
+        self.active_hand = 0
         self.player_cards_listboxes = []
         self.player_cards_images = []
 
-        self.blackjack_helper = BlackjackHelper.from_charts_directory(
-            "data/charts/single_deck/stand_on_soft_17")
+        self.chart_registry = ChartRegistry("data/charts")
+        self.blackjack_helper = self.chart_registry.helper(
+            ChartVariant(decks=1, dealer_hits_soft_17=False))
+        self.rule_profiles = load_profiles(PROFILE_DIRECTORY)
+        self.rule_checkboxes = {}
 
         dpg.create_context()
         dpg.setup_dearpygui()
 
         self._setup_ui()
 
+    def report_startup_time(self, started: float, phases=()):
+        """Print the time from started to the first rendered frame.
+
+        phases holds (name, perf_counter time) pairs reached along the way.
+        """
+        def print_startup_time():
+            first_frame = time.perf_counter()
+            for name, reached in phases:
+                print(f"{name}: {(reached - started) * 1000:.1f} ms")
+            print(f"First frame: {(first_frame - started) * 1000:.1f} ms")
+
+        dpg.set_frame_callback(1, print_startup_time)
+
     def start(self):
         """Start the Dear PyGui rendering loop."""
         dpg.show_viewport()
         dpg.start_dearpygui()
         dpg.destroy_context()
+        self.texture_cache.save()
@@ -0,0 +1,79 @@
+import os
+import numpy as np
+
+
+class TextureCache:
+    """Card images decoded once and kept as raw RGBA floats in a .npz cache file.
+
+    Every cached image is stored with the modification time and size of its
+    source file, so a changed image is decoded again instead of being read
+    from a stale cache.
+    """
+
+    def __init__(self, image_directory: str, cache_path: str, decode_image):
+        """Initialize cache; decode_image(path) returns (width, height, channels, data)."""
+        self.image_directory = image_directory
+        self.cache_path = cache_path
+        self.decode_image = decode_image
+        self._images = {}
+        self._changed = False
+
+    def _image_path(self, card: str) -> str:
+        """Return the source image path of a card."""
+        return os.path.join(self.image_directory, f"{card}.png")
+
+    def _source_signature(self, card: str) -> np.ndarray:
+        """Return the modification time and size of a card's source image."""
+        stat = os.stat(self._image_path(card))
+        return np.array([stat.st_mtime_ns, stat.st_size], dtype=np.int64)
+
+    def _read_cached(self, card: str, signature: np.ndarray):
+        """Return (width, height, pixels) from the cache file, or None if missing or stale."""
+        if not os.path.exists(self.cache_path):
+            return None
+        try:
+            with np.load(self.cache_path) as cache:
+                if f"{card}_source" not in cache.files or \
+                        not np.array_equal(cache[f"{card}_source"], signature):
+                    return None
+                width, height = cache[f"{card}_size"].tolist()
+                return width, height, cache[f"{card}_pixels"]
+        except (OSError, ValueError):
+            return None
+
+    def image(self, card: str):
+        """Return (width, height, pixels) of a card, decoding it on a cache miss."""
+        if card in self._images:
+            return self._images[card][:3]
+
+        signature = self._source_signature(card)
+        image = self._read_cached(card, signature)
+        if image is None:
+            width, height, _, data = self.decode_image(self._image_path(card))
+            image = (width, height, np.asarray(data, dtype=np.float32))
+            self._changed = True
+
+        self._images[card] = (*image, signature)
+        return image
+
+    def save(self):
+        """Write newly decoded images into the cache file, keeping its other entries."""
+        if not self._changed:
+            return
+
+        arrays = {}
+        if os.path.exists(self.cache_path):
+            try:
+                with np.load(self.cache_path) as cache:
+                    arrays = {name: cache[name] for name in cache.files}
+            except (OSError, ValueError):
+                arrays = {}
+        for card, (width, height, pixels, signature) in self._images.items():
+            arrays[f"{card}_size"] = np.array([width, height], dtype=np.int64)
+            arrays[f"{card}_pixels"] = pixels
+            arrays[f"{card}_source"] = signature
+
+        temporary_path = f"{self.cache_path}.tmp.npz"
+        np.savez(temporary_path, **arrays)
+        os.replace(temporary_path, self.cache_path)
+        self._changed = False
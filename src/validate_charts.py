@@ -0,0 +1,54 @@
+import argparse
+import json
+import sys
+from services.chart_validator import validate_library
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Check every chart directory of a chart library for problems.")
+    parser.add_argument("root", nargs="?", default="data/charts",
+                        help="tree of chart directories")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="processes to validate with, all cores by default")
+    parser.add_argument("--cache", default=None,
+                        help="validation cache file, inside root by default")
+    parser.add_argument("--no-reference", action="store_true",
+                        help="skip comparing charts against the strategy solver")
+    parser.add_argument("--no-double-after-split", action="store_true",
+                        help="solve reference charts without doubling after split")
+    parser.add_argument("--no-surrender", action="store_true",
+                        help="solve reference charts without surrender")
+    parser.add_argument("--report", help="file to write the full JSON report into")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    report = validate_library(args.root, args.workers, cache_path=args.cache,
+                              reference=not args.no_reference,
+                              double_after_split=not args.no_double_after_split,
+                              surrender=not args.no_surrender)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    for directory_report in report["directories"]:
+        source = "cached" if directory_report["cached"] else \
+            f"{directory_report['seconds'] * 1000:.0f} ms"
+        print(f"{directory_report['directory']}: "
+              f"{len(directory_report['issues'])} issues ({source})")
+        for issue in directory_report["issues"]:
+            details = ", ".join(f"{key}={value}" for key, value in issue.items()
+                                if key not in ("kind", "chart") and value is not None)
+            print(f"  {issue['kind']} {issue['chart']} {details}")
+
+    print(f"{len(report['directories'])} directories, {report['validated']} validated, "
+          f"{report['cached']} cached, {report['issues']} issues "
+          f"in {report['seconds']:.2f} s")
+    if report["issues"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
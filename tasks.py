@@ -1,14 +1,68 @@
 from invoke import task
 
 @task
-def start(ctx):
-    ctx.run("python src/index.py")
+def start(ctx, startup_timing=False):
+    ctx.run(f"python src/index.py{' --startup-timing' if startup_timing else ''}")
+
+@task
+def advise(ctx, input="-", output="-", workers=1):  # pylint: disable=redefined-builtin
+    ctx.run(f"python src/advise.py {input} --output {output} --workers {workers}")
+
+@task
+def serve(ctx, port=8765, charts="data/charts/single_deck/stand_on_soft_17"):
+    ctx.run(f"python src/serve_advice.py --port {port} --charts {charts}")
+
+@task
+def generate_charts(ctx, directory, decks=1, hit_soft_17=False, double_after_split=False,
+                    surrender=False, dealer_table=None):
+    flags = [f"--decks {decks}"]
+    flags += ["--hit-soft-17"] if hit_soft_17 else []
+    flags += ["--double-after-split"] if double_after_split else []
+    flags += ["--surrender"] if surrender else []
+    flags += [f"--dealer-table {dealer_table}"] if dealer_table else []
+    ctx.run(f"python src/generate_charts.py {directory} {' '.join(flags)}")
+
+@task
+def pack_charts(ctx, root="data/charts"):
+    ctx.run(f"python src/pack_charts.py {root}")
+
+@task
+def validate_charts(ctx, root="data/charts", workers=0, no_reference=False):
+    flags = [f"--workers {workers}"] if workers else []
+    flags += ["--no-reference"] if no_reference else []
+    ctx.run(f"python src/validate_charts.py {root} {' '.join(flags)}")
+
+@task
+def diff_charts(ctx, reference, other, decks=1, hit_soft_17=False,
+                double_after_split=False, surrender=False):
+    flags = [f"--decks {decks}"]
+    flags += ["--hit-soft-17"] if hit_soft_17 else []
+    flags += ["--double-after-split"] if double_after_split else []
+    flags += ["--surrender"] if surrender else []
+    ctx.run(f"python src/diff_charts.py {reference} {other} {' '.join(flags)}")
+
+@task
+def bankroll(ctx, spread="flat", sessions=10000, hours=20):
+    ctx.run(f"python src/simulate_bankroll.py --spread {spread} --sessions {sessions} "
+            f"--hours {hours}")
+
+@task
+def rescore_log(ctx, log, charts=None):
+    flags = [f"--charts {charts}"] if charts else []
+    ctx.run(f"python src/rescore_log.py {log} {' '.join(flags)}")
 
 @task
 def test(ctx):
     ctx.run("pytest src")
 
 
+@task
+def benchmark(ctx, save_baseline=False, quick=False):
+    flags = ["--save-baseline"] if save_baseline else []
+    flags += ["--quick"] if quick else []
+    ctx.run(f"python src/run_benchmarks.py {' '.join(flags)}")
+
+
 @task
 def lint(ctx):
     ctx.run("pylint src")